@@ -0,0 +1,152 @@
+"""
+Plantix - Batch Diagnosis
+Created by TejasS1233
+
+Streams crop reports from a JSONL file (one JSON object per line) through a bounded
+pool of concurrent crew kickoffs. Each finished item is appended to the output JSONL
+as soon as it completes. That output doubles as the checkpoint: rerunning the same
+command skips every item already recorded with status "ok" and retries the rest.
+"""
+
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Set, Tuple
+import json
+import os
+import time
+
+from agentic_ai.inputs import inputs_from_payload
+from agentic_ai.models import structured_outputs
+from agentic_ai.reports import ReportStore, report_store
+
+
+def read_items(input_path: Path) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield ``(item id, payload)`` pairs; the id is the payload's "id" or its line number."""
+    with open(input_path, encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                payload = json.loads(line)
+            except json.JSONDecodeError:
+                raise ValueError(f"Invalid JSON on line {line_number} of {input_path}")
+            yield str(payload.get("id", line_number)), payload
+
+
+def completed_ids(output_path: Path) -> Set[str]:
+    """Ids already written successfully to ``output_path`` by a previous run."""
+    done: Set[str] = set()
+    if not output_path.exists():
+        return done
+    with open(output_path, encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Partially written line from an interrupted run
+            if record.get("status") == "ok":
+                done.add(str(record["id"]))
+    return done
+
+
+def _ends_with_newline(path: Path) -> bool:
+    """Whether the file's last byte is a newline (True for an empty file)."""
+    with open(path, "rb") as handle:
+        handle.seek(0, os.SEEK_END)
+        if not handle.tell():
+            return True
+        handle.seek(-1, os.SEEK_END)
+        return handle.read(1) == b"\n"
+
+
+def _run_item(
+    kickoff: Callable[[Dict[str, Any]], Any],
+    item_id: str,
+    payload: Dict[str, Any],
+    retries: int,
+    backoff: float,
+) -> Dict[str, Any]:
+    retries = max(retries, 0)
+    inputs = inputs_from_payload(payload)
+    started = time.perf_counter()
+    for attempt in range(1, retries + 2):
+        try:
+            result = kickoff(inputs)
+            report = getattr(result, "raw", str(result))
+            record = {
+                "id": item_id,
+                "status": "ok",
+                "attempts": attempt,
+                "seconds": round(time.perf_counter() - started, 3),
+                "inputs": inputs,
+                "result": report,
+                "structured": structured_outputs(result),
+            }
+            if report_store() is not None:
+                record["report_id"] = ReportStore.digest(report)
+            return record
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if attempt <= retries:
+                time.sleep(backoff * 2 ** (attempt - 1))
+    return {
+        "id": item_id,
+        "status": "error",
+        "attempts": retries + 1,
+        "seconds": round(time.perf_counter() - started, 3),
+        "inputs": inputs,
+        "error": error,
+    }
+
+
+def run_batch(
+    input_path: Path,
+    output_path: Path,
+    kickoff: Callable[[Dict[str, Any]], Any],
+    workers: Optional[int] = None,
+    retries: Optional[int] = None,
+    backoff: Optional[float] = None,
+) -> Dict[str, int]:
+    """
+    Diagnose every report in ``input_path`` and append results to ``output_path``.
+
+    At most ``workers`` kickoffs run at once and input is read only as fast as workers
+    free up, so memory stays flat for arbitrarily large files. Returns counts of
+    ok/error/skipped items.
+    """
+    workers = int(os.getenv("PLANTIX_BATCH_WORKERS", "4")) if workers is None else workers
+    retries = int(os.getenv("PLANTIX_BATCH_RETRIES", "2")) if retries is None else retries
+    backoff = float(os.getenv("PLANTIX_BATCH_BACKOFF", "2")) if backoff is None else backoff
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    done = completed_ids(output_path)
+    counts = {"ok": 0, "error": 0, "skipped": 0}
+
+    with open(output_path, "a", encoding="utf-8") as output, ThreadPoolExecutor(max_workers=workers) as pool:
+        if not _ends_with_newline(output_path):
+            output.write("\n")  # Terminate a line cut off by a crash
+        running: Set[Future] = set()
+
+        def drain(return_when) -> None:
+            finished, _ = wait(running, return_when=return_when)
+            for future in finished:
+                running.discard(future)
+                record = future.result()
+                output.write(json.dumps(record, ensure_ascii=False) + "\n")
+                output.flush()
+                os.fsync(output.fileno())
+                counts[record["status"]] += 1
+                print(f"   [{record['status']}] item {record['id']} ({record['seconds']}s)")
+
+        for item_id, payload in read_items(input_path):
+            if item_id in done:
+                counts["skipped"] += 1
+                continue
+            if len(running) >= workers:
+                drain(FIRST_COMPLETED)
+            running.add(pool.submit(_run_item, kickoff, item_id, payload, retries, backoff))
+
+        if running:
+            drain(ALL_COMPLETED)
+
+    return counts
@@ -0,0 +1,292 @@
+"""
+Plantix - Offline Crew Benchmark
+Created by TejasS1233
+
+Runs the full crew against the local stub LLM (``agentic_ai.stub_llm``) over a fixed
+corpus of crop scenarios, with no network access and no API key. Reports kickoff
+latency (p50/p95), LLM requests and tokens per task, tool calls per kickoff and peak
+memory, optionally as JSON. Comparing against a saved baseline exits non-zero on
+regressions, so the benchmark can gate CI.
+
+Startup is measured too: the time to import the entry-point module and the crew in a
+fresh interpreter, and the first (cold) kickoff. ``--import-budget`` fails the run when
+importing the entry points takes longer than the given number of seconds.
+
+    benchmark --iterations 3 --latency 0.05 --json bench.json
+    benchmark --baseline bench.json --tolerance 0.25 --import-budget 0.5
+"""
+
+from contextlib import contextmanager, redirect_stdout
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+import argparse
+import io
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+SCENARIOS = (
+    {"crop_type": "Tomato", "symptoms": "Water-soaked spots on lower leaves, white growth on leaf undersides",
+     "environment": "High humidity, 18-22°C, recent rain", "growth_stage": "Flowering", "location": "Maharashtra, India"},
+    {"crop_type": "Rice", "symptoms": "Yellow to white lesions along leaf margins, wilting of seedlings",
+     "environment": "Flooded fields, warm and humid", "growth_stage": "Tillering", "location": "West Bengal, India"},
+    {"crop_type": "Wheat", "symptoms": "Orange-brown pustules scattered on leaves",
+     "environment": "Cool nights, heavy dew", "growth_stage": "Heading", "location": "Punjab, India"},
+    {"crop_type": "Potato", "symptoms": "Dark concentric rings on older leaves, yellowing around spots",
+     "environment": "Warm days, intermittent rain", "growth_stage": "Tuber initiation", "location": "Uttar Pradesh, India"},
+    {"crop_type": "Cucumber", "symptoms": "White powdery patches on upper leaf surfaces",
+     "environment": "Dry days, humid nights, greenhouse", "growth_stage": "Vining", "location": "Karnataka, India"},
+    {"crop_type": "Cotton", "symptoms": "Curling leaves, sticky residue, tiny insects under leaves",
+     "environment": "Hot and dry", "growth_stage": "Squaring", "location": "Gujarat, India"},
+    {"crop_type": "Corn", "symptoms": "Long grey-green lesions on leaves",
+     "environment": "Humid, moderate temperature", "growth_stage": "Tasseling", "location": "Iowa, USA"},
+    {"crop_type": "Banana", "symptoms": "Yellow streaks turning brown on leaves, leaf collapse",
+     "environment": "Tropical, heavy rainfall", "growth_stage": "Vegetative", "location": "Kerala, India"},
+)
+
+# Metrics compared against a baseline; higher is worse for all of them
+REGRESSION_METRICS = ("latency_p50", "latency_p95", "tool_calls_per_kickoff", "tokens_per_kickoff")
+
+# Modules whose cold import time is reported: the entry points, and the crew behind them
+IMPORT_MODULES = {"import_main_seconds": "agentic_ai.main", "import_crew_seconds": "agentic_ai.crew"}
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Linear-interpolated percentile, ``q`` in [0, 100]."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * q / 100
+    lower, upper = math.floor(position), math.ceil(position)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if os.uname().sysname == "Darwin" else 1024), 1)
+
+
+@contextmanager
+def _environment(values: Dict[str, str]) -> Iterator[None]:
+    """Temporarily point the crew at the stub: set ``values`` and drop per-tier model overrides."""
+    saved = dict(os.environ)
+    for name in [name for name in os.environ if name.startswith("PLANTIX_MODEL_")]:
+        del os.environ[name]
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
+
+
+def import_seconds(module: str, runs: int = 3) -> float:
+    """Fastest of ``runs`` imports of ``module``, each in a fresh interpreter."""
+    code = f"import time; started = time.perf_counter(); import {module}; print(time.perf_counter() - started)"
+    env = dict(os.environ, CREWAI_TELEMETRY_OPT_OUT="true", OTEL_SDK_DISABLED="true")
+    timings = []
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True,
+        )
+        timings.append(float(completed.stdout.strip().splitlines()[-1]))
+    return min(timings)
+
+
+def _tool_calls() -> Dict[str, int]:
+    from agentic_ai.tools.memo import TOOL_CACHE
+    return {tool: int(stats["hits"] + stats["misses"]) for tool, stats in TOOL_CACHE.stats().items()}
+
+
+def run_benchmark(
+    scenarios: Sequence[Dict[str, Any]] = SCENARIOS,
+    iterations: int = 3,
+    latency: float = 0.0,
+    token_latency: float = 0.0,
+    completion_tokens: Optional[int] = None,
+    trace_memory: bool = False,
+) -> Dict[str, Any]:
+    """Kick off the crew ``iterations`` times per scenario against a fresh stub server."""
+    from agentic_ai.stub_llm import StubLLMServer
+
+    with StubLLMServer(latency=latency, token_latency=token_latency, completion_tokens=completion_tokens) as stub, \
+            _environment({
+                "MODEL": "openai/plantix-stub",
+                "OPENAI_API_KEY": "stub",
+                "OPENAI_BASE_URL": stub.url,
+                "PLANTIX_RESPONSE_CACHE": "off",
+                "PLANTIX_WEATHER_PROVIDER": "mock",
+                "CREWAI_TELEMETRY_OPT_OUT": "true",
+                "OTEL_SDK_DISABLED": "true",
+            }):
+        from agentic_ai.crew import AgenticAi
+        from agentic_ai.resources import reset_shared_resources
+
+        reset_shared_resources()
+        latencies: List[float] = []
+        traced_peak = None
+        # Crew logs are not part of the report; event handlers may print after kickoff
+        # returns, so the whole run is redirected rather than each kickoff
+        with redirect_stdout(io.StringIO()):
+            # Warm-up kickoff: client setup, config loading and index builds are not part of
+            # the timings, and are reported as the cold kickoff
+            started = time.perf_counter()
+            AgenticAi().crew().kickoff(inputs=dict(scenarios[0]))
+            cold_kickoff = time.perf_counter() - started
+            stub.reset_usage()
+            tools_before = _tool_calls()
+
+            if trace_memory:
+                tracemalloc.start()
+            for _ in range(iterations):
+                for scenario in scenarios:
+                    started = time.perf_counter()
+                    AgenticAi().crew().kickoff(inputs=dict(scenario))
+                    latencies.append(time.perf_counter() - started)
+            if trace_memory:
+                traced_peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            time.sleep(0.1)  # let trailing event handlers print into the redirect
+
+        usage = stub.usage()
+        tools_after = _tool_calls()
+        reset_shared_resources()
+
+    kickoffs = len(latencies)
+    tool_calls = {
+        tool: (count - tools_before.get(tool, 0)) / kickoffs
+        for tool, count in tools_after.items()
+        if count > tools_before.get(tool, 0)
+    }
+    per_task = {
+        task: {name: value / kickoffs for name, value in counters.items()}
+        for task, counters in sorted(usage.items())
+    }
+    return {
+        "kickoffs": kickoffs,
+        "stub_latency": latency,
+        "cold_kickoff_seconds": cold_kickoff,
+        "latency_p50": percentile(latencies, 50),
+        "latency_p95": percentile(latencies, 95),
+        "latency_mean": sum(latencies) / kickoffs,
+        "latency_max": max(latencies),
+        "llm_requests_per_kickoff": sum(task["requests"] for task in per_task.values()),
+        "tokens_per_kickoff": sum(task["prompt_tokens"] + task["completion_tokens"] for task in per_task.values()),
+        "tokens_per_task": per_task,
+        "tool_calls_per_kickoff": sum(tool_calls.values()),
+        "tool_calls": tool_calls,
+        "peak_rss_mb": peak_rss_mb(),
+        "traced_peak_mb": round(traced_peak / (1024 * 1024), 1) if traced_peak is not None else None,
+    }
+
+
+def find_regressions(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Metrics that grew by more than ``tolerance`` (a fraction) over the baseline."""
+    regressions = []
+    for metric in REGRESSION_METRICS:
+        current, previous = report.get(metric), baseline.get(metric)
+        if current is None or not previous:
+            continue
+        if current > previous * (1 + tolerance):
+            regressions.append(f"{metric}: {current:.4g} vs baseline {previous:.4g} (+{current / previous - 1:.0%})")
+    return regressions
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = []
+    if report.get("import_main_seconds") is not None:
+        lines.append(
+            f"Import main / crew:  {report['import_main_seconds']:.3f}s / {report['import_crew_seconds']:.3f}s"
+        )
+    lines += [
+        f"Kickoffs:            {report['kickoffs']} (stub latency {report['stub_latency']}s per request)",
+        f"Cold kickoff:        {report['cold_kickoff_seconds']:.3f}s",
+        f"Latency p50 / p95:   {report['latency_p50']:.3f}s / {report['latency_p95']:.3f}s "
+        f"(mean {report['latency_mean']:.3f}s, max {report['latency_max']:.3f}s)",
+        f"LLM requests:        {report['llm_requests_per_kickoff']:.1f} per kickoff",
+        f"Tokens:              {report['tokens_per_kickoff']:.0f} per kickoff",
+        f"Tool calls:          {report['tool_calls_per_kickoff']:.1f} per kickoff",
+        f"Peak RSS:            {report['peak_rss_mb']} MB",
+    ]
+    if report.get("traced_peak_mb") is not None:
+        lines.append(f"Traced peak:         {report['traced_peak_mb']} MB")
+    lines.append("")
+    lines.append(f"{'Task':<32}{'requests':>10}{'prompt':>10}{'completion':>12}")
+    for task, counters in report["tokens_per_task"].items():
+        lines.append(
+            f"{task:<32}{counters['requests']:>10.1f}{counters['prompt_tokens']:>10.0f}{counters['completion_tokens']:>12.0f}"
+        )
+    if report["tool_calls"]:
+        lines.append("")
+        lines.append(f"{'Tool':<40}{'calls/kickoff':>14}")
+        for tool, calls in sorted(report["tool_calls"].items()):
+            lines.append(f"{tool:<40}{calls:>14.2f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmark", description="Offline Plantix crew benchmark")
+    parser.add_argument("--iterations", type=int, default=3, help="passes over the scenario corpus")
+    parser.add_argument("--latency", type=float, default=0.0, help="stub seconds per LLM request")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="stub seconds per completion token")
+    parser.add_argument("--completion-tokens", type=int, default=None, help="pad stub answers to this many tokens")
+    parser.add_argument("--scenarios", type=Path, help="JSONL file of crop reports to use instead of the built-in corpus")
+    parser.add_argument("--trace-memory", action="store_true", help="also report the tracemalloc peak (slower)")
+    parser.add_argument("--json", type=Path, help="write the report to this file")
+    parser.add_argument("--baseline", type=Path, help="fail if metrics regress against this JSON report")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed regression as a fraction")
+    parser.add_argument("--import-budget", type=float, default=None,
+                        help="fail if importing the entry points takes longer than this many seconds")
+    parser.add_argument("--skip-imports", action="store_true", help="do not measure cold import times")
+    args = parser.parse_args(argv)
+
+    scenarios = SCENARIOS
+    if args.scenarios:
+        from agentic_ai.batch import read_items
+        from agentic_ai.inputs import inputs_from_payload
+        scenarios = tuple(inputs_from_payload(payload) for _, payload in read_items(args.scenarios))
+
+    # Measured before the crew is imported into this process; subprocesses do not share it anyway
+    imports = {} if args.skip_imports else {metric: import_seconds(module) for metric, module in IMPORT_MODULES.items()}
+    report = run_benchmark(
+        scenarios,
+        iterations=args.iterations,
+        latency=args.latency,
+        token_latency=args.token_latency,
+        completion_tokens=args.completion_tokens,
+        trace_memory=args.trace_memory,
+    )
+    report = {**imports, **report}
+    print(format_report(report))
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    status = 0
+    if args.import_budget is not None and imports and imports["import_main_seconds"] > args.import_budget:
+        print()
+        print(f"Import budget exceeded: agentic_ai.main took {imports['import_main_seconds']:.3f}s "
+              f"(budget {args.import_budget:.3f}s)")
+        status = 1
+
+    if args.baseline:
+        regressions = find_regressions(report, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        if regressions:
+            print()
+            print("Regressions against baseline:")
+            for regression in regressions:
+                print(f"   {regression}")
+            status = 1
+    return status
@@ -0,0 +1,234 @@
+"""
+Plantix - Context Compaction
+Created by TejasS1233
+
+Downstream tasks used to receive the full text of every task in their ``context`` list,
+so prompts grew with each stage. ``CompactingCrew`` replaces that hand-off with a
+structured summary of each upstream output: key fields (diagnosis, confidence,
+severity, ...) followed by the most informative lines, trimmed to the receiving
+task's token budget.
+
+Budgets come from ``context_budget`` in ``config/tasks.yaml`` and default to
+``PLANTIX_CONTEXT_BUDGET``. Set ``PLANTIX_CONTEXT_COMPACTION=off`` to pass full outputs.
+Token counts are estimated (about four characters per token) and recorded per task
+in ``crew.context_stats``.
+"""
+
+from typing import Any, Dict, List, Tuple
+import json
+import os
+import re
+
+from crewai import Crew, Task
+from crewai.crews.crew_output import CrewOutput
+from crewai.tasks.task_output import TaskOutput
+from crewai.types.usage_metrics import UsageMetrics
+from crewai.utilities.constants import NOT_SPECIFIED
+from crewai.utilities.formatter import DIVIDERS
+from pydantic import Field, PrivateAttr
+
+from agentic_ai.resources import shared_llms, usage_since, usage_snapshot
+
+
+# Fields pulled out of "Label: value" lines, in the order they are reported
+SUMMARY_FIELDS: Tuple[Tuple[str, re.Pattern], ...] = tuple(
+    (label, re.compile(pattern, re.IGNORECASE))
+    for label, pattern in (
+        ("Diagnosis", r"(primary diagnosis|diagnosis|disease(/pest)? name|disease|pest)"),
+        ("Scientific name", r"scientific"),
+        ("Confidence", r"confidence"),
+        ("Severity", r"severity"),
+        ("Stage", r"(progression|disease stage|stage)"),
+        ("Yield impact", r"(yield|impact)"),
+        ("Immediate action", r"(immediate|first step|action plan)"),
+        ("Treatment", r"(recommended treatment|treatment|product|fungicide|pesticide)"),
+        ("Recovery", r"(recovery|timeline)"),
+        ("Cost", r"(cost|budget)"),
+    )
+)
+
+# Lines mentioning these carry most of the information a downstream agent needs
+KEY_TERMS = re.compile(
+    r"\b(diagnos\w*|disease|pest|blight|rust|rot|wilt|mildew|scientific|confidence|severity|"
+    r"severe|moderate|mild|stage|risk|yield|spray|apply|dose|dosage|ml|g/l|kg|fungicide|"
+    r"pesticide|organic|neem|copper|remove|destroy|rotate|rotation|resistant|variety)\b",
+    re.IGNORECASE,
+)
+
+_LABEL_LINE = re.compile(r"^[\s>#*\-•\d.)]*\**([^:*]{2,60}?)\**\s*:\s*\**(.+)$")
+_MARKUP = re.compile(r"[*_`#>]+")
+_BULLET = re.compile(r"^\s*([-*•]|\d+[.)])\s+")
+_HEADING = re.compile(r"^\s*(#{1,6}\s+.+|\*\*[^*]+\*\*:?|[^a-z]{3,60}:)\s*$")
+
+MAX_LINE_CHARS = 240
+
+
+def compaction_enabled() -> bool:
+    return os.getenv("PLANTIX_CONTEXT_COMPACTION", "on").strip().lower() not in ("0", "off", "false", "no")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (about four characters per token for English prose)."""
+    return (len(text) + 3) // 4
+
+
+def _clean(line: str) -> str:
+    line = _MARKUP.sub("", _BULLET.sub("", line)).strip()
+    return line if len(line) <= MAX_LINE_CHARS else line[:MAX_LINE_CHARS - 3].rstrip() + "..."
+
+
+def _structured_fields(output: TaskOutput) -> Dict[str, str]:
+    """Fields of a structured (pydantic/JSON) output, flattened to short strings."""
+    data = output.json_dict
+    if data is None and output.pydantic is not None:
+        data = output.pydantic.model_dump()
+    if not data:
+        return {}
+    fields = {}
+    for key, value in data.items():
+        if value in (None, "", [], {}):
+            continue
+        if not isinstance(value, str):
+            value = json.dumps(value, ensure_ascii=False, default=str)
+        fields[key.replace("_", " ").capitalize()] = value
+    return fields
+
+
+def extract_fields(text: str) -> Dict[str, str]:
+    """The first "Label: value" line matching each of ``SUMMARY_FIELDS``."""
+    fields: Dict[str, str] = {}
+    for line in text.splitlines():
+        match = _LABEL_LINE.match(line)
+        if not match or not match.group(2).strip(" *"):
+            continue
+        label_text = match.group(1).strip()
+        for label, pattern in SUMMARY_FIELDS:
+            if label not in fields and pattern.search(label_text):
+                fields[label] = _clean(match.group(2))
+                break
+    return fields
+
+
+def _ranked_lines(text: str) -> List[Tuple[int, int, str]]:
+    """``(rank, position, line)`` for each content line; lower ranks are kept first."""
+    ranked = []
+    first_in_section = True
+    for position, raw_line in enumerate(text.splitlines()):
+        if not raw_line.strip():
+            continue
+        if _HEADING.match(raw_line):
+            first_in_section = True
+            continue
+        line = _clean(raw_line)
+        if len(line) < 4:
+            continue
+        if KEY_TERMS.search(line):
+            rank = 0
+        elif first_in_section:
+            rank = 1
+        elif _BULLET.match(raw_line):
+            rank = 2
+        else:
+            rank = 3
+        first_in_section = False
+        ranked.append((rank, position, line))
+    return ranked
+
+
+def summarize_output(output: TaskOutput, budget: int) -> str:
+    """A structured summary of one task output in at most ``budget`` estimated tokens."""
+    title = (output.name or "task").replace("_", " ")
+    fields = _structured_fields(output) or extract_fields(output.raw)
+
+    lines = [f"Summary of {title}:"]
+    lines += [f"{label}: {value}" for label, value in fields.items()]
+    used = estimate_tokens("\n".join(lines))
+
+    if used < budget:
+        seen = set(fields.values())
+        selected = []
+        for rank, position, line in sorted(_ranked_lines(output.raw)):
+            cost = estimate_tokens(line) + 1
+            labelled = _LABEL_LINE.match(line)
+            if line in seen or (labelled and _clean(labelled.group(2)) in seen) or used + cost > budget:
+                continue
+            seen.add(line)
+            selected.append((position, line))
+            used += cost
+        if selected:
+            lines.append("Key points:")
+            lines += [f"- {line}" for _, line in sorted(selected)]
+
+    summary = "\n".join(lines)
+    return summary if estimate_tokens(summary) <= budget else summary[:budget * 4].rstrip()
+
+
+def compact_context(outputs: List[TaskOutput], budget: int) -> str:
+    """Upstream outputs joined as crewai does, each summarized if the total exceeds ``budget``."""
+    full = DIVIDERS.join(output.raw for output in outputs)
+    if not outputs or estimate_tokens(full) <= budget:
+        return full
+    share = max(1, budget // len(outputs))
+    return DIVIDERS.join(
+        output.raw if estimate_tokens(output.raw) <= share else summarize_output(output, share)
+        for output in outputs
+    )
+
+
+class CompactingCrew(Crew):
+    """Crew that hands each task a budgeted summary of its context instead of full outputs."""
+
+    context_budgets: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Context token budget per task name; other tasks use PLANTIX_CONTEXT_BUDGET",
+    )
+    _context_stats: Dict[str, Dict[str, int]] = PrivateAttr(default_factory=dict)
+    _usage_snapshot: Dict[int, Any] = PrivateAttr(default_factory=dict)
+
+    def _crew_llms(self) -> List[Any]:
+        # Escalation swaps tier clients onto the agents, so the shared ones are counted too
+        return [agent.llm for agent in self.agents] + shared_llms()
+
+    def kickoff(self, *args: Any, **kwargs: Any) -> CrewOutput:
+        self._usage_snapshot = usage_snapshot(self._crew_llms())
+        return super().kickoff(*args, **kwargs)
+
+    def calculate_usage_metrics(self) -> UsageMetrics:
+        """Tokens used during this kickoff, counting each LLM client once even when agents share it."""
+        self.usage_metrics = usage_since(self._usage_snapshot, self._crew_llms())
+        return self.usage_metrics
+
+    @property
+    def context_stats(self) -> Dict[str, Dict[str, int]]:
+        """Per task: estimated context tokens before and after compaction, and the budget."""
+        return self._context_stats
+
+    def context_budget(self, task: Task) -> int:
+        """Token budget for the context handed to ``task``."""
+        budget = self.context_budgets.get(task.name or "")
+        return int(budget if budget is not None else os.getenv("PLANTIX_CONTEXT_BUDGET", "800"))
+
+    def _get_context(self, task: Task, task_outputs: List[TaskOutput]) -> str:
+        if not task.context or not compaction_enabled():
+            return super()._get_context(task, task_outputs)
+
+        outputs = (
+            task_outputs
+            if task.context is NOT_SPECIFIED
+            else [t.output for t in task.context if t.output is not None]
+        )
+        if not outputs:
+            return ""
+        budget = self.context_budget(task)
+        context = compact_context(outputs, budget)
+
+        original = sum(estimate_tokens(output.raw) for output in outputs)
+        compacted = estimate_tokens(context)
+        self._context_stats[task.name or task.description[:40]] = {
+            "budget": budget,
+            "original_tokens": original,
+            "context_tokens": compacted,
+        }
+        if self.verbose and compacted < original:
+            print(f"📦 Context for {task.name}: ~{original} -> ~{compacted} tokens (budget {budget})")
+        return context
@@ -1,13 +1,25 @@
 from crewai import Agent, Crew, Process, Task, LLM
-from crewai.project import CrewBase, agent, crew, task
+from crewai.project import CrewBase, agent, before_kickoff, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
-from typing import List
-import os
+from crewai.tasks.task_output import TaskOutput
+from typing import Any, Dict, List
+from agentic_ai.compaction import CompactingCrew
+from agentic_ai.fanout import FanOutTask
+from agentic_ai.models import Diagnosis, PreventionPlan, TreatmentPlan
+from agentic_ai.prediagnosis import prediagnose, prediagnosis_mode
+from agentic_ai.resources import shared_tool
+from agentic_ai.risk import risk_context, risk_model_enabled
+from agentic_ai.scheduler import DagCrew, process_mode
+from agentic_ai.startup import compiled_config
+from agentic_ai.tiering import DEFAULT_TIER, TieredTask, tier_llm
+from agentic_ai.tracing import verbose_enabled
 from agentic_ai.tools.custom_tool import (
     CropDiseaseKnowledgeTool,
     WeatherConditionsTool,
     SoilAnalysisTool,
-    PestIdentificationTool
+    PestIdentificationTool,
+    RegionalHistoryTool,
+    SymptomSearchTool
 )
 
 @CrewBase
@@ -22,23 +34,30 @@ class AgenticAi():
 
     @property
     def llm(self) -> LLM:
-        """Get the configured LLM from environment variables"""
-        return LLM(
-            model=os.getenv("MODEL", "gemini/gemini-2.5-flash-preview-04-17"),
-            api_key=os.getenv("GEMINI_API_KEY") or os.getenv("OPENAI_API_KEY")
-        )
+        """Get the configured LLM from environment variables (one shared client per process)"""
+        return tier_llm(DEFAULT_TIER)
+
+    def model_tiers(self, agent_name: str) -> List[str]:
+        """Model tiers for an agent from agents.yaml, cheapest first"""
+        return self.agents_config[agent_name].get('model_tiers') or [DEFAULT_TIER]
+
+    def agent_llm(self, agent_name: str) -> LLM:
+        """LLM for an agent's first (cheapest) model tier"""
+        return tier_llm(self.model_tiers(agent_name)[0])
     
     @agent
     def crop_disease_diagnostician(self) -> Agent:
         return Agent(
             config=self.agents_config['crop_disease_diagnostician'],
             tools=[
-                CropDiseaseKnowledgeTool(),
-                WeatherConditionsTool(),
-                PestIdentificationTool()
+                shared_tool(SymptomSearchTool),
+                shared_tool(CropDiseaseKnowledgeTool),
+                shared_tool(WeatherConditionsTool),
+                shared_tool(PestIdentificationTool),
+                shared_tool(RegionalHistoryTool)
             ],
-            llm=self.llm,
-            verbose=True
+            llm=self.agent_llm('crop_disease_diagnostician'),
+            verbose=verbose_enabled()
         )
 
     @agent
@@ -46,11 +65,11 @@ class AgenticAi():
         return Agent(
             config=self.agents_config['treatment_specialist'],
             tools=[
-                CropDiseaseKnowledgeTool(),
-                SoilAnalysisTool()
+                shared_tool(CropDiseaseKnowledgeTool),
+                shared_tool(SoilAnalysisTool)
             ],
-            llm=self.llm,
-            verbose=True
+            llm=self.agent_llm('treatment_specialist'),
+            verbose=verbose_enabled()
         )
 
     @agent
@@ -58,12 +77,12 @@ class AgenticAi():
         return Agent(
             config=self.agents_config['prevention_advisor'],
             tools=[
-                CropDiseaseKnowledgeTool(),
-                SoilAnalysisTool(),
-                WeatherConditionsTool()
+                shared_tool(CropDiseaseKnowledgeTool),
+                shared_tool(SoilAnalysisTool),
+                shared_tool(WeatherConditionsTool)
             ],
-            llm=self.llm,
-            verbose=True
+            llm=self.agent_llm('prevention_advisor'),
+            verbose=verbose_enabled()
         )
 
     @agent
@@ -71,44 +90,101 @@ class AgenticAi():
         return Agent(
             config=self.agents_config['farming_consultant'],
             tools=[
-                SoilAnalysisTool(),
-                WeatherConditionsTool()
+                shared_tool(SoilAnalysisTool),
+                shared_tool(WeatherConditionsTool)
             ],
-            llm=self.llm,
-            verbose=True
+            llm=self.agent_llm('farming_consultant'),
+            verbose=verbose_enabled()
         )
     @task
     def disease_diagnosis_task(self) -> Task:
-        return Task(
+        return TieredTask(
             config=self.tasks_config['disease_diagnosis_task'],
+            model_tiers=self.model_tiers('crop_disease_diagnostician'),
+            output_pydantic=Diagnosis,
         )
 
     @task
     def treatment_recommendation_task(self) -> Task:
-        return Task(
+        return FanOutTask(
             config=self.tasks_config['treatment_recommendation_task'],
+            model_tiers=self.model_tiers('treatment_specialist'),
+            output_pydantic=TreatmentPlan,
         )
 
     @task
     def prevention_strategy_task(self) -> Task:
-        return Task(
+        return FanOutTask(
             config=self.tasks_config['prevention_strategy_task'],
+            model_tiers=self.model_tiers('prevention_advisor'),
+            output_pydantic=PreventionPlan,
         )
 
     @task
     def farming_advice_task(self) -> Task:
-        return Task(
+        return TieredTask(
             config=self.tasks_config['farming_advice_task'],
-            output_file='plantix_farming_report.md'
+            model_tiers=self.model_tiers('farming_consultant'),
         )
 
+    @before_kickoff
+    def apply_prediagnosis(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the knowledge-base pre-classifier ahead of the diagnosis task.
+
+        The result is exposed to the diagnosis prompt as {prediagnosis}. In "skip" mode a
+        confident result is preset as the diagnosis task's output, which the task returns
+        without calling its agent, so downstream context and the crew output still include it.
+        """
+        diagnosis_task = self.disease_diagnosis_task()
+        diagnosis_task.preset_output(None)
+
+        mode = prediagnosis_mode()
+        if mode == "off" or not inputs.get("symptoms"):
+            inputs["prediagnosis"] = "Not available."
+            return inputs
+
+        result = prediagnose(inputs)
+        inputs["prediagnosis"] = result.as_context()
+
+        if mode == "skip" and result.is_confident():
+            diagnosis_task.preset_output(TaskOutput(
+                description=diagnosis_task.description,
+                name=diagnosis_task.name,
+                expected_output=diagnosis_task.expected_output,
+                raw=result.as_report(inputs),
+                pydantic=result.as_diagnosis(),
+                agent=diagnosis_task.agent.role,
+            ))
+        return inputs
+
+    @before_kickoff
+    def apply_risk_assessment(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Score weather-driven disease risk from the reported environment, exposed as {risk_assessment}."""
+        if not risk_model_enabled():
+            inputs["risk_assessment"] = "Not available."
+            return inputs
+        inputs["risk_assessment"] = risk_context(inputs)
+        return inputs
+
     @crew
     def crew(self) -> Crew:
         """Creates the Plantix AI Crew for crop disease diagnosis and farming assistance"""
-        return Crew(
+        crew_class = DagCrew if process_mode() == "dag" else CompactingCrew
+        return crew_class(
             agents=self.agents,
             tasks=self.tasks,
             process=Process.sequential,
-            verbose=True,
+            verbose=verbose_enabled(),
+            context_budgets={
+                name: config['context_budget']
+                for name, config in self.tasks_config.items()
+                if 'context_budget' in config
+            },
         )
 
+
+
+# CrewBase installs its own YAML loader on the class, so the compiled-config loader
+# is set after the class is built
+AgenticAi.load_yaml = staticmethod(compiled_config)
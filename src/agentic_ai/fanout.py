@@ -0,0 +1,103 @@
+"""
+Plantix - Multi-issue Fan-out
+Created by TejasS1233
+
+Field reports often mix problems, e.g. a fungal disease with a pest infestation. The
+diagnosis names all of them (the main diagnosis plus ``additional_issues``), and each
+``FanOutTask`` downstream (treatment, prevention) runs once per issue, concurrently,
+with every run told to address only its own issue. The per-issue results are merged
+into one output of the task's structured type, so one kickoff covers combined issues
+and downstream consumers see a single plan.
+
+Each run works on its own copy of the agent, because crewai agents keep per-task
+execution state. ``PLANTIX_MAX_ISSUES`` caps how many issues are handled separately
+(default 3); with ``PLANTIX_FAN_OUT=off`` a single run addresses every issue.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+import contextvars
+import datetime
+import os
+
+from crewai.tasks.task_output import TaskOutput
+
+from agentic_ai.models import Issue
+from agentic_ai.tiering import TieredTask, diagnosed_issues
+
+
+def fan_out_enabled() -> bool:
+    return os.getenv("PLANTIX_FAN_OUT", "on").strip().lower() not in ("0", "off", "false", "no")
+
+
+def max_issues() -> int:
+    return max(1, int(os.getenv("PLANTIX_MAX_ISSUES", "3")))
+
+
+def issue_context(context: Optional[str], issues: List[Issue], position: int) -> str:
+    """``context`` with an instruction to address only ``issues[position]``."""
+    issue = issues[position]
+    others = ", ".join(other.name for other in issues if other is not issue)
+    focus = (
+        f"The diagnosis found {len(issues)} co-occurring issues; each is handled in a separate plan. "
+        f"Address only issue {position + 1} of {len(issues)}: {issue.label}, severity {issue.severity}. "
+        f"Do not cover {others}."
+    )
+    return f"{context}\n\n{focus}" if context else focus
+
+
+class FanOutTask(TieredTask):
+    """Task that runs once per diagnosed issue, in parallel, and merges the results."""
+
+    def _execute(self, agent, context: Optional[str], tools) -> TaskOutput:
+        issues = diagnosed_issues(self)[:max_issues()] if fan_out_enabled() else []
+        if agent is None or len(issues) < 2:
+            return super()._execute(agent, context, tools)
+
+        self.start_time = datetime.datetime.now()
+        self.prompt_context = context
+        self.processed_by_agents.add(agent.role)
+        with ThreadPoolExecutor(max_workers=len(issues), thread_name_prefix="plantix-issue") as pool:
+            futures = [
+                # Copied contexts keep the runs' spans under this task's span
+                pool.submit(contextvars.copy_context().run, self._execute_issue, agent, context, tools, issues, position)
+                for position in range(len(issues))
+            ]
+            outputs = [future.result() for future in futures]
+
+        output = self._merge(agent, issues, outputs)
+        self.output = output
+        self.end_time = datetime.datetime.now()
+        if self.callback is not None:
+            self.callback(output)
+        return output
+
+    def _execute_issue(self, agent, context: Optional[str], tools, issues: List[Issue], position: int) -> TaskOutput:
+        # A copy of the task, so per-run state (output, timings) stays out of this one;
+        # the merged output is reported and recorded instead of each run's
+        run = self.model_copy(update={"callback": None, "incremental": None})
+        run._knowledge_issues = [issues[position].name]
+        worker = agent.copy()
+        # copy() round-trips fields through model_dump, which turns the crew into a dict
+        worker.crew = agent.crew
+        return TieredTask._execute(run, worker, issue_context(context, issues, position), tools)
+
+    def _merge(self, agent, issues: List[Issue], outputs: List[TaskOutput]) -> TaskOutput:
+        """One output from the per-issue outputs: merged structured plans, else sections of raw text."""
+        model = self.output_pydantic
+        plans = [output.pydantic for output in outputs]
+        if model is not None and hasattr(model, "merge") and all(plan is not None for plan in plans):
+            merged = model.merge([(issue.name, plan) for issue, plan in zip(issues, plans)])
+            raw = merged.model_dump_json()
+        else:
+            merged = None
+            raw = "\n\n".join(f"## {issue.label}\n\n{output.raw}" for issue, output in zip(issues, outputs))
+        return TaskOutput(
+            name=self.name or self.description,
+            description=self.description,
+            expected_output=self.expected_output,
+            raw=raw,
+            pydantic=merged,
+            agent=agent.role,
+            output_format=self._get_output_format(),
+        )
@@ -0,0 +1,573 @@
+"""
+Plantix - Regional Diagnosis History
+Created by TejasS1233
+
+Every kickoff used to be forgotten once its report was written. The history store
+keeps one row per diagnosed issue (the main diagnosis and each co-occurring issue) of
+every report, so the diagnostician can ask what is going around in a region, and
+outbreaks show up across thousands of reports without any LLM involved.
+
+Rows are stored column by column under ``PLANTIX_HISTORY_DIR``: one fixed-width binary
+file per column (day, location, crop, issue, severity, ...), memory-mapped for queries.
+Locations, crops and issues are dictionary-encoded in ``dictionaries.json``. The region
+index maps every part of a location ("Nashik", "Maharashtra", "India" for "Nashik,
+Maharashtra, India") to the locations containing it. A query for a region or crop over
+a day window is therefore a few vectorized comparisons and a ``bincount``. Locations are
+geocoded through the weather service when it is on, which also allows queries by
+distance.
+
+An outbreak is an issue whose report count in a region over the last
+``PLANTIX_OUTBREAK_DAYS`` reaches ``PLANTIX_OUTBREAK_MIN_REPORTS`` and is at least
+``PLANTIX_OUTBREAK_RATIO`` times its usual rate over the preceding
+``PLANTIX_OUTBREAK_BASELINE_DAYS``. Set ``PLANTIX_HISTORY=off`` to stop recording.
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+import argparse
+import json
+import os
+import re
+import threading
+import time
+
+import numpy as np
+
+from agentic_ai.models import SEVERITY_ORDER, Diagnosis, severity_rank
+from agentic_ai.reports import atomic_write
+from agentic_ai.tools.knowledge_base import disease_knowledge_base, normalize, pest_catalog
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+# Column name -> dtype. Every column file holds one value per row.
+COLUMNS: Dict[str, np.dtype] = {
+    "report": np.dtype(np.int32),       # sequence number of the report the row belongs to
+    "day": np.dtype(np.int32),          # UTC days since 1970-01-01
+    "location": np.dtype(np.int32),     # id in the location dictionary
+    "crop": np.dtype(np.int32),         # id in the crop dictionary
+    "issue": np.dtype(np.int32),        # id in the issue dictionary
+    "severity": np.dtype(np.int8),      # position in SEVERITY_ORDER, len(SEVERITY_ORDER) if unknown
+    "primary": np.dtype(np.int8),       # 1 for the main diagnosis, 0 for a co-occurring issue
+    "confidence": np.dtype(np.float32),
+    "latitude": np.dtype(np.float32),   # NaN when the location could not be geocoded
+    "longitude": np.dtype(np.float32),
+}
+
+DICTIONARIES = ("locations", "crops", "issues")
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def history_enabled() -> bool:
+    return os.getenv("PLANTIX_HISTORY", "on").strip().lower() not in ("0", "off", "false", "no")
+
+
+def history_dir() -> Path:
+    return Path(os.getenv("PLANTIX_HISTORY_DIR", "history"))
+
+
+def today() -> int:
+    return int(time.time() // 86400)
+
+
+# Parenthetical qualifiers such as "Pune (near river)" are not part of the region
+_QUALIFIER = re.compile(r"\([^)]*\)?")
+
+
+def region_parts(location: str) -> List[str]:
+    """Normalized parts of a location, most specific first: the full name, then each comma-separated part."""
+    location = _QUALIFIER.sub(" ", location)
+    parts = [normalize(location)] + [normalize(part) for part in location.split(",")]
+    return list(dict.fromkeys(part for part in parts if part))
+
+
+def canonical_issue(name: str) -> str:
+    """The knowledge-base name of a disease or pest when it is known (aliases resolved), else the normalized name."""
+    record = disease_knowledge_base().get(name)
+    if record is not None:
+        return record.name
+    pest = pest_catalog().get(name)
+    return normalize(pest["name"]) if pest is not None else normalize(name)
+
+
+@dataclass(frozen=True)
+class IssueCount:
+    """How often an issue was diagnosed among the reports matching a query."""
+    issue: str
+    reports: int
+    share: float            # fraction of the matching reports
+    severe_share: float     # fraction of its diagnoses rated high or critical
+    mean_confidence: float
+
+    def describe(self) -> str:
+        return (f"{self.issue.title()} - {self.reports} report(s) ({self.share:.0%}), "
+                f"high or critical in {self.severe_share:.0%}, mean confidence {self.mean_confidence:.0f}%")
+
+
+@dataclass(frozen=True)
+class Outbreak:
+    """An issue reported in a region far more often than usual."""
+    region: str
+    crop: str
+    issue: str
+    recent: int
+    expected: float
+    days: int
+
+    @property
+    def ratio(self) -> float:
+        return self.recent / max(self.expected, 1.0)
+
+    def describe(self) -> str:
+        return (f"{self.issue.title()} on {self.crop.title()} in {self.region.title()}: {self.recent} report(s) "
+                f"in the last {self.days} days, {self.ratio:.1f}x the usual rate")
+
+
+class HistoryStore:
+    """Append-only columnar store of diagnosed issues with a region index. Safe to share between threads."""
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root is not None else history_dir()
+        self._lock = threading.Lock()
+        self._dictionaries: Dict[str, Any] = {}
+        self._dictionaries_signature: Optional[Tuple[int, int]] = None
+        self._ids: Dict[str, Dict[str, int]] = {}
+        self._region_index: Dict[str, np.ndarray] = {}
+        self._columns: Dict[str, np.ndarray] = {}
+        self._columns_signature: Optional[Tuple[int, ...]] = None
+
+    def column_path(self, name: str) -> Path:
+        return self.root / "columns" / f"{name}.bin"
+
+    @property
+    def dictionaries_path(self) -> Path:
+        return self.root / "dictionaries.json"
+
+    @contextmanager
+    def _writing(self) -> Iterator[None]:
+        """Exclusive access across threads and, where supported, processes."""
+        with self._lock:
+            (self.root / "columns").mkdir(parents=True, exist_ok=True)
+            with open(self.root / ".lock", "w") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                yield
+
+    # Dictionaries and the region index
+
+    def _load_dictionaries(self) -> Dict[str, Any]:
+        path = self.dictionaries_path
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self._dictionaries = {name: [] for name in DICTIONARIES}
+            self._dictionaries_signature = None
+            self._ids, self._region_index = {}, {}
+            return self._dictionaries
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature != self._dictionaries_signature:
+            self._dictionaries = json.loads(path.read_text(encoding="utf-8"))
+            self._dictionaries_signature = signature
+            self._ids = {name: {value: i for i, value in enumerate(self._dictionaries[name])} for name in DICTIONARIES}
+            index: Dict[str, List[int]] = {}
+            for location_id, location in enumerate(self._dictionaries["locations"]):
+                for part in region_parts(location):
+                    index.setdefault(part, []).append(location_id)
+            self._region_index = {part: np.array(ids, dtype=np.int32) for part, ids in index.items()}
+        return self._dictionaries
+
+    def _encode(self, dictionaries: Dict[str, Any], name: str, value: str) -> int:
+        ids = self._ids.setdefault(name, {})
+        if value not in ids:
+            ids[value] = len(dictionaries[name])
+            dictionaries[name].append(value)
+        return ids[value]
+
+    def regions(self) -> List[str]:
+        """Every region name that can be queried."""
+        with self._lock:
+            self._load_dictionaries()
+            return sorted(self._region_index)
+
+    # Columns
+
+    def _rows_on_disk(self) -> int:
+        sizes = [
+            self.column_path(name).stat().st_size // dtype.itemsize if self.column_path(name).exists() else 0
+            for name, dtype in COLUMNS.items()
+        ]
+        return min(sizes)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Every column as a read-only array, memory-mapped and reloaded when rows are appended."""
+        with self._lock:
+            rows = self._rows_on_disk()
+            signature = (rows,) + tuple(
+                self.column_path(name).stat().st_mtime_ns if rows else 0 for name in COLUMNS
+            )
+            if signature != self._columns_signature:
+                self._columns = {
+                    name: (np.memmap(self.column_path(name), dtype=dtype, mode="r", shape=(rows,))
+                           if rows else np.empty(0, dtype=dtype))
+                    for name, dtype in COLUMNS.items()
+                }
+                self._columns_signature = signature
+            self._load_dictionaries()
+            return self._columns
+
+    def __len__(self) -> int:
+        return len(self.columns()["report"])
+
+    # Writing
+
+    def record(
+        self,
+        location: str,
+        crop: str,
+        diagnosis: Diagnosis,
+        day: Optional[int] = None,
+        point: Optional[Tuple[float, float]] = None,
+    ) -> int:
+        """Append one report's issues; returns the number of rows written."""
+        issues = diagnosis.issues()
+        latitude, longitude = point if point is not None else (np.nan, np.nan)
+        with self._writing():
+            dictionaries = self._load_dictionaries()
+            sizes = {name: len(dictionaries[name]) for name in DICTIONARIES}
+            location_id = self._encode(dictionaries, "locations", location.strip())
+            crop_id = self._encode(dictionaries, "crops", normalize(crop))
+            issue_ids = [self._encode(dictionaries, "issues", canonical_issue(issue.name)) for issue in issues]
+            if any(len(dictionaries[name]) != size for name, size in sizes.items()):
+                # New values were added in memory; reload (and rebuild the region index) either way
+                self._dictionaries_signature = None
+                atomic_write(self.dictionaries_path, json.dumps(dictionaries, ensure_ascii=False))
+
+            rows = self._rows_on_disk()
+            values = {
+                "report": [self._last_report(rows) + 1] * len(issues),
+                "day": [today() if day is None else day] * len(issues),
+                "location": [location_id] * len(issues),
+                "crop": [crop_id] * len(issues),
+                "issue": issue_ids,
+                "severity": [severity_rank(issue.severity) for issue in issues],
+                "primary": [1] + [0] * (len(issues) - 1),
+                "confidence": [issue.confidence for issue in issues],
+                "latitude": [latitude] * len(issues),
+                "longitude": [longitude] * len(issues),
+            }
+            for name, dtype in COLUMNS.items():
+                with open(self.column_path(name), "ab") as handle:
+                    # A write interrupted part-way leaves some columns longer; realign them first
+                    handle.truncate(rows * dtype.itemsize)
+                    handle.write(np.asarray(values[name], dtype=dtype).tobytes())
+        return len(issues)
+
+    def _last_report(self, rows: int) -> int:
+        if not rows:
+            return -1
+        dtype = COLUMNS["report"]
+        with open(self.column_path("report"), "rb") as handle:
+            handle.seek((rows - 1) * dtype.itemsize)
+            return int(np.frombuffer(handle.read(dtype.itemsize), dtype=dtype)[0])
+
+    # Queries
+
+    def _region_locations(self, region: str) -> Optional[np.ndarray]:
+        """Location ids within ``region``, judged by its most specific known part; None if none is known."""
+        for part in region_parts(region):
+            if part in self._region_index:
+                return self._region_index[part]
+        return None
+
+    def _mask(
+        self,
+        columns: Dict[str, np.ndarray],
+        region: Optional[str] = None,
+        crop: Optional[str] = None,
+        first_day: Optional[int] = None,
+        last_day: Optional[int] = None,
+        near: Optional[Tuple[float, float, float]] = None,
+    ) -> np.ndarray:
+        mask = np.ones(len(columns["day"]), dtype=bool)
+        if first_day is not None:
+            mask &= columns["day"] >= first_day
+        if last_day is not None:
+            mask &= columns["day"] <= last_day
+        if crop:
+            crop_id = self._ids.get("crops", {}).get(normalize(crop))
+            if crop_id is None:
+                return np.zeros_like(mask)
+            mask &= columns["crop"] == crop_id
+        if region:
+            locations = self._region_locations(region)
+            if locations is None:
+                return np.zeros_like(mask)
+            mask &= np.isin(columns["location"], locations)
+        if near is not None:
+            latitude, longitude, radius_km = near
+            mask &= distance_km(columns["latitude"], columns["longitude"], latitude, longitude) <= radius_km
+        return mask
+
+    def knows_region(self, region: str) -> bool:
+        with self._lock:
+            self._load_dictionaries()
+            return self._region_locations(region) is not None
+
+    def reports(
+        self,
+        region: Optional[str] = None,
+        crop: Optional[str] = None,
+        days: int = 14,
+        near: Optional[Tuple[float, float, float]] = None,
+    ) -> int:
+        """Number of reports matching a query."""
+        columns = self.columns()
+        mask = self._mask(columns, region, crop, today() - days + 1, None, near)
+        return int(np.count_nonzero(columns["primary"][mask]))  # one primary row per report
+
+    def top_issues(
+        self,
+        region: Optional[str] = None,
+        crop: Optional[str] = None,
+        days: int = 14,
+        top_k: int = 5,
+        near: Optional[Tuple[float, float, float]] = None,
+    ) -> List[IssueCount]:
+        """
+        Most frequently diagnosed issues in the last ``days`` days, optionally for a region,
+        a crop, and/or within ``near=(latitude, longitude, radius_km)``.
+        """
+        columns = self.columns()
+        mask = self._mask(columns, region, crop, today() - days + 1, None, near)
+        if not mask.any():
+            return []
+        issues = columns["issue"][mask]
+        size = len(self._dictionaries["issues"])
+        counts = np.bincount(issues, minlength=size)
+        severe = np.bincount(issues, weights=(columns["severity"][mask] <= SEVERITY_ORDER.index("high")), minlength=size)
+        confidence = np.bincount(issues, weights=columns["confidence"][mask], minlength=size)
+        total_reports = int(np.count_nonzero(columns["primary"][mask]))  # one primary row per report
+
+        ranked = np.argsort(-counts, kind="stable")[:top_k]
+        return [
+            IssueCount(
+                issue=self._dictionaries["issues"][issue],
+                reports=int(counts[issue]),
+                share=float(counts[issue] / total_reports),
+                severe_share=float(severe[issue] / counts[issue]),
+                mean_confidence=float(confidence[issue] / counts[issue]),
+            )
+            for issue in ranked
+            if counts[issue] > 0
+        ]
+
+    def outbreaks(
+        self,
+        region: Optional[str] = None,
+        crop: Optional[str] = None,
+        days: Optional[int] = None,
+        baseline_days: Optional[int] = None,
+        min_reports: Optional[int] = None,
+        ratio: Optional[float] = None,
+    ) -> List[Outbreak]:
+        """Issues reported in some region far more often than usual, strongest first."""
+        days = int(os.getenv("PLANTIX_OUTBREAK_DAYS", "7")) if days is None else days
+        baseline_days = int(os.getenv("PLANTIX_OUTBREAK_BASELINE_DAYS", "28")) if baseline_days is None else baseline_days
+        min_reports = int(os.getenv("PLANTIX_OUTBREAK_MIN_REPORTS", "5")) if min_reports is None else min_reports
+        ratio = float(os.getenv("PLANTIX_OUTBREAK_RATIO", "3")) if ratio is None else ratio
+
+        columns = self.columns()
+        first_recent = today() - days + 1
+        mask = self._mask(columns, region, crop, first_recent - baseline_days, None)
+        if not mask.any():
+            return []
+
+        # One row per (diagnosed issue, region part of its location), so every region level is counted
+        parts = sorted(self._region_index)
+        part_ids = {part: position for position, part in enumerate(parts)}
+        members = [[] for _ in self._dictionaries["locations"]]
+        for part, locations in self._region_index.items():
+            for location in locations:
+                members[location].append(part_ids[part])
+        lengths = np.array([len(member) for member in members], dtype=np.int64)
+        flat = np.array([part for member in members for part in member], dtype=np.int64)
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+        locations = columns["location"][mask]
+        repeat = lengths[locations]
+        row_of = np.repeat(np.arange(len(locations)), repeat)
+        offsets = np.arange(len(row_of)) - np.repeat(np.cumsum(repeat) - repeat, repeat)
+        region_of = flat[starts[locations][row_of] + offsets]
+
+        crops, issues = len(self._dictionaries["crops"]), len(self._dictionaries["issues"])
+        keys = (region_of * crops + columns["crop"][mask][row_of]) * issues + columns["issue"][mask][row_of]
+        recent = columns["day"][mask][row_of] >= first_recent
+        unique, inverse = np.unique(keys, return_inverse=True)
+        recent_counts = np.bincount(inverse, weights=recent, minlength=len(unique))
+        baseline_counts = np.bincount(inverse, weights=~recent, minlength=len(unique))
+        expected = baseline_counts * days / max(baseline_days, 1)
+        flagged = (recent_counts >= min_reports) & (recent_counts >= ratio * np.maximum(expected, 1.0))
+
+        candidates = []
+        for key, count, usual in zip(unique[flagged], recent_counts[flagged], expected[flagged]):
+            region_id, rest = divmod(int(key), crops * issues)
+            crop_id, issue_id = divmod(rest, issues)
+            candidates.append(Outbreak(
+                region=parts[region_id],
+                crop=self._dictionaries["crops"][crop_id],
+                issue=self._dictionaries["issues"][issue_id],
+                recent=int(count),
+                expected=float(usual),
+                days=days,
+            ))
+
+        # How early a name comes in the locations it is part of: "maharashtra" before
+        # "india" for "Maharashtra, India", and the full name after both
+        specificity: Dict[str, int] = {}
+        for location in self._dictionaries["locations"]:
+            names = region_parts(location)
+            for position, name in enumerate(names[1:] + names[:1]):
+                specificity[name] = min(specificity.get(name, position), position)
+
+        # A broader region with exactly the same reports as a narrower one adds nothing, and of
+        # names for the same locations only the most specific is kept
+        def covered(outbreak: Outbreak) -> bool:
+            locations = set(self._region_index[outbreak.region].tolist())
+            for other in candidates:
+                if other is outbreak or (other.crop, other.issue, other.recent) != (outbreak.crop, outbreak.issue, outbreak.recent):
+                    continue
+                other_locations = set(self._region_index[other.region].tolist())
+                if other_locations < locations or (
+                    other_locations == locations
+                    and (specificity[other.region], other.region) < (specificity[outbreak.region], outbreak.region)
+                ):
+                    return True
+            return False
+
+        return sorted(
+            (outbreak for outbreak in candidates if not covered(outbreak)),
+            key=lambda outbreak: (-outbreak.ratio, -outbreak.recent),
+        )
+
+
+def distance_km(latitude: np.ndarray, longitude: np.ndarray, to_latitude: float, to_longitude: float) -> np.ndarray:
+    """Great-circle distance from each point to one point (NaN coordinates give NaN)."""
+    lat1, lon1 = np.radians(latitude.astype(np.float64)), np.radians(longitude.astype(np.float64))
+    lat2, lon2 = np.radians(to_latitude), np.radians(to_longitude)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+_store_lock = threading.Lock()
+_stores: Dict[str, HistoryStore] = {}
+
+
+def history_store() -> HistoryStore:
+    """The process-wide store for the current ``PLANTIX_HISTORY_DIR``."""
+    root = history_dir()
+    with _store_lock:
+        store = _stores.get(str(root))
+        if store is None:
+            store = _stores[str(root)] = HistoryStore(root)
+        return store
+
+
+def geocode(location: str) -> Optional[Tuple[float, float]]:
+    """Coordinates of a location from the weather service, or None if it is off or cannot find it."""
+    from agentic_ai.tools.weather import WeatherError, weather_service
+
+    service = weather_service()
+    if service is None:
+        return None
+    try:
+        point = service.locate(location)
+    except WeatherError:
+        return None
+    return (point.latitude, point.longitude) if point is not None else None
+
+
+def record_result(inputs: Mapping[str, Any], result: Any) -> List[Outbreak]:
+    """
+    Record the diagnosis of a crew result under its location and crop, returning the
+    outbreaks now active in that location's regions for that crop. Results without a
+    structured diagnosis are not recorded.
+    """
+    if not history_enabled():
+        return []
+    diagnosis = next(
+        (output.pydantic for output in getattr(result, "tasks_output", []) if isinstance(output.pydantic, Diagnosis)),
+        None,
+    )
+    location, crop = str(inputs.get("location") or ""), str(inputs.get("crop_type") or "")
+    if diagnosis is None or not location.strip() or not crop.strip():
+        return []
+    store = history_store()
+    store.record(location, crop, diagnosis, point=geocode(location))
+    parts = set(region_parts(location))
+    return [outbreak for outbreak in store.outbreaks(region=location, crop=crop) if outbreak.region in parts]
+
+
+def format_top_issues(region: Optional[str], crop: Optional[str], days: int, top_k: int = 5) -> str:
+    """The regional history summary shown to the diagnostician and on the command line."""
+    store = history_store()
+    near = None
+    if region and not store.knows_region(region):
+        point = geocode(region)
+        if point is not None:
+            near = point + (float(os.getenv("PLANTIX_HISTORY_RADIUS_KM", "100")),)
+    scope = " ".join(part for part in (
+        f"for {crop.title()}" if crop else "",
+        f"in {region}" if region and near is None else "",
+        f"within {near[2]:.0f} km of {region}" if near is not None else "",
+        "in all regions" if not region else "",
+    ) if part)
+    if region and near is None and not store.knows_region(region):
+        return f"No past reports {scope} (the region has no recorded diagnoses)."
+
+    reports = store.reports(None if near else region, crop, days, near)
+    if not reports:
+        return f"No past reports {scope} in the last {days} days."
+    output = f"Diagnoses {scope} in the last {days} days ({reports} report(s)):\n"
+    output += "".join(
+        f"{rank}. {count.describe()}\n"
+        for rank, count in enumerate(store.top_issues(None if near else region, crop, days, top_k, near), start=1)
+    )
+    outbreaks = store.outbreaks(region=None if near else region, crop=crop)
+    if outbreaks:
+        output += "\nOutbreak alerts:\n" + "".join(f"- {outbreak.describe()}\n" for outbreak in outbreaks[:top_k])
+    return output
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="history", description="Query the regional diagnosis history")
+    commands = parser.add_subparsers(dest="command", required=True)
+    top = commands.add_parser("top", help="most diagnosed issues in a region")
+    top.add_argument("region", nargs="?", help="region or location, e.g. 'Maharashtra'")
+    top.add_argument("--crop", help="only reports for this crop")
+    top.add_argument("--days", type=int, default=14, help="days to look back")
+    top.add_argument("--top", type=int, default=5, help="number of issues to list")
+    alerts = commands.add_parser("outbreaks", help="issues reported far more often than usual")
+    alerts.add_argument("region", nargs="?", help="only this region")
+    alerts.add_argument("--crop", help="only reports for this crop")
+    alerts.add_argument("--days", type=int, default=None, help="recent window in days")
+    alerts.add_argument("--fail-on-outbreak", action="store_true", help="exit with status 1 if any outbreak is detected")
+    args = parser.parse_args(argv)
+
+    if args.command == "top":
+        print(format_top_issues(args.region, args.crop, args.days, args.top))
+        return 0
+
+    outbreaks = history_store().outbreaks(region=args.region, crop=args.crop, days=args.days)
+    if not outbreaks:
+        print("No outbreaks detected.")
+        return 0
+    print(f"{len(outbreaks)} outbreak(s) detected:")
+    for outbreak in outbreaks:
+        print(f"   🚨 {outbreak.describe()}")
+    return 1 if args.fail_on_outbreak else 0
@@ -0,0 +1,193 @@
+"""
+Plantix - Incremental Re-diagnosis
+Created by TejasS1233
+
+Farmers often resubmit a case with one field changed (a later growth stage, an extra
+symptom). When a kickoff carries a ``case_id``, every task's output is saved with a
+fingerprint of what it was computed from:
+
+- the values of the input placeholders its description, expected output and agent
+  use (``{crop_type}``, ``{location}``, ...), normalized like the response cache does;
+- the identity of the outputs of the tasks in its ``context``.
+
+On the next kickoff for the same case, a task whose fingerprint is unchanged returns
+its saved output instead of calling the LLM. Because fingerprints use upstream
+*outputs* rather than upstream inputs, a re-run diagnosis that reaches the same
+conclusion (same diseases and pests, same severities) leaves the treatment, prevention
+and farming tasks reusable, unless their own placeholders changed.
+
+Cases are stored as JSON under ``<PLANTIX_CACHE_DIR>/cases``. Set
+``PLANTIX_INCREMENTAL=off`` to always run every task.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional
+import hashlib
+import json
+import os
+import re
+import threading
+
+from crewai import Task
+from crewai.tasks.task_output import TaskOutput
+
+from agentic_ai.inputs import normalize_field
+from agentic_ai.reports import atomic_write
+from agentic_ai.response_cache import cache_dir, dump_task_output, load_task_output
+
+
+PLACEHOLDER = re.compile(r"\{([A-Za-z_][A-Za-z0-9_\-]*)\}")
+
+# Fields of a structured output that identify its conclusion (pydantic ``include``
+# specs). Downstream tasks only re-run when these change; other models are compared in full.
+OUTPUT_IDENTITY = {
+    "Diagnosis": {
+        "name": True,
+        "scientific_name": True,
+        "severity": True,
+        "additional_issues": {"__all__": {"name", "scientific_name", "severity"}},
+    },
+}
+
+# Bump to invalidate every stored case when fingerprinting changes
+FINGERPRINT_VERSION = 3
+
+
+def incremental_enabled() -> bool:
+    return os.getenv("PLANTIX_INCREMENTAL", "on").strip().lower() not in ("0", "off", "false", "no")
+
+
+def _digest(value: Any) -> str:
+    canonical = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def task_templates(task: Task) -> List[str]:
+    """The uninterpolated text of a task, its agent and its agronomy library query."""
+    templates = [
+        task._original_description or task.description,
+        task._original_expected_output or task.expected_output,
+    ]
+    knowledge_query = getattr(task, "knowledge_query", None)
+    if knowledge_query:
+        templates.append(knowledge_query)
+    agent = task.agent
+    if agent is not None:
+        templates += [
+            agent._original_role or agent.role,
+            agent._original_goal or agent.goal,
+            agent._original_backstory or agent.backstory,
+        ]
+    return templates
+
+
+def task_placeholders(task: Task) -> FrozenSet[str]:
+    """Input placeholders a task's prompt is built from."""
+    return frozenset(PLACEHOLDER.findall("\n".join(task_templates(task))))
+
+
+def _normalized(value: Any) -> Any:
+    if isinstance(value, str):
+        return normalize_field(value)
+    if isinstance(value, dict):
+        return {key: _normalized(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_normalized(item) for item in value]
+    return value
+
+
+def output_identity(output: TaskOutput) -> Any:
+    """What downstream tasks depend on: the conclusion of a structured output, else its text."""
+    model = output.pydantic
+    if model is not None:
+        return _normalized(model.model_dump(include=OUTPUT_IDENTITY.get(type(model).__name__)))
+    if output.json_dict is not None:
+        return output.json_dict
+    return normalize_field(output.raw)
+
+
+def task_fingerprint(task: Task, inputs: Mapping[str, Any]) -> Optional[str]:
+    """
+    Fingerprint of everything ``task`` is computed from, or None if an upstream task has
+    no output yet (the task cannot be judged and must run).
+    """
+    upstream = {}
+    for dependency in task.context if isinstance(task.context, list) else []:
+        if dependency.output is None:
+            return None
+        upstream[dependency.name] = output_identity(dependency.output)
+    return _digest({
+        "version": FINGERPRINT_VERSION,
+        "templates": _digest(task_templates(task)),
+        "inputs": {
+            name: normalize_field(inputs[name])
+            for name in sorted(task_placeholders(task))
+            if name in inputs
+        },
+        "upstream": upstream,
+    })
+
+
+class CaseStore:
+    """Saved task outputs and fingerprints per case, one JSON file each."""
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root is not None else cache_dir() / "cases"
+
+    def path_for(self, case_id: str) -> Path:
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", case_id)[:80]
+        return self.root / f"{safe}-{_digest(case_id)[:12]}.json"
+
+    def load(self, case_id: str) -> Dict[str, Dict[str, Any]]:
+        path = self.path_for(case_id)
+        if not path.exists():
+            return {}
+        try:
+            return json.loads(path.read_text(encoding="utf-8")).get("tasks", {})
+        except (OSError, ValueError):
+            return {}
+
+    def save(self, case_id: str, tasks: Dict[str, Dict[str, Any]]) -> None:
+        atomic_write(self.path_for(case_id), json.dumps({"case_id": case_id, "tasks": tasks}))
+
+
+class IncrementalRun:
+    """
+    Decides, task by task, whether a case's saved output can be reused in this kickoff,
+    and records the outputs of the tasks that did run.
+    """
+
+    def __init__(self, case_id: str, inputs: Mapping[str, Any], store: Optional[CaseStore] = None):
+        self.case_id = case_id
+        self.inputs = inputs
+        self.store = store or CaseStore()
+        self._saved = self.store.load(case_id)
+        self._tasks: Dict[str, Dict[str, Any]] = dict(self._saved)
+        self._lock = threading.Lock()
+        self.reused: List[str] = []
+        self.executed: List[str] = []
+
+    def lookup(self, task: Task) -> Optional[TaskOutput]:
+        """The saved output of ``task`` if nothing it depends on has changed."""
+        saved = self._saved.get(task.name or "")
+        if saved is None:
+            return None
+        if task_fingerprint(task, self.inputs) != saved["fingerprint"]:
+            return None
+        with self._lock:
+            self.reused.append(task.name)
+        return load_task_output(saved["output"])
+
+    def record(self, task: Task, output: TaskOutput) -> None:
+        fingerprint = task_fingerprint(task, self.inputs)
+        with self._lock:
+            self.executed.append(task.name)
+            if fingerprint is None or not task.name:
+                self._tasks.pop(task.name or "", None)
+            else:
+                self._tasks[task.name] = {"fingerprint": fingerprint, "output": dump_task_output(output)}
+
+    def save(self) -> None:
+        with self._lock:
+            tasks = dict(self._tasks)
+        self.store.save(self.case_id, tasks)
@@ -0,0 +1,62 @@
+"""
+Plantix - Crew Input Normalization
+Created by TejasS1233
+"""
+
+from typing import Any, Dict, FrozenSet, Mapping
+import hashlib
+import json
+import re
+
+
+# The placeholders every Plantix kickoff provides
+INPUT_FIELDS = ("crop_type", "symptoms", "environment", "growth_stage", "location")
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "at", "by", "for", "from", "in", "is", "of", "on", "or",
+    "some", "the", "to", "very", "with",
+})
+
+
+def normalize_field(value: Any) -> str:
+    """Lowercase, drop punctuation and stopwords, and collapse whitespace."""
+    tokens = _TOKEN_RE.findall(str(value or "").lower())
+    return " ".join(token for token in tokens if token not in _STOPWORDS)
+
+
+def normalize_inputs(inputs: Mapping[str, Any]) -> Dict[str, str]:
+    """The five crop-report fields in canonical form; other keys are ignored."""
+    return {field: normalize_field(inputs.get(field)) for field in INPUT_FIELDS}
+
+
+def field_tokens(value: str) -> FrozenSet[str]:
+    return frozenset(value.split())
+
+
+def input_key(inputs: Mapping[str, Any]) -> str:
+    """Stable hash of the normalized inputs, used as an exact-match key."""
+    canonical = json.dumps(normalize_inputs(inputs), sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+# Used for any field missing from a trigger or batch payload
+INPUT_DEFAULTS = {
+    "crop_type": "General crop",
+    "symptoms": "Various symptoms",
+    "environment": "Normal conditions",
+    "growth_stage": "Mid-season",
+    "location": "General region",
+}
+
+
+def inputs_from_payload(payload: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Crew inputs from an external JSON payload, filling in defaults for missing fields.
+    A ``case_id`` is passed through so resubmitted cases can be re-diagnosed incrementally.
+    """
+    inputs = {field: payload.get(field, default) for field, default in INPUT_DEFAULTS.items()}
+    if payload.get("case_id"):
+        inputs["case_id"] = str(payload["case_id"])
+    return inputs
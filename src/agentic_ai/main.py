@@ -3,13 +3,134 @@ Plantix - AI Farming Assistant
 Created by TejasS1233
 """
 
+import os
 import sys
 import warnings
 from datetime import datetime
-from agentic_ai.crew import AgenticAi
+from pathlib import Path
+from agentic_ai.inputs import input_key, inputs_from_payload
+from agentic_ai.reports import save_report, unique_report_path
+from agentic_ai.singleflight import SingleFlight
+from agentic_ai.startup import preload
+from agentic_ai.tracing import trace_run
+
+# crewai and the crew are imported where they are used, so entry points that never
+# kick off (bad arguments, --help) start fast and one-shot runs start their own work first
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
+REPORT_FILE = 'plantix_farming_report.md'
+
+
+def coalescing_enabled():
+    return os.getenv("PLANTIX_COALESCE", "on").strip().lower() not in ("0", "off", "false", "no")
+
+
+# Concurrent kickoffs of the same crop report share one crew run
+KICKOFF_FLIGHT = SingleFlight()
+
+
+def kickoff(inputs, task_callback=None, report_path=None, case_id=None):
+    """
+    Kick off the crew, answering repeated and near-identical crop reports from the response cache.
+    If given, ``task_callback`` receives each task's output as soon as that task finishes.
+    The report is written atomically to ``report_path`` only if one is given, so concurrent
+    kickoffs never share an output file.
+    With a ``case_id`` (argument or ``"case_id"`` input), tasks whose inputs and upstream
+    conclusions are unchanged since the case's last kickoff reuse their saved output.
+    Kickoffs made while one with the same normalized inputs (and case) is running wait for
+    it and share its result; each still gets its own callbacks, report and history entry.
+    """
+    case_id = case_id or inputs.get("case_id")
+    with trace_run("kickoff", crop_type=str(inputs.get("crop_type", "")), location=str(inputs.get("location", ""))) as trace:
+        def run():
+            return run_crew(inputs, task_callback, case_id)
+
+        if coalescing_enabled():
+            (result, cache_hit), shared = KICKOFF_FLIGHT.do_shared((input_key(inputs), case_id), run)
+        else:
+            (result, cache_hit), shared = run(), False
+        if trace is not None:
+            trace.root.set(cache_hit=cache_hit, coalesced=shared)
+        if (cache_hit or shared) and task_callback is not None:
+            # Only a crew run of this caller's own reported outputs as they finished
+            for output in result.tasks_output:
+                task_callback(output)
+        save_report(result.raw, report_path)
+        record_history(inputs, result)
+        return result
+
+
+def run_crew(inputs, task_callback=None, case_id=None):
+    """
+    The crew's result for ``inputs`` and whether it came from the response cache.
+    Case kickoffs skip the cache lookup, since a near-identical report answered for another
+    farm must not stand in for the case's own incremental run.
+    """
+    from agentic_ai.response_cache import response_cache
+
+    cache = response_cache()
+    if cache is not None and not case_id:
+        cached = cache.get(inputs)
+        if cached is not None:
+            return cached, True
+
+    from agentic_ai.crew import AgenticAi
+    from agentic_ai.incremental import IncrementalRun, incremental_enabled
+
+    crew = AgenticAi().crew()
+    run = IncrementalRun(str(case_id), inputs) if case_id and incremental_enabled() else None
+    for crew_task in crew.tasks:
+        if task_callback is not None:
+            crew_task.callback = task_callback
+        crew_task.incremental = run
+    result = crew.kickoff(inputs=inputs)
+    if run is not None:
+        run.save()
+        print(f"♻️  Case '{case_id}': reused {len(run.reused)} task output(s), ran {len(run.executed)}")
+    if cache is not None:
+        cache.put(inputs, result)
+    return result, False
+
+
+def record_history(inputs, result):
+    """Add a kickoff's diagnosis to the regional history and print any outbreak it is part of."""
+    from agentic_ai.history import record_result
+
+    try:
+        outbreaks = record_result(inputs, result)
+    except Exception as e:
+        # The report is still delivered; only the history misses this case
+        warnings.warn(f"Could not record the diagnosis history: {e}")
+        return
+    for outbreak in outbreaks:
+        print(f"🚨 Outbreak alert: {outbreak.describe()}")
+
+def kickoff_streaming(inputs, report_path=None):
+    """
+    Kick off the crew, printing each report section as soon as its task finishes
+    (and model output token by token when PLANTIX_STREAM_TOKENS is on).
+    """
+    from agentic_ai.streaming import stream_report
+
+    def run(inputs, task_callback=None):
+        return kickoff(inputs, task_callback=task_callback, report_path=report_path)
+
+    result = None
+    for event in stream_report(inputs, kickoff=run):
+        if event.kind == "token":
+            print(event.text, end="", flush=True)
+        elif event.kind == "section":
+            print()
+            print("-" * 70)
+            print(event.title)
+            print("-" * 70)
+            print(event.text, flush=True)
+        else:
+            result = event.result
+    return result
+
+
 def run():
     """Run the Plantix crop disease diagnosis and farming assistant crew."""
     
@@ -37,14 +158,14 @@ def run():
     print()
 
     try:
-        result = AgenticAi().crew().kickoff(inputs=inputs)
+        result = kickoff_streaming(inputs, report_path=REPORT_FILE)
         
         print()
         print("=" * 70)
         print("✅ Analysis Complete!")
         print("=" * 70)
         print()
-        print("📄 A detailed farming report has been saved to 'plantix_farming_report.md'")
+        print(f"📄 A detailed farming report has been saved to '{REPORT_FILE}'")
         print()
         
         return result
@@ -64,6 +185,8 @@ def run_interactive():
     print()
     print("Please provide information about your crop issue:")
     print()
+    # Load the crew while the farmer is typing
+    preload()
     
     crop_type = input("1. What crop are you growing? (e.g., Tomato, Rice, Wheat): ").strip()
     print()
@@ -98,14 +221,14 @@ def run_interactive():
     print()
     
     try:
-        result = AgenticAi().crew().kickoff(inputs=inputs)
+        result = kickoff_streaming(inputs, report_path=REPORT_FILE)
         
         print()
         print("=" * 70)
         print("✅ Analysis Complete!")
         print("=" * 70)
         print()
-        print("📄 A detailed farming report has been saved to 'plantix_farming_report.md'")
+        print(f"📄 A detailed farming report has been saved to '{REPORT_FILE}'")
         print()
         
         return result
@@ -125,6 +248,8 @@ def train():
         "growth_stage": "Vegetative stage",
         "location": "Tropical region"
     }
+    from agentic_ai.crew import AgenticAi
+
     try:
         AgenticAi().crew().train(n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs=inputs)
 
@@ -136,6 +261,8 @@ def replay():
     """
     Replay the crew execution from a specific task.
     """
+    from agentic_ai.crew import AgenticAi
+
     try:
         AgenticAi().crew().replay(task_id=sys.argv[1])
 
@@ -155,6 +282,8 @@ def test():
         "location": "Temperate region"
     }
 
+    from agentic_ai.crew import AgenticAi
+
     try:
         AgenticAi().crew().test(n_iterations=int(sys.argv[1]), eval_llm=sys.argv[2], inputs=inputs)
 
@@ -179,20 +308,135 @@ def run_with_trigger():
     # Extract crop info from trigger payload or use defaults
     inputs = {
         "crewai_trigger_payload": trigger_payload,
-        "crop_type": trigger_payload.get("crop_type", "General crop"),
-        "symptoms": trigger_payload.get("symptoms", "Various symptoms"),
-        "environment": trigger_payload.get("environment", "Normal conditions"),
-        "growth_stage": trigger_payload.get("growth_stage", "Mid-season"),
-        "location": trigger_payload.get("location", "General region")
+        **inputs_from_payload(trigger_payload)
     }
 
+    # Triggers can fire concurrently, so each run gets its own report file
+    report_path = unique_report_path()
     try:
-        result = AgenticAi().crew().kickoff(inputs=inputs)
+        result = kickoff(inputs, report_path=report_path)
+        print(f"📄 Report saved to '{report_path}'")
         return result
     except Exception as e:
         raise Exception(f"An error occurred while running the crew with trigger: {e}")
 
 
+def run_batch():
+    """
+    Diagnose every crop report in a JSONL file and stream results to a JSONL output.
+    Usage: run_batch <input.jsonl> <output.jsonl> [workers]
+    Rerunning with the same output file resumes after the last completed item.
+    """
+    from agentic_ai.batch import run_batch as process_batch
+
+    if len(sys.argv) < 3:
+        raise Exception("Usage: run_batch <input.jsonl> <output.jsonl> [workers]")
+
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    print("=" * 70)
+    print("🌱 PLANTIX - Batch Crop Diagnosis 🌱")
+    print("=" * 70)
+    print()
+
+    try:
+        counts = process_batch(Path(sys.argv[1]), Path(sys.argv[2]), kickoff=kickoff, workers=workers)
+    except Exception as e:
+        raise Exception(f"An error occurred while running the batch: {e}")
+
+    print()
+    print("=" * 70)
+    print(f"✅ Batch Complete! {counts['ok']} succeeded, {counts['error']} failed, "
+          f"{counts['skipped']} already done")
+    coalesced = KICKOFF_FLIGHT.stats()["coalesced"]
+    if coalesced:
+        print(f"🔗 {coalesced} item(s) shared the crew run of an identical item running at the same time")
+    print("=" * 70)
+    return counts
+
+
+def serve():
+    """
+    Run Plantix as a long-lived HTTP service with a bounded request queue.
+    Usage: serve [host] [port]
+    """
+    from aiohttp import web
+    from agentic_ai.service import DiagnosisService, warm_up
+
+    host = sys.argv[1] if len(sys.argv) > 1 else os.getenv("PLANTIX_SERVICE_HOST", "127.0.0.1")
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else int(os.getenv("PLANTIX_SERVICE_PORT", "8080"))
+
+    print("=" * 70)
+    print("🌱 PLANTIX - Diagnosis Service 🌱")
+    print("=" * 70)
+    print()
+    print("🔧 Warming up crew configuration and knowledge base...")
+    warm_up()
+
+    service = DiagnosisService(kickoff=kickoff, coalescing=KICKOFF_FLIGHT)
+    print(f"🚀 Listening on http://{host}:{port} "
+          f"({service.concurrency} workers, queue size {service.queue_size})")
+    web.run_app(service.app(), host=host, port=port, print=None)
+
+
+
+def benchmark():
+    """
+    Benchmark the crew offline against the local stub LLM over a fixed scenario corpus.
+    Usage: benchmark [--iterations N] [--latency SECONDS] [--json out.json] [--baseline bench.json]
+    Exits non-zero when a metric regresses beyond --tolerance of the baseline.
+    """
+    from agentic_ai.benchmark import main as run_benchmark
+
+    print("=" * 70)
+    print("🌱 PLANTIX - Offline Crew Benchmark 🌱")
+    print("=" * 70)
+    print()
+
+    try:
+        status = run_benchmark(sys.argv[1:])
+    except Exception as e:
+        raise Exception(f"An error occurred while running the benchmark: {e}")
+    sys.exit(status)
+
+
+def index_knowledge():
+    """
+    Build the agronomy library index, or show what a query retrieves from it.
+    Usage: index_knowledge ["query"] [--top N]
+    """
+    from agentic_ai.tools.document_index import main as run_index
+
+    print("=" * 70)
+    print("🌱 PLANTIX - Agronomy Library Index 🌱")
+    print("=" * 70)
+    print()
+
+    try:
+        status = run_index(sys.argv[1:])
+    except Exception as e:
+        raise Exception(f"An error occurred while indexing the agronomy library: {e}")
+    sys.exit(status)
+
+
+def history():
+    """
+    Query the regional history of past diagnoses.
+    Usage: history top [region] [--crop CROP] [--days N] | history outbreaks [region] [--crop CROP] [--fail-on-outbreak]
+    """
+    from agentic_ai.history import main as query_history
+
+    print("=" * 70)
+    print("🌱 PLANTIX - Regional Diagnosis History 🌱")
+    print("=" * 70)
+    print()
+
+    try:
+        status = query_history(sys.argv[1:])
+    except Exception as e:
+        raise Exception(f"An error occurred while querying the history: {e}")
+    sys.exit(status)
+
 if __name__ == "__main__":
     # If run directly, use interactive mode
     run_interactive()
@@ -0,0 +1,237 @@
+"""
+Plantix - Structured Task Outputs
+Created by TejasS1233
+
+Typed results for the diagnosis, treatment and prevention tasks. Agents return JSON
+matching these models (``output_pydantic`` on the task), so downstream agents and
+callers read fields instead of re-parsing prose. ``to_markdown`` renders each one for
+farmers; the farming guide stays a free-text report.
+
+A diagnosis can name several co-occurring issues. Treatment and prevention plans made
+per issue are combined with ``merge``.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel, Field
+
+
+# Most severe first; severities outside this list rank after all of them
+SEVERITY_ORDER = ("critical", "high", "moderate", "low")
+
+
+def severity_rank(severity: str) -> int:
+    severity = severity.strip().lower()
+    return SEVERITY_ORDER.index(severity) if severity in SEVERITY_ORDER else len(SEVERITY_ORDER)
+
+
+def _unique(items: Iterable[str]) -> List[str]:
+    """``items`` without case-insensitive repeats, in first-seen order."""
+    seen, unique = set(), []
+    for item in items:
+        key = item.strip().lower()
+        if key not in seen:
+            seen.add(key)
+            unique.append(item)
+    return unique
+
+
+class Issue(BaseModel):
+    """A disease, pest or disorder present in a field report."""
+    name: str = Field(..., description="Common name of the disease, pest or disorder")
+    scientific_name: Optional[str] = Field(None, description="Scientific name of the pathogen or pest")
+    kind: Optional[str] = Field(None, description="disease, pest or disorder")
+    confidence: float = Field(..., ge=0, le=100, description="Confidence that this issue is present, 0-100 percent")
+    severity: str = Field(..., description="Severity: low, moderate, high or critical")
+    symptom_match: Optional[str] = Field(None, description="Which of the observed symptoms this issue explains")
+
+    @property
+    def label(self) -> str:
+        return f"{self.name} ({self.scientific_name})" if self.scientific_name else self.name
+
+
+class Diagnosis(BaseModel):
+    """Output schema for disease_diagnosis_task."""
+    name: str = Field(..., description="Common name of the disease, pest or disorder")
+    scientific_name: Optional[str] = Field(None, description="Scientific name of the pathogen or pest")
+    confidence: float = Field(..., ge=0, le=100, description="Confidence in the diagnosis, 0-100 percent")
+    severity: str = Field(..., description="Severity: low, moderate, high or critical")
+    progression_stage: Optional[str] = Field(None, description="How far the disease has progressed")
+    yield_impact: Optional[str] = Field(None, description="Expected yield loss if left untreated")
+    spread_risk: Optional[str] = Field(None, description="Risk of spread to other plants")
+    alternatives: List[str] = Field(default_factory=list, description="Alternative diagnoses, most likely first")
+    symptom_match: Optional[str] = Field(None, description="How the observed symptoms match the diagnosis")
+    additional_issues: List[Issue] = Field(
+        default_factory=list,
+        description="Other diseases, pests or disorders present at the same time as the main diagnosis "
+                    "(not alternative explanations of the same symptoms)",
+    )
+
+    def issues(self) -> List[Issue]:
+        """Every issue found: the main diagnosis, then the others, most severe and likely first."""
+        primary = Issue(
+            name=self.name,
+            scientific_name=self.scientific_name,
+            confidence=self.confidence,
+            severity=self.severity,
+            symptom_match=self.symptom_match,
+        )
+        others = sorted(self.additional_issues, key=lambda issue: (severity_rank(issue.severity), -issue.confidence))
+        return [primary] + others
+
+    def to_markdown(self) -> str:
+        name = f"{self.name} (*{self.scientific_name}*)" if self.scientific_name else self.name
+        lines = [
+            f"**Diagnosis:** {name}",
+            f"**Confidence:** {self.confidence:.0f}%",
+            f"**Severity:** {self.severity}",
+        ]
+        for label, value in (
+            ("Progression stage", self.progression_stage),
+            ("Yield impact", self.yield_impact),
+            ("Spread risk", self.spread_risk),
+            ("Symptom match", self.symptom_match),
+        ):
+            if value:
+                lines.append(f"**{label}:** {value}")
+        if self.alternatives:
+            lines.append("**Alternative diagnoses:** " + ", ".join(self.alternatives))
+        if self.additional_issues:
+            lines.append("**Also present:**")
+            for issue in self.issues()[1:]:
+                kind = f"{issue.kind}, " if issue.kind else ""
+                lines.append(f"- {issue.label}: {kind}{issue.severity} severity, {issue.confidence:.0f}% confidence")
+        return "\n".join(lines)
+
+
+class TreatmentProduct(BaseModel):
+    name: str = Field(..., description="Product or active ingredient")
+    kind: str = Field(..., description="organic or chemical")
+    dosage: Optional[str] = Field(None, description="Application rate, e.g. '2 g per litre of water'")
+    application: Optional[str] = Field(None, description="How and how often to apply")
+
+
+class CostEstimate(BaseModel):
+    option: str = Field(..., description="Treatment option the cost applies to")
+    budget: str = Field(..., description="low, medium or high")
+    estimate: str = Field(..., description="Approximate cost with currency and area")
+
+
+class TreatmentPlan(BaseModel):
+    """Output schema for treatment_recommendation_task."""
+    immediate_actions: List[str] = Field(default_factory=list, description="What to do within 24-48 hours")
+    steps: List[str] = Field(..., description="Ordered treatment steps")
+    products: List[TreatmentProduct] = Field(default_factory=list, description="Recommended products")
+    costs: List[CostEstimate] = Field(default_factory=list, description="Cost of each treatment option")
+    safety_precautions: List[str] = Field(default_factory=list, description="Safety measures while treating")
+    recovery_timeline: Optional[str] = Field(None, description="Expected time until the crop recovers")
+
+    @classmethod
+    def merge(cls, plans: Sequence[Tuple[str, "TreatmentPlan"]]) -> "TreatmentPlan":
+        """One plan from per-issue ``(issue label, plan)`` pairs; issue-specific entries are labelled."""
+        products, seen = [], set()
+        for _, plan in plans:
+            for product in plan.products:
+                if product.name.strip().lower() not in seen:
+                    seen.add(product.name.strip().lower())
+                    products.append(product)
+        return cls(
+            immediate_actions=[f"{label}: {action}" for label, plan in plans for action in plan.immediate_actions],
+            steps=[f"{label}: {step}" for label, plan in plans for step in plan.steps],
+            products=products,
+            costs=[
+                cost.model_copy(update={"option": f"{label}: {cost.option}"})
+                for label, plan in plans for cost in plan.costs
+            ],
+            safety_precautions=_unique(precaution for _, plan in plans for precaution in plan.safety_precautions),
+            recovery_timeline="; ".join(
+                f"{label}: {plan.recovery_timeline}" for label, plan in plans if plan.recovery_timeline
+            ) or None,
+        )
+
+    def to_markdown(self) -> str:
+        lines = []
+        if self.immediate_actions:
+            lines.append("**Immediate actions (24-48 hours):**")
+            lines += [f"- {action}" for action in self.immediate_actions]
+        lines.append("**Treatment steps:**")
+        lines += [f"{number}. {step}" for number, step in enumerate(self.steps, start=1)]
+        if self.products:
+            lines.append("**Products:**")
+            for product in self.products:
+                details = "; ".join(part for part in (product.dosage, product.application) if part)
+                lines.append(f"- {product.name} ({product.kind})" + (f": {details}" if details else ""))
+        if self.costs:
+            lines.append("**Costs:**")
+            lines += [f"- {cost.option} ({cost.budget} budget): {cost.estimate}" for cost in self.costs]
+        if self.safety_precautions:
+            lines.append("**Safety:**")
+            lines += [f"- {precaution}" for precaution in self.safety_precautions]
+        if self.recovery_timeline:
+            lines.append(f"**Expected recovery:** {self.recovery_timeline}")
+        return "\n".join(lines)
+
+
+class PreventionPlan(BaseModel):
+    """Output schema for prevention_strategy_task."""
+    practices: List[str] = Field(..., description="Long-term cultural and sanitation practices")
+    crop_rotation: Optional[str] = Field(None, description="Crop rotation recommendation")
+    soil_management: List[str] = Field(default_factory=list, description="Soil health measures")
+    irrigation: List[str] = Field(default_factory=list, description="Irrigation and water management tips")
+    resistant_varieties: List[str] = Field(default_factory=list, description="Disease-resistant varieties")
+    warning_signs: List[str] = Field(default_factory=list, description="Early warning signs to monitor")
+    seasonal_calendar: List[str] = Field(default_factory=list, description="Season-by-season actions")
+
+    @classmethod
+    def merge(cls, plans: Sequence[Tuple[str, "PreventionPlan"]]) -> "PreventionPlan":
+        """One plan from per-issue ``(issue label, plan)`` pairs; shared practices appear once."""
+        rotations = _unique(plan.crop_rotation for _, plan in plans if plan.crop_rotation)
+        return cls(
+            practices=_unique(practice for _, plan in plans for practice in plan.practices),
+            crop_rotation="; ".join(rotations) or None,
+            soil_management=_unique(item for _, plan in plans for item in plan.soil_management),
+            irrigation=_unique(item for _, plan in plans for item in plan.irrigation),
+            resistant_varieties=_unique(item for _, plan in plans for item in plan.resistant_varieties),
+            warning_signs=[f"{label}: {sign}" for label, plan in plans for sign in plan.warning_signs],
+            seasonal_calendar=_unique(item for _, plan in plans for item in plan.seasonal_calendar),
+        )
+
+    def to_markdown(self) -> str:
+        lines = []
+        for label, items in (
+            ("Practices", self.practices),
+            ("Soil management", self.soil_management),
+            ("Irrigation", self.irrigation),
+            ("Resistant varieties", self.resistant_varieties),
+            ("Early warning signs", self.warning_signs),
+            ("Seasonal calendar", self.seasonal_calendar),
+        ):
+            if items:
+                lines.append(f"**{label}:**")
+                lines += [f"- {item}" for item in items]
+        if self.crop_rotation:
+            lines.append(f"**Crop rotation:** {self.crop_rotation}")
+        return "\n".join(lines)
+
+
+# Looked up by class name when structured outputs are restored from the response cache
+OUTPUT_MODELS: Dict[str, Type[BaseModel]] = {
+    model.__name__: model for model in (Diagnosis, TreatmentPlan, PreventionPlan)
+}
+
+
+def render_output(output: Any) -> str:
+    """Markdown for a task output: the structured model's rendering when there is one, else the raw text."""
+    model = getattr(output, "pydantic", None)
+    if model is not None and hasattr(model, "to_markdown"):
+        return model.to_markdown()
+    return output.raw
+
+
+def structured_outputs(result: Any) -> Dict[str, Dict[str, Any]]:
+    """The structured task results of a crew run, keyed by task name."""
+    return {
+        output.name: output.pydantic.model_dump()
+        for output in getattr(result, "tasks_output", [])
+        if output.pydantic is not None and output.name
+    }
@@ -0,0 +1,124 @@
+"""
+Plantix - Deterministic Pre-Diagnosis
+Created by TejasS1233
+
+Ranks the knowledge-base diseases against the reported symptoms before any LLM is
+involved. Depending on ``PLANTIX_PREDIAGNOSIS`` the result is:
+
+- ``off``      ignored;
+- ``context``  (default) injected into the diagnosis prompt as a hint;
+- ``skip``     used as the diagnosis itself when its confidence reaches
+               ``PLANTIX_PREDIAGNOSIS_THRESHOLD``, so the diagnostician agent never runs.
+"""
+
+from dataclasses import dataclass
+from typing import Mapping, Optional, Tuple
+import os
+
+import numpy as np
+
+from agentic_ai.models import Diagnosis
+from agentic_ai.tools.knowledge_base import DiseaseRecord, disease_knowledge_base
+
+
+MODES = ("off", "context", "skip")
+
+# Softmax temperature over the candidate cosine scores
+SOFTMAX_TEMPERATURE = 0.1
+# Top cosine score at which the symptom text counts as a full match
+FULL_MATCH_SCORE = 0.45
+
+
+def prediagnosis_mode() -> str:
+    mode = os.getenv("PLANTIX_PREDIAGNOSIS", "context").strip().lower()
+    if mode not in MODES:
+        raise ValueError(f"PLANTIX_PREDIAGNOSIS must be one of {', '.join(MODES)}, got '{mode}'")
+    return mode
+
+
+def prediagnosis_threshold() -> float:
+    return float(os.getenv("PLANTIX_PREDIAGNOSIS_THRESHOLD", "0.65"))
+
+
+@dataclass(frozen=True)
+class PreDiagnosis:
+    """Index-based diagnosis candidate with a calibrated 0-1 confidence."""
+    disease: Optional[DiseaseRecord]
+    confidence: float
+    alternatives: Tuple[Tuple[DiseaseRecord, float], ...] = ()
+
+    def is_confident(self, threshold: Optional[float] = None) -> bool:
+        threshold = prediagnosis_threshold() if threshold is None else threshold
+        return self.disease is not None and self.confidence >= threshold
+
+    def as_context(self) -> str:
+        """Short hint for the diagnostician's prompt."""
+        if self.disease is None:
+            return "No knowledge-base match for these symptoms; diagnose from the symptoms alone."
+        alternatives = ", ".join(f"{record.name.title()} ({score:.0%})" for record, score in self.alternatives)
+        return (
+            f"Knowledge-base pre-diagnosis: {self.disease.name.title()} ({self.disease.scientific_name}), "
+            f"confidence {self.confidence:.0%}. "
+            + (f"Other candidates: {alternatives}. " if alternatives else "")
+            + "Verify this against the symptoms before relying on it."
+        )
+
+    def as_report(self, inputs: Mapping[str, str]) -> str:
+        """Stand-in diagnosis report used when the diagnostician agent is skipped."""
+        disease = self.disease
+        output = "Disease Diagnosis (knowledge-base pre-diagnosis)\n\n"
+        output += f"Crop: {inputs.get('crop_type', 'Unknown')}\n"
+        output += f"Primary Diagnosis: {disease.name.title()} ({disease.scientific_name})\n"
+        output += f"Confidence: {self.confidence:.0%}\n"
+        if self.alternatives:
+            output += "Alternative Diagnoses: "
+            output += ", ".join(f"{record.name.title()} ({score:.0%})" for record, score in self.alternatives)
+            output += "\n"
+        output += f"Observed Symptoms: {inputs.get('symptoms', '')}\n"
+        output += f"Known Symptoms: {disease.symptoms}\n"
+        output += f"Environmental Conditions: {inputs.get('environment', '')}\n"
+        output += f"Causes and Spread: {disease.causes}\n"
+        output += f"Growth Stage: {inputs.get('growth_stage', '')}\n"
+        output += f"Standard Treatment: {disease.treatment}\n"
+        output += f"Standard Prevention: {disease.prevention}\n"
+        return output
+
+
+    def as_diagnosis(self) -> Diagnosis:
+        """Structured counterpart of ``as_report``."""
+        disease = self.disease
+        return Diagnosis(
+            name=disease.name.title(),
+            scientific_name=disease.scientific_name,
+            confidence=round(self.confidence * 100, 1),
+            severity="not assessed (knowledge-base match)",
+            alternatives=[f"{record.name.title()} ({score:.0%})" for record, score in self.alternatives],
+            symptom_match=disease.symptoms,
+        )
+
+
+def prediagnose(inputs: Mapping[str, str], top_k: int = 5) -> PreDiagnosis:
+    """Rank diseases for ``inputs['symptoms']`` (restricted to ``inputs['crop_type']`` when known)."""
+    symptoms = inputs.get("symptoms") or ""
+    crop = inputs.get("crop_type") or None
+    knowledge_base = disease_knowledge_base()
+    if crop and not knowledge_base.knows_crop(crop):
+        crop = None
+
+    ranked = knowledge_base.search(symptoms, crop=crop, top_k=top_k)
+    if not ranked or ranked[0][1] <= 0:
+        return PreDiagnosis(disease=None, confidence=0.0)
+
+    scores = np.array([score for _, score in ranked], dtype=np.float64)
+    probabilities = np.exp((scores - scores[0]) / SOFTMAX_TEMPERATURE)
+    probabilities /= probabilities.sum()
+    coverage = min(1.0, scores[0] / FULL_MATCH_SCORE)
+
+    return PreDiagnosis(
+        disease=ranked[0][0],
+        confidence=float(probabilities[0] * coverage),
+        alternatives=tuple(
+            (record, float(probability * coverage))
+            for (record, _), probability in zip(ranked[1:3], probabilities[1:3])
+        ),
+    )
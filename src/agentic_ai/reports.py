@@ -0,0 +1,94 @@
+"""
+Plantix - Report Output
+Created by TejasS1233
+
+Reports are no longer written by the crew to one shared ``plantix_farming_report.md``.
+Every kickoff returns its report in memory, and callers choose where (if anywhere) it
+goes: a path of their own, a unique per-request path under ``PLANTIX_REPORTS_DIR``, or
+the content-addressed store. All writes are atomic (temporary file + rename), so
+concurrent crews never see or leave a half-written report.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Union
+import hashlib
+import os
+import tempfile
+import uuid
+
+
+def atomic_write(path: Union[str, Path], text: str) -> Path:
+    """Write ``text`` to ``path`` so readers see either the old file or the complete new one."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return path
+
+
+def reports_dir() -> Path:
+    return Path(os.getenv("PLANTIX_REPORTS_DIR", "reports"))
+
+
+def unique_report_path(prefix: str = "plantix_report") -> Path:
+    """A fresh path under the reports directory, distinct for every call."""
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return reports_dir() / f"{prefix}-{stamp}-{uuid.uuid4().hex[:8]}.md"
+
+
+class ReportStore:
+    """
+    Content-addressed report files: ``<root>/<ab>/<sha256>.md``.
+
+    Identical reports share one file, and a report's path follows from its text, so
+    stores can be shared by any number of processes without coordination.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = reports_dir() / "store" if root is None else Path(root)
+
+    @staticmethod
+    def digest(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def path_for(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.md"
+
+    def put(self, text: str) -> str:
+        """Store ``text`` and return its digest."""
+        digest = self.digest(text)
+        path = self.path_for(digest)
+        if not path.exists():
+            atomic_write(path, text)
+        return digest
+
+    def get(self, digest: str) -> Optional[str]:
+        path = self.path_for(digest)
+        return path.read_text(encoding="utf-8") if path.exists() else None
+
+
+def report_store() -> Optional[ReportStore]:
+    """The content-addressed store, or None unless PLANTIX_REPORT_STORE is on."""
+    if os.getenv("PLANTIX_REPORT_STORE", "off").strip().lower() not in ("1", "on", "true", "yes"):
+        return None
+    return ReportStore()
+
+
+def save_report(text: str, path: Optional[Union[str, Path]] = None) -> Optional[str]:
+    """
+    Route one kickoff's report: atomically to ``path`` when given, and into the report
+    store when it is enabled. Returns the store digest, or None if the store is off.
+    """
+    if path is not None:
+        atomic_write(path, text)
+    store = report_store()
+    return store.put(text) if store is not None else None
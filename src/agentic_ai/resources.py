@@ -0,0 +1,98 @@
+"""
+Plantix - Shared Process Resources
+Created by TejasS1233
+
+LLM clients and tool instances are stateless between calls, so one instance of each
+is created per process and handed to every agent of every crew. Reusing the LLM
+object keeps its provider client and HTTP connection pool warm across agents and
+kickoffs; reusing tools avoids rebuilding pydantic models per agent. Agents are not
+shared, because crewai stores per-kickoff state (crew, executor) on them.
+
+A shared LLM counts the tokens of every agent and kickoff that used it, so crew
+usage metrics are taken as the difference of each distinct client's counters over
+the kickoff (``usage_snapshot`` / ``usage_since``). Kickoffs running at the same time
+on the same clients are then counted in each other's metrics.
+
+Set ``PLANTIX_SHARED_RESOURCES=off`` to construct fresh instances every time.
+"""
+
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple, Type, TypeVar
+import os
+import threading
+
+from crewai import LLM
+from crewai.llms.base_llm import BaseLLM
+from crewai.tools import BaseTool
+from crewai.types.usage_metrics import UsageMetrics
+
+
+ToolT = TypeVar("ToolT", bound=BaseTool)
+
+_lock = threading.Lock()
+_llms: Dict[Hashable, LLM] = {}
+_tools: Dict[Type[BaseTool], BaseTool] = {}
+
+
+def sharing_enabled() -> bool:
+    return os.getenv("PLANTIX_SHARED_RESOURCES", "on").strip().lower() not in ("0", "off", "false", "no")
+
+
+def shared_llm(model: str, api_key: Optional[str] = None, **options: Any) -> LLM:
+    """The process-wide LLM client for this model, key and options."""
+    if not sharing_enabled():
+        return LLM(model=model, api_key=api_key, **options)
+    key: Tuple = (model, api_key, tuple(sorted(options.items())))
+    with _lock:
+        llm = _llms.get(key)
+        if llm is None:
+            llm = _llms[key] = LLM(model=model, api_key=api_key, **options)
+        return llm
+
+
+def shared_llms() -> List[LLM]:
+    """Every LLM client created by ``shared_llm`` so far."""
+    with _lock:
+        return list(_llms.values())
+
+
+def usage_snapshot(llms: Iterable[Any]) -> Dict[int, Tuple[BaseLLM, UsageMetrics]]:
+    """Current token counters of each distinct LLM client, by object id."""
+    return {
+        id(llm): (llm, llm.get_token_usage_summary())
+        for llm in llms
+        if isinstance(llm, BaseLLM)
+    }
+
+
+def usage_since(snapshot: Dict[int, Tuple[BaseLLM, UsageMetrics]], llms: Iterable[Any] = ()) -> UsageMetrics:
+    """Tokens used since ``snapshot`` by its clients and by ``llms`` (counted from zero if new), each client once."""
+    clients = {key: llm for key, (llm, _) in snapshot.items()}
+    clients.update((id(llm), llm) for llm in llms if isinstance(llm, BaseLLM))
+    total = UsageMetrics()
+    for key, llm in clients.items():
+        usage = llm.get_token_usage_summary()
+        if key in snapshot:
+            before = snapshot[key][1]
+            usage = UsageMetrics(**{
+                name: getattr(usage, name) - getattr(before, name) for name in UsageMetrics.model_fields
+            })
+        total.add_usage_metrics(usage)
+    return total
+
+
+def shared_tool(tool_class: Type[ToolT]) -> ToolT:
+    """The process-wide instance of a tool class."""
+    if not sharing_enabled():
+        return tool_class()
+    with _lock:
+        tool = _tools.get(tool_class)
+        if tool is None:
+            tool = _tools[tool_class] = tool_class()
+        return tool
+
+
+def reset_shared_resources() -> None:
+    """Drop cached clients and tools, e.g. after changing MODEL or API keys at runtime."""
+    with _lock:
+        _llms.clear()
+        _tools.clear()
@@ -0,0 +1,242 @@
+"""
+Plantix - Crew Response Cache
+Created by TejasS1233
+
+On-disk cache of whole-crew results keyed on the normalized crop report. A lookup
+first tries the exact key. If that misses, it compares the request against cached
+reports for the same crop, location and symptoms and returns one whose environment
+and growth stage are near-identical (weighted token Jaccard similarity). Symptoms
+must match exactly once normalized: word overlap cannot tell "no yellow leaves" from
+"yellow leaves", nor which leaves are affected.
+
+Entries expire after ``PLANTIX_CACHE_TTL`` seconds. Once ``PLANTIX_CACHE_MAX_ENTRIES``
+is exceeded, the least recently used entries are evicted, so SQLite keeps reusing a
+bounded set of pages. Hit/miss counters are persisted alongside the entries.
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Optional
+import json
+import os
+import sqlite3
+import time
+
+from crewai.crews.crew_output import CrewOutput
+from crewai.tasks.output_format import OutputFormat
+from crewai.tasks.task_output import TaskOutput
+from crewai.types.usage_metrics import UsageMetrics
+
+from agentic_ai.inputs import field_tokens, input_key, normalize_inputs
+from agentic_ai.models import OUTPUT_MODELS
+
+
+# Relative weight of each free-text field in the near-duplicate similarity (symptoms must be equal)
+SIMILARITY_WEIGHTS = {"environment": 0.5, "growth_stage": 0.5}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    bucket TEXT NOT NULL,
+    fields TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_bucket ON responses (bucket);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+CREATE TABLE IF NOT EXISTS stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+STAT_NAMES = ("hits", "near_hits", "misses", "evictions")
+
+
+def cache_dir() -> Path:
+    return Path(os.getenv("PLANTIX_CACHE_DIR", ".plantix_cache"))
+
+
+def _jaccard(left: str, right: str) -> float:
+    left_tokens, right_tokens = field_tokens(left), field_tokens(right)
+    if not left_tokens and not right_tokens:
+        return 1.0
+    return len(left_tokens & right_tokens) / len(left_tokens | right_tokens)
+
+
+def similarity(left: Mapping[str, str], right: Mapping[str, str]) -> float:
+    """Weighted similarity of two normalized inputs that share crop, location and symptoms."""
+    return sum(weight * _jaccard(left[field], right[field]) for field, weight in SIMILARITY_WEIGHTS.items())
+
+
+def dump_task_output(task: TaskOutput) -> Dict[str, Any]:
+    """A JSON-serializable form of a task output, structured result included."""
+    return {
+        "description": task.description,
+        "name": task.name,
+        "expected_output": task.expected_output,
+        "raw": task.raw,
+        "json_dict": task.json_dict,
+        "pydantic": (
+            {"model": type(task.pydantic).__name__, "data": task.pydantic.model_dump()}
+            if task.pydantic is not None else None
+        ),
+        "agent": task.agent,
+    }
+
+
+def load_task_output(data: Dict[str, Any]) -> TaskOutput:
+    """The task output saved by ``dump_task_output``."""
+    data = dict(data)
+    structured = data.pop("pydantic", None)
+    model = OUTPUT_MODELS.get(structured["model"]) if structured else None
+    if model is not None:
+        output_format = OutputFormat.PYDANTIC
+    elif data["json_dict"]:
+        output_format = OutputFormat.JSON
+    else:
+        output_format = OutputFormat.RAW
+    return TaskOutput(
+        output_format=output_format,
+        pydantic=model.model_validate(structured["data"]) if model is not None else None,
+        **data,
+    )
+
+
+def _dump_output(output: CrewOutput) -> str:
+    return json.dumps({
+        "raw": output.raw,
+        "json_dict": output.json_dict,
+        "tasks_output": [dump_task_output(task) for task in output.tasks_output],
+    })
+
+
+def _load_output(payload: str) -> CrewOutput:
+    data = json.loads(payload)
+    return CrewOutput(
+        raw=data["raw"],
+        json_dict=data["json_dict"],
+        tasks_output=[load_task_output(task) for task in data["tasks_output"]],
+        token_usage=UsageMetrics(),
+    )
+
+
+class ResponseCache:
+    """SQLite-backed TTL/LRU cache of crew outputs, safe to share between processes."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        min_similarity: Optional[float] = None,
+    ):
+        self.path = Path(path) if path else cache_dir() / "responses.sqlite3"
+        self.ttl = float(os.getenv("PLANTIX_CACHE_TTL", "604800")) if ttl is None else ttl
+        self.max_entries = int(os.getenv("PLANTIX_CACHE_MAX_ENTRIES", "1000")) if max_entries is None else max_entries
+        self.min_similarity = (
+            float(os.getenv("PLANTIX_CACHE_SIMILARITY", "0.85")) if min_similarity is None else min_similarity
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _bucket(fields: Mapping[str, str]) -> str:
+        # Near-duplicates are only looked for among reports with the same normalized symptoms
+        return f"{fields['crop_type']}|{fields['location']}|{fields['symptoms']}"
+
+    @staticmethod
+    def _count(conn: sqlite3.Connection, name: str, amount: int = 1) -> None:
+        conn.execute(
+            "INSERT INTO stats (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount),
+        )
+
+    def get(self, inputs: Mapping[str, Any]) -> Optional[CrewOutput]:
+        """Cached output for these inputs or a near-duplicate of them, else None."""
+        fields = normalize_inputs(inputs)
+        key = input_key(inputs)
+        now = time.time()
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT key, result FROM responses WHERE key = ? AND created_at > ?",
+                (key, now - self.ttl),
+            ).fetchone()
+            stat = "hits"
+
+            if row is None and self.min_similarity < 1:
+                best_score = self.min_similarity
+                for candidate_key, candidate_fields, result in conn.execute(
+                    "SELECT key, fields, result FROM responses WHERE bucket = ? AND created_at > ?",
+                    (self._bucket(fields), now - self.ttl),
+                ):
+                    score = similarity(fields, json.loads(candidate_fields))
+                    if score >= best_score:
+                        best_score, row = score, (candidate_key, result)
+                stat = "near_hits"
+
+            if row is None:
+                self._count(conn, "misses")
+                return None
+
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, row[0]))
+            self._count(conn, stat)
+        return _load_output(row[1])
+
+    def put(self, inputs: Mapping[str, Any], output: CrewOutput) -> None:
+        fields = normalize_inputs(inputs)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, bucket, fields, result, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (input_key(inputs), self._bucket(fields), json.dumps(fields), _dump_output(output), now, now),
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        evicted = conn.execute("DELETE FROM responses WHERE created_at <= ?", (now - self.ttl,)).rowcount
+        evicted += conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        ).rowcount
+        if evicted:
+            self._count(conn, "evictions", evicted)
+
+    def stats(self) -> Dict[str, Any]:
+        """Persisted hit/miss/eviction counters plus the current entry count and hit rate."""
+        with self._connect() as conn:
+            counters = dict(conn.execute("SELECT name, value FROM stats").fetchall())
+            entries = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        stats = {name: counters.get(name, 0) for name in STAT_NAMES}
+        lookups = stats["hits"] + stats["near_hits"] + stats["misses"]
+        stats["entries"] = entries
+        stats["hit_rate"] = (stats["hits"] + stats["near_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+            conn.execute("DELETE FROM stats")
+
+
+def response_cache() -> Optional[ResponseCache]:
+    """The configured cache, or None when ``PLANTIX_RESPONSE_CACHE`` is turned off."""
+    if os.getenv("PLANTIX_RESPONSE_CACHE", "on").strip().lower() in ("0", "off", "false", "no"):
+        return None
+    return ResponseCache()
@@ -0,0 +1,305 @@
+"""
+Plantix - Weather-based Disease Risk
+Created by TejasS1233
+
+Scores every disease in the knowledge base against the weather at once, instead of
+leaving the agents to reason about "high humidity, 18-22°C" in prose. Each disease
+has an infection profile in ``knowledge/diseases.jsonl``: a temperature band, the
+relative humidity an hour needs to count as favorable, how many favorable hours make
+the risk high, and whether recent rain raises or lowers it.
+
+Conditions are 24 hourly temperature and humidity values plus rain. They come from
+live weather, or they are built from the free-text ``environment`` input with a typical
+day/night cycle. For every field and disease the model counts favorable hours:
+temperature suitability (a trapezoid over the band) times humidity suitability. It turns
+them into a 0-1 risk with rain adjustment and a crop mask. All of this is a handful of
+NumPy operations over a fields x hours x diseases array, so thousands of fields score
+in milliseconds (``score_conditions``).
+
+The ranked risks go to the diagnosis and prevention prompts as ``{risk_assessment}``
+and replace the fixed per-climate risk text of the weather tool. Set
+``PLANTIX_RISK_MODEL=off`` to leave them out of the prompts.
+"""
+
+from dataclasses import dataclass
+from typing import List, Mapping, Optional, Sequence, Tuple
+import os
+import re
+import threading
+
+import numpy as np
+
+from agentic_ai.tools.knowledge_base import DiseaseKnowledgeBase, DiseaseRecord, disease_knowledge_base
+
+
+HOURS = 24
+
+# Risk level boundaries on the 0-1 score
+LEVELS = ((0.66, "high"), (0.33, "moderate"), (0.0, "low"))
+
+# Defaults for whatever the environment text does not mention
+DEFAULT_TEMPERATURE = 22.0
+DEFAULT_HUMIDITY = 65.0
+
+# Day/night swing of the synthesized hourly series (peak temperature mid-afternoon)
+TEMPERATURE_SWING = 5.0
+HUMIDITY_SWING = 12.0
+
+# Rain (mm over 24 hours) at which the rain adjustment is at full strength
+FULL_RAIN_MM = 10.0
+
+_NUMBER = r"(-?\d+(?:\.\d+)?)"
+_TEMPERATURE_RANGE = re.compile(_NUMBER + r"\s*(?:-|–|to)\s*" + _NUMBER + r"\s*°?\s*([cf])\b", re.IGNORECASE)
+# "28C", "28 °C", "82 degrees F", or "28°" / "28 degrees" without a unit (but not "5 plants")
+_TEMPERATURE = re.compile(_NUMBER + r"\s*(?:(?:°\s*|degrees?\s*)?([cf])\b|°|degrees?\b)", re.IGNORECASE)
+_HUMIDITY_RANGE = re.compile(_NUMBER + r"\s*%?\s*(?:-|–|to)\s*" + _NUMBER + r"\s*%")
+_HUMIDITY = re.compile(_NUMBER + r"\s*%")
+_RAIN = re.compile(_NUMBER + r"\s*mm\b", re.IGNORECASE)
+
+# First matching phrase wins, so more specific phrases come first
+TEMPERATURE_WORDS = (("very hot", 36.0), ("hot", 32.0), ("tropical", 28.0), ("warm", 26.0), ("mild", 20.0),
+                     ("cool", 14.0), ("cold", 8.0), ("freezing", 2.0))
+HUMIDITY_WORDS = (("very high humidity", 92.0), ("very humid", 92.0), ("high humidity", 85.0),
+                  ("moderate humidity", 65.0), ("low humidity", 35.0), ("humid", 82.0), ("tropical", 80.0),
+                  ("arid", 25.0), ("dry", 40.0))
+RAIN_WORDS = (("heavy rain", 25.0), ("monsoon", 25.0), ("flood", 25.0), ("waterlogged", 20.0),
+              ("continuous rain", 20.0), ("recent rain", 10.0), ("rain", 8.0), ("showers", 6.0),
+              ("irrigat", 4.0), ("drought", 0.0), ("dry", 0.0))
+# Mentions of these mean leaves stay wet overnight
+NIGHT_WETNESS_WORDS = ("dew", "fog", "mist", "overcast", "flood", "waterlogged")
+
+
+def risk_model_enabled() -> bool:
+    return os.getenv("PLANTIX_RISK_MODEL", "on").strip().lower() not in ("0", "off", "false", "no")
+
+
+@dataclass(frozen=True)
+class Conditions:
+    """Hourly temperature (°C) and relative humidity (%) for a day, and rain (mm) over it."""
+    hourly_temperature: Tuple[float, ...]
+    hourly_humidity: Tuple[float, ...]
+    rain_mm: float = 0.0
+    source: str = "reported environment"
+
+
+def _fahrenheit(value: float, unit: str) -> float:
+    return (value - 32) * 5 / 9 if unit and unit.lower() == "f" else value
+
+
+def _mentions(text: str, phrase: str) -> bool:
+    # Phrases match at word starts, so "rain" is not found in "drainage" nor "dew" in "mildew"
+    return re.search(rf"\b{re.escape(phrase)}", text) is not None
+
+
+def _first_word(text: str, words: Sequence[Tuple[str, float]]) -> Optional[float]:
+    for word, value in words:
+        if _mentions(text, word):
+            return value
+    return None
+
+
+def diurnal_day(temperature: float, humidity: float, temperature_swing: float = TEMPERATURE_SWING,
+                humidity_swing: float = HUMIDITY_SWING, night_wetness: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Hourly temperature and humidity for a typical day around the given means."""
+    phase = np.cos(2 * np.pi * (np.arange(HOURS) - 15) / HOURS)  # 1 at 15:00, -1 at 03:00
+    temperatures = temperature + temperature_swing * phase
+    humidities = humidity - humidity_swing * phase + night_wetness * (phase < 0)
+    return temperatures, np.clip(humidities, 0.0, 100.0)
+
+
+def conditions_from_text(text: str) -> Optional[Conditions]:
+    """Conditions described by free text such as "High humidity, 18-22°C, recent rain"; None if it says nothing usable."""
+    lowered = (text or "").lower()
+    temperature = humidity = None
+    temperature_swing, humidity_swing = TEMPERATURE_SWING, HUMIDITY_SWING
+
+    match = _TEMPERATURE_RANGE.search(lowered)
+    if match:
+        low, high = (_fahrenheit(float(match.group(i)), match.group(3)) for i in (1, 2))
+        temperature, temperature_swing = (low + high) / 2, max(abs(high - low) / 2, 1.0)
+    else:
+        match = _TEMPERATURE.search(lowered)
+        if match:
+            temperature = _fahrenheit(float(match.group(1)), match.group(2))
+        else:
+            temperature = _first_word(lowered, TEMPERATURE_WORDS)
+
+    match = _HUMIDITY_RANGE.search(lowered)
+    if match:
+        low, high = float(match.group(1)), float(match.group(2))
+        humidity, humidity_swing = (low + high) / 2, max((high - low) / 2, 1.0)
+    else:
+        match = _HUMIDITY.search(lowered)
+        humidity = float(match.group(1)) if match else _first_word(lowered, HUMIDITY_WORDS)
+
+    match = _RAIN.search(lowered)
+    rain = float(match.group(1)) if match else _first_word(lowered, RAIN_WORDS)
+
+    if temperature is None and humidity is None and rain is None:
+        return None
+    night_wetness = 10.0 if any(_mentions(lowered, word) for word in NIGHT_WETNESS_WORDS) else 0.0
+    temperatures, humidities = diurnal_day(
+        DEFAULT_TEMPERATURE if temperature is None else temperature,
+        DEFAULT_HUMIDITY if humidity is None else humidity,
+        temperature_swing,
+        humidity_swing,
+        night_wetness,
+    )
+    return Conditions(
+        hourly_temperature=tuple(np.round(temperatures, 1)),
+        hourly_humidity=tuple(np.round(humidities, 1)),
+        rain_mm=rain or 0.0,
+    )
+
+
+def conditions_from_weather(report) -> Conditions:
+    """Conditions from a ``WeatherReport`` (its last 24 hourly observations)."""
+    temperatures = report.hourly_temperature or (report.temperature_c,) * HOURS
+    humidities = report.hourly_humidity or (report.humidity_pct,) * HOURS
+    return Conditions(
+        hourly_temperature=tuple(temperatures),
+        hourly_humidity=tuple(humidities),
+        rain_mm=report.rain_24h,
+        source=f"{report.source} weather at {report.observed_at} UTC",
+    )
+
+
+@dataclass(frozen=True)
+class DiseaseRisk:
+    disease: DiseaseRecord
+    score: float
+    favorable_hours: float
+
+    @property
+    def level(self) -> str:
+        return next(level for boundary, level in LEVELS if self.score >= boundary)
+
+    def describe(self) -> str:
+        return f"{self.disease.name.title()}: {self.level} ({self.score:.0%}, {self.favorable_hours:.0f} favorable hours)"
+
+
+def _series(values: Sequence[float]) -> np.ndarray:
+    """Exactly ``HOURS`` values: the last day of a longer series, or a shorter one repeated."""
+    array = np.asarray(values, dtype=np.float64)
+    if array.size == 0:
+        return np.full(HOURS, np.nan)
+    if array.size >= HOURS:
+        return array[-HOURS:]
+    return np.resize(array, HOURS)
+
+
+class RiskModel:
+    """Infection-window risk for every profiled disease, vectorized over fields."""
+
+    def __init__(self, knowledge_base: DiseaseKnowledgeBase):
+        self.knowledge_base = knowledge_base
+        self.positions = np.array(
+            [position for position, record in enumerate(knowledge_base) if record.infection is not None],
+            dtype=np.intp,
+        )
+        records = list(knowledge_base)
+        self.records: Tuple[DiseaseRecord, ...] = tuple(records[position] for position in self.positions)
+        profiles = [record.infection for record in self.records]
+        bands = np.array([profile.temperature for profile in profiles], dtype=np.float64).reshape(-1, 4)
+        self._t_min, self._t_low, self._t_high, self._t_max = bands.T
+        self._humidity = np.array([profile.humidity for profile in profiles], dtype=np.float64)
+        self._hours = np.array([profile.hours for profile in profiles], dtype=np.float64)
+        self._rain_weight = np.array([profile.rain_weight for profile in profiles], dtype=np.float64)
+
+    def crop_mask(self, crop: Optional[str]) -> np.ndarray:
+        """Which profiled diseases apply to ``crop`` (all of them if it is unknown or not given)."""
+        if not crop or not self.knowledge_base.knows_crop(crop):
+            return np.ones(len(self.records), dtype=bool)
+        return self.knowledge_base.crop_mask(crop)[self.positions]
+
+    def favorable_hours(self, temperatures: np.ndarray, humidities: np.ndarray) -> np.ndarray:
+        """(fields, diseases) favorable hours from (fields, hours) temperature and humidity arrays."""
+        t = temperatures[:, :, None]
+        rising = (t - self._t_min) / np.maximum(self._t_low - self._t_min, 1e-6)
+        falling = (self._t_max - t) / np.maximum(self._t_max - self._t_high, 1e-6)
+        temperature_fit = np.clip(np.minimum(rising, falling), 0.0, 1.0)
+        # Humidity suitability ramps up over the 10 points below each disease's threshold
+        humidity_fit = np.clip((humidities[:, :, None] - self._humidity + 10.0) / 10.0, 0.0, 1.0)
+        return np.nansum(temperature_fit * humidity_fit, axis=1)
+
+    def score(self, temperatures: np.ndarray, humidities: np.ndarray, rain: np.ndarray,
+              masks: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(fields, diseases) risk scores in 0-1 and favorable hours."""
+        hours = self.favorable_hours(temperatures, humidities)
+        # Two thirds ("high") at the profile's hour count, saturating beyond it
+        scores = 1.0 - np.power(3.0, -hours / self._hours)
+        wetness = np.clip(rain / FULL_RAIN_MM, 0.0, 1.0)[:, None]
+        scores = np.clip(scores * (1.0 + self._rain_weight * wetness), 0.0, 1.0)
+        if masks is not None:
+            scores = np.where(masks, scores, 0.0)
+        return scores, hours
+
+    def rank(self, conditions: Sequence[Conditions], crops: Optional[Sequence[Optional[str]]] = None,
+             top_k: int = 5, min_score: float = 0.0) -> List[List[DiseaseRisk]]:
+        """The top risks for each field, highest first."""
+        if not conditions:
+            return []
+        scores, hours = score_conditions(conditions, crops, model=self)
+        ranked = []
+        for field_scores, field_hours in zip(scores, hours):
+            order = np.argsort(-field_scores, kind="stable")[:top_k]
+            ranked.append([
+                DiseaseRisk(self.records[d], float(field_scores[d]), float(field_hours[d]))
+                for d in order
+                if field_scores[d] > min_score
+            ])
+        return ranked
+
+
+_model_lock = threading.Lock()
+_model: Optional[RiskModel] = None
+
+
+def risk_model() -> RiskModel:
+    """The risk model for the current disease catalog, rebuilt when the catalog reloads."""
+    global _model
+    knowledge_base = disease_knowledge_base()
+    with _model_lock:
+        if _model is None or _model.knowledge_base is not knowledge_base:
+            _model = RiskModel(knowledge_base)
+        return _model
+
+
+def score_conditions(conditions: Sequence[Conditions], crops: Optional[Sequence[Optional[str]]] = None,
+                     model: Optional[RiskModel] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score many fields at once: (fields, diseases) risk scores and favorable hours, with
+    diseases in ``model.records`` order. ``crops`` masks out diseases not recorded for
+    each field's crop.
+    """
+    model = model or risk_model()
+    temperatures = np.stack([_series(field.hourly_temperature) for field in conditions])
+    humidities = np.stack([_series(field.hourly_humidity) for field in conditions])
+    rain = np.array([field.rain_mm for field in conditions], dtype=np.float64)
+    masks = None
+    if crops is not None:
+        masks = np.stack([model.crop_mask(crop) for crop in crops])
+    return model.score(temperatures, humidities, rain, masks)
+
+
+def assess(conditions: Optional[Conditions], crop: Optional[str] = None, top_k: int = 3) -> List[DiseaseRisk]:
+    """The top weather risks for one field."""
+    if conditions is None:
+        return []
+    model = risk_model()
+    return model.rank([conditions], [crop], top_k=top_k, min_score=0.0)[0]
+
+
+def format_risks(risks: Sequence[DiseaseRisk], conditions: Conditions) -> str:
+    lines = [f"Weather-based disease risk (from {conditions.source}):"]
+    lines += [f"- {risk.describe()}" for risk in risks]
+    return "\n".join(lines)
+
+
+def risk_context(inputs: Mapping[str, str]) -> str:
+    """Risk summary for the prompts, from the reported environment and crop."""
+    conditions = conditions_from_text(inputs.get("environment", ""))
+    risks = assess(conditions, inputs.get("crop_type"))
+    if not risks:
+        return "Not available (no usable temperature, humidity or rain in the reported environment)."
+    return format_risks(risks, conditions)
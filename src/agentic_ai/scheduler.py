@@ -0,0 +1,124 @@
+"""
+Plantix - DAG Task Scheduler
+Created by TejasS1233
+
+``Process.sequential`` runs every task after the previous one, even when a task only
+needs some of them. ``DagCrew`` keeps the regular crew setup (input interpolation,
+agent wiring, callbacks) but executes tasks from the dependency graph formed by
+their ``context`` lists: a task starts as soon as every task in its context has
+finished, and independent tasks run concurrently on a bounded thread pool.
+
+Select it with ``PLANTIX_PROCESS=dag``; ``sequential`` (default) keeps the stock process.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Set
+import contextvars
+import os
+import threading
+
+from crewai import Task
+from crewai.crews.crew_output import CrewOutput
+from crewai.tasks.task_output import TaskOutput
+from crewai.utilities.constants import NOT_SPECIFIED
+from pydantic import Field
+
+from agentic_ai.compaction import CompactingCrew
+
+
+PROCESS_MODES = ("sequential", "dag")
+
+
+def process_mode() -> str:
+    mode = os.getenv("PLANTIX_PROCESS", "sequential").strip().lower()
+    if mode not in PROCESS_MODES:
+        raise ValueError(f"PLANTIX_PROCESS must be one of {', '.join(PROCESS_MODES)}, got '{mode}'")
+    return mode
+
+
+def task_dependencies(tasks: List[Task]) -> Dict[Task, Set[Task]]:
+    """
+    Map each task to the tasks in its ``context`` that are part of this run.
+
+    A task without an explicit ``context`` depends on every earlier task, matching
+    what the sequential process feeds it.
+    """
+    scheduled = set(tasks)
+    dependencies: Dict[Task, Set[Task]] = {}
+    for position, task in enumerate(tasks):
+        if isinstance(task.context, list):
+            dependencies[task] = {dependency for dependency in task.context if dependency in scheduled}
+        elif task.context is NOT_SPECIFIED:
+            dependencies[task] = set(tasks[:position])
+        else:
+            dependencies[task] = set()
+    return dependencies
+
+
+class DagCrew(CompactingCrew):
+    """Crew that schedules tasks by their context dependencies instead of list order."""
+
+    max_parallel_tasks: int = Field(
+        default_factory=lambda: int(os.getenv("PLANTIX_MAX_PARALLEL_TASKS", "4")),
+        description="Maximum number of tasks executing at the same time",
+    )
+
+    def _run_sequential_process(self) -> CrewOutput:
+        return self._execute_dag(self.tasks)
+
+    def _execute_dag(self, tasks: List[Task]) -> CrewOutput:
+        dependencies = task_dependencies(tasks)
+        pending = list(tasks)
+        finished: Dict[Task, TaskOutput] = {}
+        running: Dict[Future, Task] = {}
+        # An agent works on one task at a time even when its tasks are independent
+        agent_locks: Dict[int, threading.Lock] = {}
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_parallel_tasks)) as pool:
+            while pending or running:
+                for task in [t for t in pending if dependencies[t] <= finished.keys()]:
+                    pending.remove(task)
+                    agent = self._get_agent_to_use(task)
+                    if agent is None:
+                        raise ValueError(
+                            f"No agent available for task: {task.description}. "
+                            f"Ensure that the task has an assigned agent."
+                        )
+                    lock = agent_locks.setdefault(id(agent), threading.Lock())
+                    upstream = [finished[t] for t in tasks if t in dependencies[task]]
+                    context = contextvars.copy_context()
+                    future = pool.submit(context.run, self._execute_dag_task, task, agent, lock, upstream)
+                    running[future] = task
+
+                if not running:
+                    raise ValueError(
+                        "Task context dependencies form a cycle: "
+                        + ", ".join(task.name or task.description[:40] for task in pending)
+                    )
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    output = future.result()
+                    finished[task] = output
+                    self._process_task_result(task, output)
+                    self._store_execution_log(task, output, tasks.index(task))
+
+        # Keep declaration order so the last declared task is still the crew's final output
+        return self._create_crew_output([finished[task] for task in tasks])
+
+    def _execute_dag_task(
+        self,
+        task: Task,
+        agent,
+        lock: threading.Lock,
+        upstream: List[TaskOutput],
+    ) -> TaskOutput:
+        tools = self._prepare_tools(agent, task, task.tools or agent.tools or [])
+        with lock:
+            self._log_task_start(task, agent.role)
+            return task.execute_sync(
+                agent=agent,
+                context=self._get_context(task, upstream),
+                tools=tools,
+            )
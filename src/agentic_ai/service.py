@@ -0,0 +1,188 @@
+"""
+Plantix - Diagnosis HTTP Service
+Created by TejasS1233
+
+Long-lived asyncio front-end for the crew. Imports, YAML parsing and knowledge-base
+indexes are warmed once at startup instead of per request. Requests are queued on a
+bounded queue and served by a fixed number of workers; when the queue is full, new
+requests get ``429 Too Many Requests`` with a ``Retry-After`` header.
+
+Endpoints:
+    POST /diagnose      crop report JSON -> 202 {"job_id", "status", "status_url"}
+    GET  /jobs/{id}     job status; includes the report once the job is done
+    GET  /health        queue depth, running jobs, worker count and coalesced requests
+
+Requires the ``service`` extra (``pip install -e .[service]``).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import os
+import time
+import uuid
+
+from aiohttp import web
+
+from agentic_ai.inputs import inputs_from_payload
+from agentic_ai.models import structured_outputs
+from agentic_ai.reports import ReportStore, report_store
+from agentic_ai.singleflight import SingleFlight
+
+
+@dataclass
+class Job:
+    """A queued diagnosis request and, once finished, its outcome."""
+    id: str
+    inputs: Dict[str, Any]
+    status: str = "queued"
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[str] = None
+    structured: Dict[str, Any] = field(default_factory=dict)
+    report_id: Optional[str] = None
+    error: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = {
+            "job_id": self.id,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.status == "done":
+            data["result"] = self.result
+            data["structured"] = self.structured
+            if self.report_id is not None:
+                data["report_id"] = self.report_id
+        elif self.status == "failed":
+            data["error"] = self.error
+        return data
+
+
+class DiagnosisService:
+    """Bounded job queue in front of a synchronous kickoff function."""
+
+    def __init__(
+        self,
+        kickoff: Callable[[Dict[str, Any]], Any],
+        concurrency: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        job_ttl: Optional[float] = None,
+        coalescing: Optional[SingleFlight] = None,
+    ):
+        self.kickoff = kickoff
+        # The single-flight group ``kickoff`` coalesces identical requests in, for /health
+        self.coalescing = coalescing
+        self.concurrency = int(os.getenv("PLANTIX_SERVICE_CONCURRENCY", "4")) if concurrency is None else concurrency
+        self.queue_size = int(os.getenv("PLANTIX_SERVICE_QUEUE_SIZE", "100")) if queue_size is None else queue_size
+        self.job_ttl = float(os.getenv("PLANTIX_SERVICE_JOB_TTL", "3600")) if job_ttl is None else job_ttl
+        self.jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def start(self, app: web.Application) -> None:
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="plantix-job")
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def stop(self, app: web.Application) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            job.status, job.started_at = "running", time.time()
+            try:
+                output = await loop.run_in_executor(self._executor, self.kickoff, job.inputs)
+                job.result = getattr(output, "raw", str(output))
+                job.structured = structured_outputs(output)
+                if report_store() is not None:
+                    job.report_id = ReportStore.digest(job.result)
+                job.status = "done"
+            except Exception as e:
+                job.error = f"{type(e).__name__}: {e}"
+                job.status = "failed"
+            finally:
+                job.finished_at = time.time()
+                self._queue.task_done()
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.job_ttl
+        for job_id in [j.id for j in self.jobs.values() if j.finished_at and j.finished_at < cutoff]:
+            del self.jobs[job_id]
+
+    def running(self) -> int:
+        return sum(1 for job in self.jobs.values() if job.status == "running")
+
+    async def submit(self, request: web.Request) -> web.Response:
+        try:
+            payload = await request.json()
+        except ValueError:
+            # Malformed JSON or a body that is not UTF-8 (both are ValueErrors)
+            return web.json_response({"error": "Request body must be a JSON object"}, status=400)
+        if not isinstance(payload, dict):
+            return web.json_response({"error": "Request body must be a JSON object"}, status=400)
+
+        self._prune()
+        job = Job(id=uuid.uuid4().hex, inputs=inputs_from_payload(payload))
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            return web.json_response(
+                {"error": "Diagnosis queue is full, retry later", "queue_size": self.queue_size},
+                status=429,
+                headers={"Retry-After": os.getenv("PLANTIX_SERVICE_RETRY_AFTER", "30")},
+            )
+        self.jobs[job.id] = job
+        return web.json_response(
+            {"job_id": job.id, "status": job.status, "status_url": f"/jobs/{job.id}"},
+            status=202,
+        )
+
+    async def status(self, request: web.Request) -> web.Response:
+        job = self.jobs.get(request.match_info["job_id"])
+        if job is None:
+            return web.json_response({"error": "Unknown job id"}, status=404)
+        return web.json_response(job.as_dict())
+
+    async def health(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            "status": "ok",
+            "queued": self._queue.qsize(),
+            "running": self.running(),
+            "workers": self.concurrency,
+            "queue_size": self.queue_size,
+            "coalescing": self.coalescing.stats() if self.coalescing is not None else None,
+        })
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/diagnose", self.submit)
+        app.router.add_get("/jobs/{job_id}", self.status)
+        app.router.add_get("/health", self.health)
+        app.on_startup.append(self.start)
+        app.on_cleanup.append(self.stop)
+        return app
+
+
+def warm_up() -> None:
+    """Load everything a first request would otherwise pay for: crew config and knowledge indexes."""
+    from agentic_ai.crew import AgenticAi
+    from agentic_ai.tools.document_index import document_index
+    from agentic_ai.tools.knowledge_base import climate_catalog, disease_knowledge_base, pest_catalog, soil_catalog
+
+    AgenticAi()
+    disease_knowledge_base().index
+    pest_catalog().search("warm up")
+    soil_catalog()
+    climate_catalog()
+    document_index().update()
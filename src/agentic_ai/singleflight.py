@@ -0,0 +1,65 @@
+"""
+Plantix - Single-flight Call Coalescing
+Created by TejasS1233
+
+When several threads ask for the same thing at once (the weather for one location,
+the same crop report), only the first caller does the work; the others wait for it
+and share its result or exception. Nothing is cached after the call finishes;
+callers combine this with a cache for that.
+"""
+
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple, TypeVar
+import threading
+
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._calls = 0
+        self._coalesced = 0
+
+    def do(self, key: Hashable, function: Callable[[], T]) -> T:
+        """Run ``function`` unless a call with ``key`` is already running; then wait for that one."""
+        result, _ = self.do_shared(key, function)
+        return result
+
+    def do_shared(self, key: Hashable, function: Callable[[], T]) -> Tuple[T, bool]:
+        """Like ``do``, also returning whether the result came from another caller's execution."""
+        with self._lock:
+            self._calls += 1
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            future.set_result(function())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+        return future.result(), False
+
+    def stats(self) -> Dict[str, Any]:
+        """Calls made, how many of them were coalesced, and how many keys are in flight now."""
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "coalesced": self._coalesced,
+                "executions": self._calls - self._coalesced,
+                "in_flight": len(self._inflight),
+            }
@@ -0,0 +1,106 @@
+"""
+Plantix - Fast Start
+Created by TejasS1233
+
+Keeps the fixed cost of starting a Plantix process down, so that a one-shot run
+(a trigger, a CLI call) spends its time on the first LLM call rather than on setup:
+
+- ``compiled_config`` replaces crewai's per-instance YAML parsing of ``agents.yaml``
+  and ``tasks.yaml``. Parsed configs are kept in memory and on disk under
+  ``<PLANTIX_CACHE_DIR>/config`` as JSON, keyed by the SHA-256 of the YAML file, so
+  editing a file invalidates its compiled form. ``PLANTIX_CONFIG_CACHE=off`` parses
+  the YAML every time.
+- ``preload`` imports crewai, the crew and the model client on a background thread,
+  so that time overlaps with whatever the process does first (e.g. prompting).
+
+Nothing here imports crewai at module level; entry points import this freely.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Tuple, Union
+import copy
+import hashlib
+import json
+import os
+import threading
+
+
+_lock = threading.Lock()
+# Resolved path -> (SHA-256 of the file, parsed config)
+_compiled: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+
+
+def config_cache_enabled() -> bool:
+    return os.getenv("PLANTIX_CONFIG_CACHE", "on").strip().lower() not in ("0", "off", "false", "no")
+
+
+def compiled_config_dir() -> Path:
+    from agentic_ai.response_cache import cache_dir
+    return cache_dir() / "config"
+
+
+def _parse_yaml(source: bytes) -> Dict[str, Any]:
+    import yaml
+    content = yaml.safe_load(source)
+    return content if isinstance(content, dict) else {}
+
+
+def _load_compiled(path: Path, source: bytes, digest: str) -> Dict[str, Any]:
+    """The parsed config for this version of ``path``: compiled on disk, or parsed and compiled now."""
+    compiled_path = compiled_config_dir() / f"{path.stem}-{digest[:16]}.json"
+    try:
+        return json.loads(compiled_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        pass
+    config = _parse_yaml(source)
+    try:
+        from agentic_ai.reports import atomic_write
+        atomic_write(compiled_path, json.dumps(config))
+        for stale in compiled_path.parent.glob(f"{path.stem}-*.json"):
+            if stale != compiled_path:
+                stale.unlink(missing_ok=True)
+    except (OSError, TypeError):
+        # Read-only cache directory, or YAML values JSON cannot hold: serve from memory
+        pass
+    return config
+
+
+def compiled_config(config_path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Parsed YAML config, like crewai's ``load_yaml``, from the compiled cache when the
+    file is unchanged. Returns a copy: crewai resolves agent and task references in place.
+    Raises FileNotFoundError if the file does not exist.
+    """
+    path = Path(config_path)
+    source = path.read_bytes()
+    if not config_cache_enabled():
+        return _parse_yaml(source)
+
+    digest = hashlib.sha256(source).hexdigest()
+    key = str(path.resolve())
+    with _lock:
+        cached = _compiled.get(key)
+    if cached is None or cached[0] != digest:
+        cached = (digest, _load_compiled(path, source, digest))
+        with _lock:
+            _compiled[key] = cached
+    return copy.deepcopy(cached[1])
+
+
+def _preload() -> None:
+    try:
+        from agentic_ai.crew import AgenticAi  # noqa: F401
+        from agentic_ai.tiering import DEFAULT_TIER, tier_llm
+
+        # Building the shared client imports the provider SDK, the last big import
+        tier_llm(DEFAULT_TIER)
+    except Exception:
+        # The real import or LLM setup reports the problem where it is needed
+        pass
+
+
+def preload() -> threading.Thread:
+    """Start importing the crew in the background; returns the (daemon) thread."""
+    thread = threading.Thread(target=_preload, name="plantix-preload", daemon=True)
+    thread.start()
+    return thread
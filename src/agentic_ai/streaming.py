@@ -0,0 +1,165 @@
+"""
+Plantix - Streaming Reports
+Created by TejasS1233
+
+Emits each section of the report (diagnosis, treatment, prevention, farming advice) as
+soon as its task finishes, instead of waiting for the whole crew. With
+``PLANTIX_STREAM_TOKENS=on`` the LLM is called in streaming mode and model output is
+also forwarded token by token while a task is running.
+
+    for event in stream_report(inputs):
+        if event.kind == "section":
+            print(event.title, event.text)
+
+``astream_report`` is the same as an async iterator, for use from asyncio code.
+"""
+
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional
+import asyncio
+import contextvars
+import os
+import queue
+import threading
+
+from crewai.events import crewai_event_bus
+from crewai.events.types.llm_events import LLMStreamChunkEvent
+from crewai.tasks.task_output import TaskOutput
+
+from agentic_ai.models import render_output
+
+
+SECTION_TITLES = {
+    "disease_diagnosis_task": "🔬 Diagnosis",
+    "treatment_recommendation_task": "💊 Treatment Plan",
+    "prevention_strategy_task": "🛡️ Prevention Strategy",
+    "farming_advice_task": "🌾 Farming Guide",
+}
+
+
+def token_streaming_enabled() -> bool:
+    return os.getenv("PLANTIX_STREAM_TOKENS", "off").strip().lower() in ("1", "on", "true", "yes")
+
+
+@dataclass(frozen=True)
+class ReportEvent:
+    """
+    One piece of a streamed report.
+
+    ``kind`` is "token" (a chunk of model output for ``task``), "section" (the finished
+    output of ``task``) or "done" (``text`` is the final report and ``result`` the
+    crew output).
+    """
+    kind: str
+    task: str
+    text: str
+    result: Any = None
+
+    @property
+    def title(self) -> str:
+        return SECTION_TITLES.get(self.task, self.task)
+
+
+# Where the current kickoff's events go. A context variable rather than a global so
+# concurrent kickoffs (and DAG worker threads, which copy the context) stay separate.
+_sink: contextvars.ContextVar[Optional[Callable[[ReportEvent], None]]] = contextvars.ContextVar(
+    "plantix_report_sink", default=None
+)
+_handler_lock = threading.Lock()
+_handler_registered = False
+
+
+def _forward_chunk(source: Any, event: LLMStreamChunkEvent) -> None:
+    # Stream chunk events are dispatched synchronously on the calling thread
+    sink = _sink.get()
+    if sink is not None and event.chunk and event.tool_call is None:
+        sink(ReportEvent("token", event.task_name or "", event.chunk))
+
+
+def _register_chunk_handler() -> None:
+    global _handler_registered
+    with _handler_lock:
+        if not _handler_registered:
+            crewai_event_bus.register_handler(LLMStreamChunkEvent, _forward_chunk)
+            _handler_registered = True
+
+
+def _produce(inputs: Dict[str, Any], kickoff: Callable[..., Any], emit: Callable[[ReportEvent], None]) -> None:
+    """Run one kickoff, sending every section and token to ``emit``. Runs on a worker thread."""
+
+    def on_task(output: TaskOutput) -> None:
+        emit(ReportEvent("section", output.name or "", render_output(output)))
+
+    def run() -> None:
+        _sink.set(emit)
+        result = kickoff(inputs, task_callback=on_task)
+        emit(ReportEvent("done", "", getattr(result, "raw", str(result)), result))
+
+    # Fresh context so the sink never outlives this kickoff on a pooled thread
+    contextvars.copy_context().run(run)
+
+
+def _default_kickoff() -> Callable[..., Any]:
+    from agentic_ai.main import kickoff
+    return kickoff
+
+
+_END = object()
+
+
+def stream_report(inputs: Dict[str, Any], kickoff: Optional[Callable[..., Any]] = None) -> Iterator[ReportEvent]:
+    """
+    Run the crew for ``inputs`` and yield report events as they happen.
+
+    ``kickoff`` must accept a ``task_callback`` keyword; it defaults to
+    ``agentic_ai.main.kickoff``, so cached reports are replayed section by section.
+    Errors raised by the crew are re-raised from the iterator.
+    """
+    _register_chunk_handler()
+    kickoff = kickoff or _default_kickoff()
+    events: "queue.Queue[Any]" = queue.Queue()
+
+    def worker() -> None:
+        try:
+            _produce(inputs, kickoff, events.put)
+        except BaseException as e:
+            events.put(e)
+        finally:
+            events.put(_END)
+
+    threading.Thread(target=worker, name="plantix-stream", daemon=True).start()
+    while True:
+        event = events.get()
+        if event is _END:
+            return
+        if isinstance(event, BaseException):
+            raise event
+        yield event
+
+
+async def astream_report(inputs: Dict[str, Any], kickoff: Optional[Callable[..., Any]] = None) -> AsyncIterator[ReportEvent]:
+    """Async iterator version of ``stream_report``; the crew runs in a worker thread."""
+    _register_chunk_handler()
+    kickoff = kickoff or _default_kickoff()
+    loop = asyncio.get_running_loop()
+    events: "asyncio.Queue[Any]" = asyncio.Queue()
+
+    def emit(item: Any) -> None:
+        loop.call_soon_threadsafe(events.put_nowait, item)
+
+    def worker() -> None:
+        try:
+            _produce(inputs, kickoff, emit)
+        except BaseException as e:
+            emit(e)
+        finally:
+            emit(_END)
+
+    loop.run_in_executor(None, worker)
+    while True:
+        event = await events.get()
+        if event is _END:
+            return
+        if isinstance(event, BaseException):
+            raise event
+        yield event
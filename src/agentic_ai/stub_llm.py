@@ -0,0 +1,322 @@
+"""
+Plantix - Local Stub LLM Server
+Created by TejasS1233
+
+A deterministic, OpenAI-compatible ``/v1/chat/completions`` endpoint for running the
+crew offline (benchmarks, CI, tier escalation experiments). It recognizes which Plantix
+task a prompt belongs to and answers in the format that task expects, including valid
+JSON for the structured tasks. On its first turn it also makes one tool call through
+the ReAct ``Action:`` format, so tool hot paths are exercised. Response time and length
+are configurable; identical prompts always get identical answers.
+
+Point the crew at it with::
+
+    MODEL=openai/plantix-stub OPENAI_API_KEY=stub OPENAI_BASE_URL=<server.url>
+
+Standard library only; usable in-process (``StubLLMServer``) or standalone via
+``python -m agentic_ai.stub_llm [port]``.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import json
+import re
+import sys
+import threading
+import time
+
+from agentic_ai.compaction import estimate_tokens
+
+
+# First matching phrase of the task description identifies the task
+TASK_MARKERS = (
+    ("disease_diagnosis_task", "diagnose any diseases"),
+    ("treatment_recommendation_task", "create a detailed treatment plan"),
+    ("prevention_strategy_task", "prevention strategy"),
+    ("farming_advice_task", "farming advice"),
+)
+
+DISEASES = (
+    ("Late Blight", "Phytophthora infestans"),
+    ("Early Blight", "Alternaria solani"),
+    ("Powdery Mildew", "Erysiphe cichoracearum"),
+    ("Bacterial Leaf Blight", "Xanthomonas oryzae"),
+    ("Leaf Rust", "Puccinia triticina"),
+)
+
+# Symptom words that make the stub report a pest alongside the disease
+PEST_HINTS = re.compile(r"insect|mite|webbing|sticky|honeydew|holes|larva|caterpillar", re.IGNORECASE)
+PEST = ("Aphids", "Aphidoidea")
+
+FILLER = (
+    "Monitor the field every three days and record what you observe. "
+    "Keep tools and footwear clean between plots. "
+)
+
+# Prompt fields, which YAML folding may have joined onto a single line
+_FIELD = re.compile(r"-\s*(Crop Type|Symptoms Observed|Location/Region):\s*(.+?)(?=\s+-\s+[A-Z][\w/ ]+:|\n|$)")
+# Per-issue instruction added by multi-issue fan-out (agentic_ai.fanout)
+_FOCUS = re.compile(r"Address only issue \d+ of \d+: (.+?)(?: \(|, severity)")
+
+
+def _text(messages: List[Dict[str, Any]]) -> str:
+    parts = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, list):
+            content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+        parts.append(str(content or ""))
+    return "\n".join(parts)
+
+
+def identify_task(prompt: str) -> str:
+    """The Plantix task a prompt belongs to, judged by its "Current Task" section."""
+    current = prompt.split("Current Task:", 1)[-1].lower()
+    for task, marker in TASK_MARKERS:
+        if marker in current:
+            return task
+    return "unknown"
+
+
+class StubResponder:
+    """Builds the deterministic reply for a conversation."""
+
+    def __init__(self, completion_tokens: Optional[int] = None, tool_calls: bool = True):
+        self.completion_tokens = completion_tokens
+        self.tool_calls = tool_calls
+
+    def reply(self, messages: List[Dict[str, Any]]) -> Tuple[str, str]:
+        """``(task name, assistant message)`` for ``messages``."""
+        prompt = _text(messages)
+        task = identify_task(prompt)
+        fields = dict(_FIELD.findall(prompt))
+        crop = fields.get("Crop Type", "Tomato").strip()
+        digest = int(hashlib.sha256(prompt.split("Current Task:", 1)[-1][:2000].encode("utf-8")).hexdigest(), 16)
+        disease, scientific = DISEASES[digest % len(DISEASES)]
+        focus = _FOCUS.search(prompt)
+        if focus is not None:
+            disease = focus.group(1)
+
+        first_turn = not any(message.get("role") == "assistant" for message in messages)
+        if self.tool_calls and first_turn and "Tool Name:" in prompt:
+            action = self._action(task, crop, disease, fields)
+            if action is not None:
+                return task, action
+        pest = PEST_HINTS.search(fields.get("Symptoms Observed", "")) is not None
+        return task, "Thought: I now know the final answer\nFinal Answer: " + self._answer(
+            task, crop, disease, scientific, digest, pest
+        )
+
+    @staticmethod
+    def _action(task: str, crop: str, disease: str, fields: Dict[str, str]) -> Optional[str]:
+        if task == "disease_diagnosis_task":
+            tool, arguments = "Symptom to Disease Matcher", {
+                "symptoms": fields.get("Symptoms Observed", "leaf spots"), "crop_type": crop,
+            }
+        elif task in ("treatment_recommendation_task", "prevention_strategy_task"):
+            tool, arguments = "Crop Disease Knowledge Database", {"disease_name": disease, "crop_type": crop}
+        elif task == "farming_advice_task":
+            tool, arguments = "Soil Analysis and Recommendations", {"soil_type": "loamy", "crop_type": crop}
+        else:
+            return None
+        return (
+            f"Thought: I should check the knowledge base first\n"
+            f"Action: {tool}\nAction Input: {json.dumps(arguments)}"
+        )
+
+    def _pad(self, text: str) -> str:
+        if self.completion_tokens is None:
+            return text
+        while estimate_tokens(text) < self.completion_tokens:
+            text += " " + FILLER
+        return text[:self.completion_tokens * 4]
+
+    def _answer(self, task: str, crop: str, disease: str, scientific: str, digest: int, pest: bool = False) -> str:
+        if task == "disease_diagnosis_task":
+            return json.dumps({
+                "name": disease,
+                "scientific_name": scientific,
+                "confidence": 70 + digest % 25,
+                "severity": ("moderate", "high")[digest % 2],
+                "progression_stage": "Early to mid infection",
+                "yield_impact": f"{10 + digest % 30}% loss if untreated",
+                "spread_risk": "High in humid weather",
+                "alternatives": [name for name, _ in DISEASES if name != disease][:2],
+                "symptom_match": self._pad(f"Reported symptoms on {crop} match {disease}."),
+                "additional_issues": [{
+                    "name": PEST[0], "scientific_name": PEST[1], "kind": "pest", "confidence": 75,
+                    "severity": "moderate", "symptom_match": "Insects and sticky residue on leaves",
+                }] if pest else [],
+            })
+        if task == "treatment_recommendation_task":
+            return json.dumps({
+                "immediate_actions": [f"Remove and destroy leaves showing {disease}"],
+                "steps": ["Improve air circulation", "Apply copper-based fungicide", self._pad("Repeat after 7 days")],
+                "products": [
+                    {"name": "Copper oxychloride", "kind": "chemical", "dosage": "3 g/L", "application": "Foliar spray"},
+                    {"name": "Neem oil", "kind": "organic", "dosage": "5 ml/L", "application": "Weekly spray"},
+                ],
+                "costs": [{"option": "Copper spray", "budget": "low", "estimate": "INR 600 per acre"}],
+                "safety_precautions": ["Wear gloves and a mask while spraying"],
+                "recovery_timeline": "2-3 weeks",
+            })
+        if task == "prevention_strategy_task":
+            return json.dumps({
+                "practices": [f"Use certified disease-free {crop} seed", self._pad("Remove crop debris after harvest")],
+                "crop_rotation": "Rotate with cereals for two seasons",
+                "soil_management": ["Add compost before planting"],
+                "irrigation": ["Use drip irrigation and avoid wetting leaves"],
+                "resistant_varieties": [f"Local resistant {crop} varieties"],
+                "warning_signs": ["Water-soaked spots after rain"],
+                "seasonal_calendar": ["Pre-monsoon: prophylactic spray"],
+            })
+        return self._pad(
+            f"# {crop} Farming Guide\n\n## Growing Conditions\nWell-drained loamy soil, pH 6-7.\n\n"
+            f"## Irrigation\nWater at the base every 3-4 days.\n\n## Harvest\nHarvest at full color.\n"
+        )
+
+
+class StubLLMServer:
+    """Threaded stub endpoint that records request counts and token usage per task."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        token_latency: float = 0.0,
+        completion_tokens: Optional[int] = None,
+        tool_calls: bool = True,
+    ):
+        self.latency = latency
+        self.token_latency = token_latency
+        self.responder = StubResponder(completion_tokens=completion_tokens, tool_calls=tool_calls)
+        self._lock = threading.Lock()
+        self._usage: Dict[str, Dict[str, int]] = {}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="plantix-stub-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StubLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def usage(self) -> Dict[str, Dict[str, int]]:
+        """Per task: requests, prompt tokens and completion tokens served so far."""
+        with self._lock:
+            return {task: dict(counters) for task, counters in self._usage.items()}
+
+    def reset_usage(self) -> None:
+        with self._lock:
+            self._usage.clear()
+
+    def complete(self, request: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+        """The chat completion for one request body, and the reply text."""
+        messages = request.get("messages") or []
+        task, content = self.responder.reply(messages)
+        prompt_tokens = estimate_tokens(_text(messages))
+        completion_tokens = estimate_tokens(content)
+        with self._lock:
+            counters = self._usage.setdefault(task, {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0})
+            counters["requests"] += 1
+            counters["prompt_tokens"] += prompt_tokens
+            counters["completion_tokens"] += completion_tokens
+
+        time.sleep(self.latency + self.token_latency * completion_tokens)
+        return {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": 0,
+            "model": request.get("model", "plantix-stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }, content
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str = "application/json") -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                if self.path.rstrip("/").endswith("/models"):
+                    self._send(200, json.dumps({"object": "list", "data": [{"id": "plantix-stub", "object": "model"}]}).encode())
+                else:
+                    self._send(404, b'{"error": "not found"}')
+
+            def do_POST(self) -> None:
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send(404, b'{"error": "not found"}')
+                    return
+                length = int(self.headers.get("Content-Length", "0"))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                completion, content = server.complete(request)
+                if not request.get("stream"):
+                    self._send(200, json.dumps(completion).encode())
+                    return
+                self._send(200, server._stream_body(completion, content), "text/event-stream")
+
+        return Handler
+
+    @staticmethod
+    def _stream_body(completion: Dict[str, Any], content: str) -> bytes:
+        def event(delta: Dict[str, Any], finish_reason: Optional[str] = None, usage: Any = None) -> str:
+            chunk = {
+                "id": completion["id"],
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": completion["model"],
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            if usage is not None:
+                chunk["usage"] = usage
+            return f"data: {json.dumps(chunk)}\n\n"
+
+        pieces = re.findall(r"\S+\s*", content) or [content]
+        body = event({"role": "assistant", "content": ""})
+        body += "".join(event({"content": piece}) for piece in pieces)
+        body += event({}, "stop", completion["usage"])
+        body += "data: [DONE]\n\n"
+        return body.encode("utf-8")
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    stub = StubLLMServer(port=port)
+    print(f"Stub LLM listening on {stub.url}")
+    stub._httpd.serve_forever()
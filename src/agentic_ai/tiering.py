@@ -0,0 +1,298 @@
+"""
+Plantix - Tiered Model Routing
+Created by TejasS1233
+
+Each agent lists its model tiers in ``config/agents.yaml`` (``model_tiers``), cheapest
+first. A task runs on the first tier and is retried on the next one only when its
+output fails validation (no structured result) or reports a diagnosis confidence
+below ``PLANTIX_ESCALATION_CONFIDENCE``.
+
+A tier name maps to the model in ``PLANTIX_MODEL_<TIER>`` (e.g. ``PLANTIX_MODEL_FAST``)
+and falls back to ``MODEL``; an entry containing "/" is used as a model id directly.
+Tiers that resolve to the same model are collapsed, so with only ``MODEL`` set every
+agent runs exactly as before. Latency and estimated tokens of every LLM call are
+recorded per tier in ``TIER_STATS``.
+
+A task with a ``knowledge_query`` in ``config/tasks.yaml`` also receives the passages of
+the agronomy library most relevant to that query (filled in from the kickoff inputs)
+and to the diagnosed issues, as reference notes in its context.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+import contextvars
+import os
+import threading
+import time
+import warnings
+
+from crewai import LLM, Task
+from crewai.tasks.task_output import TaskOutput
+from crewai.utilities.string_utils import interpolate_only
+from pydantic import Field, PrivateAttr
+
+from agentic_ai.compaction import estimate_tokens
+from agentic_ai.models import Diagnosis, Issue
+from agentic_ai.resources import shared_llm
+from agentic_ai.streaming import token_streaming_enabled
+from agentic_ai.tools.document_index import knowledge_context
+from agentic_ai.tracing import span
+
+
+DEFAULT_TIER = "default"
+DEFAULT_MODEL = "gemini/gemini-2.5-flash-preview-04-17"
+
+
+def tier_model(tier: str) -> str:
+    """The model id for ``tier``."""
+    default = os.getenv("MODEL", DEFAULT_MODEL)
+    if "/" in tier:
+        return tier
+    if tier == DEFAULT_TIER:
+        return default
+    return os.getenv(f"PLANTIX_MODEL_{tier.upper()}") or default
+
+
+def escalation_chain(tiers: List[str]) -> List[str]:
+    """``tiers`` without entries that resolve to the same model as an earlier one."""
+    chain, models = [], set()
+    for tier in tiers or [DEFAULT_TIER]:
+        model = tier_model(tier)
+        if model not in models:
+            models.add(model)
+            chain.append(tier)
+    return chain
+
+
+def escalation_confidence() -> float:
+    return float(os.getenv("PLANTIX_ESCALATION_CONFIDENCE", "60"))
+
+
+class TierStats:
+    """Thread-safe per-tier counters: LLM calls, latency, estimated tokens and escalations."""
+
+    FIELDS = ("calls", "seconds", "prompt_tokens", "completion_tokens", "attempts", "escalations")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tiers: Dict[str, Dict[str, float]] = {}
+
+    def _add(self, tier: str, **values: float) -> None:
+        with self._lock:
+            counters = self._tiers.setdefault(tier, dict.fromkeys(self.FIELDS, 0))
+            for name, value in values.items():
+                counters[name] += value
+
+    def record_call(self, tier: str, seconds: float, prompt_tokens: int, completion_tokens: int) -> None:
+        self._add(tier, calls=1, seconds=seconds, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+
+    def record_attempt(self, tier: str, escalated: bool) -> None:
+        self._add(tier, attempts=1, escalations=int(escalated))
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per tier: the counters plus mean seconds per LLM call."""
+        with self._lock:
+            stats = {}
+            for tier, counters in sorted(self._tiers.items()):
+                stats[tier] = dict(counters, seconds_per_call=counters["seconds"] / counters["calls"] if counters["calls"] else 0.0)
+            return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tiers.clear()
+
+
+TIER_STATS = TierStats()
+
+# Tier of the task attempt running on this thread, for attributing LLM calls
+_current_tier: contextvars.ContextVar[str] = contextvars.ContextVar("plantix_model_tier", default=DEFAULT_TIER)
+_meter_lock = threading.Lock()
+
+
+@contextmanager
+def tier_scope(tier: str) -> Iterator[None]:
+    token = _current_tier.set(tier)
+    try:
+        yield
+    finally:
+        _current_tier.reset(token)
+
+
+def _meter(llm: LLM) -> LLM:
+    """Wrap ``llm.call`` once so every call is timed and counted against the current tier."""
+    with _meter_lock:
+        if getattr(llm, "_plantix_metered", False):
+            return llm
+        call = llm.call
+
+        def metered_call(messages: Any, *args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            result = None
+            tier = _current_tier.get()
+            with span(llm.model, "llm", tier=tier) as current:
+                try:
+                    result = call(messages, *args, **kwargs)
+                    return result
+                finally:
+                    prompt_tokens = estimate_tokens(str(messages))
+                    completion_tokens = estimate_tokens(str(result or ""))
+                    TIER_STATS.record_call(tier, time.perf_counter() - started, prompt_tokens, completion_tokens)
+                    current.set(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+
+        llm.call = metered_call
+        llm._plantix_metered = True
+        return llm
+
+
+def tier_llm(tier: str) -> LLM:
+    """The shared, metered LLM client for ``tier``."""
+    return _meter(shared_llm(
+        model=tier_model(tier),
+        api_key=os.getenv("GEMINI_API_KEY") or os.getenv("OPENAI_API_KEY"),
+        stream=token_streaming_enabled(),
+    ))
+
+
+def escalation_reason(task: Task, output: TaskOutput) -> Optional[str]:
+    """Why ``output`` should be redone on a larger model, or None if it is acceptable."""
+    if task.output_pydantic is not None and output.pydantic is None:
+        return f"output did not validate as {task.output_pydantic.__name__}"
+    confidence = getattr(output.pydantic, "confidence", None)
+    threshold = escalation_confidence()
+    if confidence is not None and confidence < threshold:
+        return f"confidence {confidence:.0f}% is below {threshold:.0f}%"
+    return None
+
+
+def diagnosed_issues(task: Task) -> List[Issue]:
+    """The issues found by the diagnosis in ``task``'s context, main diagnosis first."""
+    for dependency in task.context if isinstance(task.context, list) else []:
+        output = dependency.output
+        if output is not None and isinstance(output.pydantic, Diagnosis):
+            return output.pydantic.issues()
+    return []
+
+
+class TieredTask(Task):
+    """
+    Task that escalates through its agent's model tiers until the output is acceptable,
+    or returns a saved output when an incremental run finds nothing it depends on changed.
+    """
+
+    model_tiers: List[str] = Field(
+        default_factory=list,
+        description="Model tiers to try in order, cheapest first",
+    )
+
+    incremental: Optional[Any] = Field(
+        default=None,
+        exclude=True,
+        description="IncrementalRun that may supply a saved output instead of running the task",
+    )
+
+    knowledge_query: Optional[str] = Field(
+        default=None,
+        description="Query (with {input} placeholders) for reference notes from the agronomy library",
+    )
+
+    # Output to return without running the agent, e.g. a confident pre-diagnosis
+    _preset_output: Optional[TaskOutput] = PrivateAttr(default=None)
+    _knowledge_inputs: Dict[str, Any] = PrivateAttr(default_factory=dict)
+    # Issues the notes are retrieved for; the diagnosed issues when empty
+    _knowledge_issues: List[str] = PrivateAttr(default_factory=list)
+
+    def preset_output(self, output: Optional[TaskOutput]) -> None:
+        """Have the next execution return ``output`` instead of running the agent (None clears it)."""
+        self._preset_output = output
+
+    def interpolate_inputs_and_add_conversation_history(self, inputs: Dict[str, Any]) -> None:
+        super().interpolate_inputs_and_add_conversation_history(inputs)
+        self._knowledge_inputs = dict(inputs or {})
+
+    def _with_knowledge(self, context: Optional[str]) -> Optional[str]:
+        """``context`` followed by the agronomy notes relevant to this task, if it asks for any."""
+        if not self.knowledge_query:
+            return context
+        try:
+            query = interpolate_only(input_string=self.knowledge_query, inputs=self._knowledge_inputs)
+        except (KeyError, ValueError):
+            query = self.knowledge_query
+        issues = self._knowledge_issues or [issue.name for issue in diagnosed_issues(self)]
+        with span("agronomy library", "retrieval") as current:
+            try:
+                notes = knowledge_context(" ".join([*issues, query]))
+            except OSError as e:
+                # An unreadable or unwritable index only costs this task its reference notes
+                warnings.warn(f"Could not retrieve agronomy library notes: {e}")
+                return context
+            current.set(chars=len(notes))
+        if not notes:
+            return context
+        return f"{context}\n\n{notes}" if context else notes
+
+    def execute_sync(self, agent=None, context: Optional[str] = None, tools=None) -> TaskOutput:
+        agent = agent or self.agent
+        chain = escalation_chain(self.model_tiers)
+        with span(self.name or "task", "task", tiers=",".join(chain)) as current:
+            if self._preset_output is not None:
+                output, self._preset_output = self._preset_output, None
+                current.set(preset=True)
+                self.output = output
+                if self.callback is not None:
+                    self.callback(output)
+                return output
+
+            if self.incremental is not None:
+                output = self.incremental.lookup(self)
+                if output is not None:
+                    current.set(reused=True)
+                    self.output = output
+                    if self.callback is not None:
+                        self.callback(output)
+                    return output
+
+            output = self._execute(agent, context, tools)
+            if self.incremental is not None:
+                self.incremental.record(self, output)
+            return output
+
+    def _execute(self, agent, context: Optional[str], tools) -> TaskOutput:
+        """Run the task on its model tiers, escalating while the output is not acceptable."""
+        chain = escalation_chain(self.model_tiers)
+        context = self._with_knowledge(context)
+        if agent is None or len(chain) < 2:
+            with tier_scope(chain[0]), span(getattr(agent, "role", "agent"), "agent", tier=chain[0]):
+                output = super().execute_sync(agent=agent, context=context, tools=tools)
+            TIER_STATS.record_attempt(chain[0], escalated=False)
+            return output
+        return self._execute_tiers(agent, chain, context, tools)
+
+    def _execute_tiers(self, agent, chain: List[str], context: Optional[str], tools) -> TaskOutput:
+        # Only the accepted attempt is reported to the task callback (e.g. streaming)
+        callback, self.callback = self.callback, None
+        configured_llm = agent.llm
+        try:
+            for position, tier in enumerate(chain):
+                last = position == len(chain) - 1
+                agent.llm = tier_llm(tier)
+                with span(agent.role, "agent", tier=tier) as attempt:
+                    try:
+                        with tier_scope(tier):
+                            output = super().execute_sync(agent=agent, context=context, tools=tools)
+                        reason = None if last else escalation_reason(self, output)
+                    except Exception as e:
+                        if last:
+                            raise
+                        reason = f"{type(e).__name__}: {e}"
+                    attempt.set(escalated=reason is not None)
+                TIER_STATS.record_attempt(tier, escalated=reason is not None)
+                if reason is None:
+                    break
+                print(f"⬆️  Escalating {self.name} from '{tier}' to '{chain[position + 1]}': {reason}")
+        finally:
+            agent.llm = configured_llm
+            self.callback = callback
+
+        if callback is not None:
+            callback(output)
+        return output
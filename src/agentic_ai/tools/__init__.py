@@ -2,12 +2,16 @@ from .custom_tool import (
     CropDiseaseKnowledgeTool,
     WeatherConditionsTool,
     SoilAnalysisTool,
-    PestIdentificationTool
+    PestIdentificationTool,
+    RegionalHistoryTool,
+    SymptomSearchTool
 )
 
 __all__ = [
     'CropDiseaseKnowledgeTool',
     'WeatherConditionsTool',
     'SoilAnalysisTool',
-    'PestIdentificationTool'
+    'PestIdentificationTool',
+    'RegionalHistoryTool',
+    'SymptomSearchTool'
 ]
@@ -4,14 +4,63 @@ Created by TejasS1233
 """
 
 from crewai.tools import BaseTool
-from typing import Type, Optional
+from dataclasses import replace
+from typing import Any, List, Mapping, Optional, Tuple, Type
 from pydantic import BaseModel, Field
 import json
+import re
+
+from agentic_ai.tools.knowledge_base import (
+    FUZZY_MIN_SCORE,
+    climate_catalog,
+    disease_knowledge_base,
+    pest_catalog,
+    soil_catalog
+)
+from agentic_ai.tools.memo import memoized
+from agentic_ai.tools.weather import weather_service
+
+
+# Separators between several disease, pest or pest-description entries in one tool call
+_NAME_SEPARATORS = re.compile(r"\s*(?:[,;+&]|\band\b)\s*", re.IGNORECASE)
+_DESCRIPTION_SEPARATORS = re.compile(r"\s*;\s*")
+
+
+def split_names(text: str, separators: re.Pattern = _NAME_SEPARATORS) -> List[str]:
+    """The distinct non-empty entries of a list like "early blight, aphids and thrips"."""
+    return list(dict.fromkeys(part.strip() for part in separators.split(text) if part.strip()))
+
+
+def describe_disease(disease_name: str, crop_type: Optional[str] = None) -> str:
+    """Knowledge-base entry for one disease or pest name."""
+    knowledge_base = disease_knowledge_base()
+    matches = knowledge_base.lookup(disease_name, crop=crop_type)
+
+    if matches:
+        result = matches[0]
+        output = f"Disease Information: {result.name.title()}\n"
+        output += f"Scientific Name: {result.scientific_name}\n"
+        output += f"Crops Affected: {', '.join(result.crops_affected)}\n"
+        output += f"Symptoms: {result.symptoms}\n"
+        output += f"Causes: {result.causes}\n"
+        output += f"Treatment: {result.treatment}\n"
+        output += f"Prevention: {result.prevention}\n"
+        if len(matches) > 1:
+            output += f"Other Possible Matches: {', '.join(m.name.title() for m in matches[1:])}\n"
+        return output
+    elif crop_type and knowledge_base.lookup(disease_name):
+        return (f"Disease '{disease_name}' is not recorded for {crop_type} in the database. "
+                f"Try the lookup without a crop type or check the crop name.")
+    else:
+        return f"Disease '{disease_name}' not found in database. Please check the spelling or provide more details."
 
 
 class CropDiseaseKnowledgeInput(BaseModel):
     """Input schema for CropDiseaseKnowledgeTool."""
-    disease_name: str = Field(..., description="Name of the crop disease or pest to lookup")
+    disease_name: str = Field(
+        ...,
+        description="Name of the crop disease or pest to lookup; separate several names with commas",
+    )
     crop_type: Optional[str] = Field(None, description="Type of crop (optional for more specific results)")
 
 
@@ -20,91 +69,18 @@ class CropDiseaseKnowledgeTool(BaseTool):
     description: str = (
         "Access a comprehensive database of crop diseases, pests, and their characteristics. "
         "Use this tool to get detailed information about specific diseases including symptoms, "
-        "causes, treatment options, and prevention methods. Provide the disease name and optionally the crop type."
+        "causes, treatment options, and prevention methods. Provide the disease name and optionally the crop type. "
+        "When a crop has several problems at once, list all of them (e.g. 'late blight, aphids') "
+        "to get every entry in one call."
     )
     args_schema: Type[BaseModel] = CropDiseaseKnowledgeInput
 
+    @memoized
     def _run(self, disease_name: str, crop_type: Optional[str] = None) -> str:
-        disease_db = {
-            "late blight": {
-                "scientific_name": "Phytophthora infestans",
-                "crops_affected": ["tomato", "potato"],
-                "symptoms": "Water-soaked spots on leaves, white fungal growth on undersides, rapid browning and death of foliage",
-                "causes": "Fungal pathogen, thrives in cool humid conditions, spreads via wind and water",
-                "treatment": "Copper-based fungicides, Mancozeb, remove infected plants",
-                "prevention": "Use resistant varieties, improve air circulation, avoid overhead irrigation"
-            },
-            "powdery mildew": {
-                "scientific_name": "Various Erysiphales species",
-                "crops_affected": ["wheat", "cucumber", "grape", "tomato", "many vegetables"],
-                "symptoms": "White powdery spots on leaves and stems, yellowing leaves, stunted growth",
-                "causes": "Fungal disease, favored by warm days and cool nights, high humidity",
-                "treatment": "Sulfur-based fungicides, neem oil, baking soda solution",
-                "prevention": "Proper spacing, remove infected leaves, choose resistant varieties"
-            },
-            "bacterial wilt": {
-                "scientific_name": "Ralstonia solanacearum",
-                "crops_affected": ["tomato", "potato", "eggplant", "pepper"],
-                "symptoms": "Sudden wilting of plants, vascular browning, bacterial ooze from cut stems",
-                "causes": "Soil-borne bacteria, spreads through water and contaminated tools",
-                "treatment": "Remove and destroy infected plants, soil solarization, crop rotation",
-                "prevention": "Use disease-free seeds, improve drainage, practice crop rotation"
-            },
-            "aphids": {
-                "scientific_name": "Aphidoidea",
-                "crops_affected": ["most vegetables", "fruits", "ornamentals"],
-                "symptoms": "Curled leaves, sticky honeydew, sooty mold, stunted growth, yellowing",
-                "causes": "Small sap-sucking insects, reproduce rapidly in warm weather",
-                "treatment": "Insecticidal soap, neem oil, introduce ladybugs, strong water spray",
-                "prevention": "Encourage beneficial insects, use reflective mulches, remove weeds"
-            },
-            "leaf spot": {
-                "scientific_name": "Various fungi and bacteria",
-                "crops_affected": ["tomato", "pepper", "cucumber", "beans"],
-                "symptoms": "Circular brown or black spots on leaves, yellowing around spots, leaf drop",
-                "causes": "Fungal or bacterial pathogens, spread by water splash and wind",
-                "treatment": "Remove infected leaves, apply copper fungicide, improve air circulation",
-                "prevention": "Avoid overhead watering, space plants properly, practice crop rotation"
-            },
-            "root rot": {
-                "scientific_name": "Various Phytophthora, Pythium, Fusarium species",
-                "crops_affected": ["most crops"],
-                "symptoms": "Yellowing leaves, wilting, brown mushy roots, plant death",
-                "causes": "Soil-borne fungi, overwatering, poor drainage",
-                "treatment": "Improve drainage, reduce watering, apply fungicides, remove affected plants",
-                "prevention": "Ensure good drainage, avoid overwatering, use raised beds"
-            },
-            "mosaic virus": {
-                "scientific_name": "Various viruses (TMV, CMV, etc.)",
-                "crops_affected": ["tomato", "pepper", "cucumber", "tobacco"],
-                "symptoms": "Mottled yellow-green pattern on leaves, distorted growth, reduced yield",
-                "causes": "Viral infection spread by aphids, thrips, contaminated tools",
-                "treatment": "No cure - remove infected plants, control insect vectors",
-                "prevention": "Use virus-free seeds, control aphids, sanitize tools, use resistant varieties"
-            }
-        }
-        
-        disease_lower = disease_name.lower()
-        
-        # Search for disease
-        result = None
-        for key, value in disease_db.items():
-            if disease_lower in key or key in disease_lower:
-                result = value
-                result["disease_name"] = key.title()
-                break
-        
-        if result:
-            output = f"Disease Information: {result.get('disease_name', disease_name)}\n"
-            output += f"Scientific Name: {result['scientific_name']}\n"
-            output += f"Crops Affected: {', '.join(result['crops_affected'])}\n"
-            output += f"Symptoms: {result['symptoms']}\n"
-            output += f"Causes: {result['causes']}\n"
-            output += f"Treatment: {result['treatment']}\n"
-            output += f"Prevention: {result['prevention']}\n"
-            return output
-        else:
-            return f"Disease '{disease_name}' not found in database. Please check the spelling or provide more details."
+        names = split_names(disease_name)
+        if len(names) < 2 or disease_knowledge_base().get(disease_name) is not None:
+            return describe_disease(disease_name, crop_type)
+        return "\n".join(describe_disease(name, crop_type) for name in names)
 
 
 class WeatherConditionsInput(BaseModel):
@@ -112,61 +88,68 @@ class WeatherConditionsInput(BaseModel):
     location: str = Field(..., description="Location or region to get weather information for")
 
 
+def climate_type_for(location: str) -> str:
+    """Broad climate pattern for a location, judged from keywords in its name."""
+    location = location.lower()
+    if any(word in location for word in ["india", "africa", "south", "tropical", "florida", "brazil"]):
+        return "tropical" if "tropical" in location or "rain" in location else "subtropical"
+    if any(word in location for word in ["desert", "dry", "arid", "middle east"]):
+        return "arid"
+    return "temperate"
+
+
 class WeatherConditionsTool(BaseTool):
     name: str = "Weather and Climate Information"
     description: str = (
-        "Get current weather conditions and climate information for a specific location. "
+        "Get current weather conditions (temperature, humidity, rainfall over the last 24 hours) "
+        "and climate information for a specific location. "
         "This is useful for understanding environmental factors affecting crop diseases and growth. "
         "Provide the location/region name."
     )
     args_schema: Type[BaseModel] = WeatherConditionsInput
 
+    @memoized
     def _run(self, location: str) -> str:
-        # Simulated weather data - in production, this would call a real weather API
-        weather_patterns = {
-            "tropical": {
-                "temperature": "25-35°C",
-                "humidity": "High (70-90%)",
-                "rainfall": "Heavy seasonal rains",
-                "disease_risk": "High risk for fungal diseases, bacterial infections due to humidity"
-            },
-            "temperate": {
-                "temperature": "10-25°C",
-                "humidity": "Moderate (50-70%)",
-                "rainfall": "Moderate, well-distributed",
-                "disease_risk": "Moderate risk, watch for cool-weather fungal diseases"
-            },
-            "arid": {
-                "temperature": "20-40°C",
-                "humidity": "Low (20-40%)",
-                "rainfall": "Minimal",
-                "disease_risk": "Lower disease pressure, but watch for stress-related issues and spider mites"
-            },
-            "subtropical": {
-                "temperature": "20-30°C",
-                "humidity": "Moderate to High (60-80%)",
-                "rainfall": "Seasonal variation",
-                "disease_risk": "Moderate to high risk for various fungal and bacterial diseases"
-            }
-        }
-        
+        # Imported here: the risk model itself builds on this package's knowledge base
+        from agentic_ai.risk import assess, conditions_from_text, conditions_from_weather
+
         output = f"Weather Information for {location}:\n\n"
+
+        service = weather_service()
+        observed = service.lookup(location) if service is not None else None
+        conditions = None
+        if observed is not None:
+            point, report = observed
+            low, high = report.temperature_range
+            output += (f"Current conditions near {point.label} ({point.latitude:.2f}, {point.longitude:.2f}) "
+                       f"at {report.observed_at} UTC, source {report.source}:\n")
+            output += f"Temperature: {report.temperature_c:.1f}°C (last 24h: {low:.1f}-{high:.1f}°C)\n"
+            output += (f"Relative Humidity: {report.humidity_pct:.0f}% "
+                       f"({report.wet_hours()} of the last 24 hours at 90% or above)\n")
+            output += f"Rainfall: {report.rain_24h:.1f} mm in the last 24 hours\n"
+            output += f"Wind: {report.wind_kmh:.0f} km/h\n\n"
+            conditions = conditions_from_weather(report)
+        elif service is not None:
+            output += "Live weather is unavailable for this location.\n\n"
+
         output += "Based on typical climate patterns for this region:\n"
-        
-        # Provide general climate info (in production, use real weather API)
-        climate_type = "temperate"  # Default
-        if any(word in location.lower() for word in ["india", "africa", "south", "tropical", "florida", "brazil"]):
-            climate_type = "tropical" if "tropical" in location.lower() or "rain" in location.lower() else "subtropical"
-        elif any(word in location.lower() for word in ["desert", "dry", "arid", "middle east"]):
-            climate_type = "arid"
-        
-        pattern = weather_patterns[climate_type]
+        climate_type = climate_type_for(location)
+        pattern = climate_catalog().get(climate_type)
         output += f"Climate Type: {climate_type.title()}\n"
         output += f"Temperature Range: {pattern['temperature']}\n"
         output += f"Humidity: {pattern['humidity']}\n"
         output += f"Rainfall: {pattern['rainfall']}\n"
-        output += f"Disease Risk Assessment: {pattern['disease_risk']}\n"
-        
+
+        if conditions is None:
+            conditions = conditions_from_text(f"{pattern['temperature']}, humidity {pattern['humidity']}")
+            conditions = replace(conditions, source=f"typical {climate_type} climate") if conditions else None
+        risks = assess(conditions, top_k=4)
+        if risks:
+            output += "\nDisease Risk Assessment (" + conditions.source + "):\n"
+            output += "".join(f"- {risk.describe()}\n" for risk in risks)
+        else:
+            output += f"Disease Risk Assessment: {pattern['disease_risk']}\n"
+
         return output
 
 
@@ -185,49 +168,14 @@ class SoilAnalysisTool(BaseTool):
     )
     args_schema: Type[BaseModel] = SoilAnalysisInput
 
+    @memoized
     def _run(self, soil_type: str, crop_type: str) -> str:
-        soil_info = {
-            "clay": {
-                "characteristics": "Heavy, retains water, poor drainage, slow to warm",
-                "advantages": "Nutrient-rich, good water retention",
-                "challenges": "Compaction, poor aeration, waterlogging risk",
-                "amendments": "Add organic matter, sand, gypsum for structure improvement",
-                "suitable_crops": "Rice, wheat, cabbage, broccoli"
-            },
-            "sandy": {
-                "characteristics": "Light, fast-draining, quick to warm",
-                "advantages": "Good aeration, easy to work, warms quickly",
-                "challenges": "Poor water retention, nutrient leaching",
-                "amendments": "Add compost, peat moss, organic matter for water retention",
-                "suitable_crops": "Carrots, potatoes, lettuce, radishes"
-            },
-            "loamy": {
-                "characteristics": "Balanced mixture of sand, silt, and clay",
-                "advantages": "Ideal soil, good drainage and water retention, fertile",
-                "challenges": "May need nutrient replenishment",
-                "amendments": "Regular compost addition, balanced fertilization",
-                "suitable_crops": "Most vegetables and crops thrive"
-            },
-            "silt": {
-                "characteristics": "Smooth, retains moisture, fertile",
-                "advantages": "Good water retention, fertile, easy to work when dry",
-                "challenges": "Compaction when wet, erosion prone",
-                "amendments": "Add organic matter, avoid working when wet",
-                "suitable_crops": "Vegetables, corn, wheat, soybeans"
-            }
-        }
-        
-        soil_lower = soil_type.lower()
-        soil_data = None
-        
-        for key in soil_info:
-            if key in soil_lower:
-                soil_data = soil_info[key]
-                break
-        
+        soil_info = soil_catalog()
+        soil_data = soil_info.find_in(soil_type)
+
         if not soil_data:
-            soil_data = soil_info["loamy"]  # Default
-        
+            soil_data = soil_info.get("loamy")  # Default
+
         output = f"Soil Analysis for {soil_type.title()} Soil:\n\n"
         output += f"Characteristics: {soil_data['characteristics']}\n"
         output += f"Advantages: {soil_data['advantages']}\n"
@@ -245,9 +193,28 @@ class SoilAnalysisTool(BaseTool):
         return output
 
 
+def describe_pest(ranked: List[Tuple[Mapping[str, Any], float]]) -> str:
+    """Identification and control of the best of ``ranked`` pest matches, naming the runners-up."""
+    info, score = ranked[0]
+    output = f"Pest Identified: {info['name'].title()} (match score {score:.2f})\n\n"
+    output += f"Description: {info['description']}\n"
+    output += f"Damage Caused: {info['damage']}\n\n"
+    output += f"Organic/Natural Control Methods:\n{info['control_organic']}\n\n"
+    output += f"Chemical Control (if necessary):\n{info['control_chemical']}\n\n"
+    output += f"Prevention Strategies:\n{info['prevention']}\n"
+    if len(ranked) > 1:
+        others = ", ".join(f"{other['name'].title()} ({other_score:.2f})" for other, other_score in ranked[1:])
+        output += f"\nOther Possible Matches: {others}\n"
+    return output
+
+
 class PestIdentificationInput(BaseModel):
     """Input schema for PestIdentificationTool."""
-    pest_description: str = Field(..., description="Description of the pest, including size, color, behavior")
+    pest_description: str = Field(
+        ...,
+        description="Description of the pest, including size, color, behavior; "
+                    "separate descriptions of different pests with semicolons",
+    )
     crop_affected: str = Field(..., description="The crop that is affected by this pest")
 
 
@@ -256,68 +223,88 @@ class PestIdentificationTool(BaseTool):
     description: str = (
         "Identify pests based on description and get control recommendations. "
         "Useful for diagnosing insect pests, mites, and other crop predators. "
-        "Provide a description of the pest and the affected crop."
+        "Provide a description of the pest and the affected crop. For a mixed infestation, "
+        "describe each pest separately, separated by semicolons, to identify all of them in one call."
     )
     args_schema: Type[BaseModel] = PestIdentificationInput
 
+    @memoized
     def _run(self, pest_description: str, crop_affected: str) -> str:
-        pest_db = {
-            "aphid": {
-                "description": "Small (1-3mm), soft-bodied insects, green/black/brown, cluster on stems and leaves",
-                "damage": "Suck plant sap, cause curling, yellowing, transmit viruses, produce honeydew",
-                "control_organic": "Spray with water, neem oil, insecticidal soap, introduce ladybugs/lacewings",
-                "control_chemical": "Imidacloprid, Acetamiprid (use only if severe infestation)",
-                "prevention": "Encourage beneficial insects, remove weeds, use reflective mulch"
-            },
-            "whitefly": {
-                "description": "Tiny white flying insects (1-2mm), found on undersides of leaves",
-                "damage": "Suck sap, secrete honeydew, cause yellowing, transmit viruses",
-                "control_organic": "Yellow sticky traps, neem oil, insecticidal soap, introduce parasitic wasps",
-                "control_chemical": "Spiromesifen, Buprofezin",
-                "prevention": "Remove infected leaves, use fine mesh screens, crop rotation"
-            },
-            "caterpillar": {
-                "description": "Larval stage of moths/butterflies, worm-like, various colors, actively feeding",
-                "damage": "Chew holes in leaves, fruits, stems; can defoliate plants",
-                "control_organic": "Hand-pick, Bacillus thuringiensis (Bt), neem oil, encourage birds",
-                "control_chemical": "Chlorantraniliprole, Spinosad",
-                "prevention": "Regular inspection, row covers, encourage natural predators"
-            },
-            "spider mite": {
-                "description": "Very tiny (0.5mm), reddish/yellow, fine webbing on leaves",
-                "damage": "Suck cell contents, cause stippling/bronzing of leaves",
-                "control_organic": "Spray with water, neem oil, predatory mites, insecticidal soap",
-                "control_chemical": "Abamectin, Spiromesifen",
-                "prevention": "Maintain humidity, avoid drought stress, remove dusty conditions"
-            },
-            "thrips": {
-                "description": "Very small (1mm), slender, yellow/brown/black, quick-moving",
-                "damage": "Scrape and suck plant cells, cause silvery streaks, distorted growth",
-                "control_organic": "Blue sticky traps, neem oil, spinosad, introduce predatory mites",
-                "control_chemical": "Imidacloprid, Spinosad",
-                "prevention": "Remove weeds, use reflective mulches, maintain plant health"
-            }
-        }
-        
-        desc_lower = pest_description.lower()
-        identified_pest = None
-        
-        for pest_name, pest_info in pest_db.items():
-            if pest_name in desc_lower or any(word in desc_lower for word in pest_name.split()):
-                identified_pest = (pest_name, pest_info)
-                break
-        
-        if identified_pest:
-            name, info = identified_pest
-            output = f"Pest Identified: {name.title()}\n\n"
-            output += f"Description: {info['description']}\n"
-            output += f"Damage Caused: {info['damage']}\n\n"
-            output += f"Organic/Natural Control Methods:\n{info['control_organic']}\n\n"
-            output += f"Chemical Control (if necessary):\n{info['control_chemical']}\n\n"
-            output += f"Prevention Strategies:\n{info['prevention']}\n"
-            return output
+        sections, identified = [], set()
+        for description in split_names(pest_description, _DESCRIPTION_SEPARATORS) or [pest_description]:
+            # Each description identifies a different pest of a mixed infestation
+            ranked = [
+                (info, score)
+                for info, score in pest_catalog().search(description, top_k=6, min_score=FUZZY_MIN_SCORE)
+                if info["name"] not in identified
+            ][:3]
+            if ranked:
+                identified.add(ranked[0][0]["name"])
+                sections.append(describe_pest(ranked))
+
+        if sections:
+            return "\n".join(sections)
         else:
             return (f"Pest matching '{pest_description}' not definitively identified. "
                    f"Common pests affecting {crop_affected} include aphids, whiteflies, caterpillars, "
                    f"and mites. Please provide more specific details about size, color, and behavior.")
 
+
+class SymptomSearchInput(BaseModel):
+    """Input schema for SymptomSearchTool."""
+    symptoms: str = Field(..., description="Free-text description of the observed symptoms")
+    crop_type: Optional[str] = Field(None, description="Type of crop (optional, restricts results to diseases of this crop)")
+    top_k: int = Field(5, description="Number of ranked candidates to return")
+
+
+class SymptomSearchTool(BaseTool):
+    name: str = "Symptom to Disease Matcher"
+    description: str = (
+        "Rank the diseases and pests in the knowledge database against a description of observed symptoms. "
+        "Tolerates misspellings and returns the top candidates with similarity scores in a single call. "
+        "Provide the full symptom description and optionally the crop type."
+    )
+    args_schema: Type[BaseModel] = SymptomSearchInput
+
+    @memoized
+    def _run(self, symptoms: str, crop_type: Optional[str] = None, top_k: int = 5) -> str:
+        diseases = disease_knowledge_base().search(symptoms, crop=crop_type, top_k=top_k, min_score=FUZZY_MIN_SCORE / 2)
+        pests = pest_catalog().search(symptoms, top_k=min(top_k, 3), min_score=FUZZY_MIN_SCORE)
+
+        if not diseases and not pests:
+            return (f"No diseases or pests in the database match '{symptoms}'. "
+                    f"Please describe the symptoms in more detail (color, location on plant, spread pattern).")
+
+        output = f"Ranked matches for the described symptoms{f' on {crop_type}' if crop_type else ''}:\n\n"
+        for rank, (record, score) in enumerate(diseases, start=1):
+            output += f"{rank}. {record.name.title()} ({record.scientific_name}) - score {score:.2f}\n"
+            output += f"   Symptoms: {record.symptoms}\n"
+            output += f"   Treatment: {record.treatment}\n"
+        if pests:
+            output += "\nPossible pest involvement:\n"
+            for info, score in pests:
+                output += f"- {info['name'].title()} - score {score:.2f}: {info['damage']}\n"
+        return output
+
+
+class RegionalHistoryInput(BaseModel):
+    """Input schema for RegionalHistoryTool."""
+    region: str = Field(..., description="Location or region of the farm, e.g. 'Nashik, Maharashtra' or 'Maharashtra'")
+    crop_type: Optional[str] = Field(None, description="Type of crop (optional, restricts the history to this crop)")
+    days: int = Field(14, description="Number of past days to look back")
+
+
+class RegionalHistoryTool(BaseTool):
+    name: str = "Regional Disease History"
+    description: str = (
+        "Look up which diseases and pests were diagnosed most often in past reports from a region, "
+        "optionally for one crop, and any active outbreak alerts there. "
+        "Use it as a prior when several diagnoses fit the symptoms."
+    )
+    args_schema: Type[BaseModel] = RegionalHistoryInput
+
+    # Not memoized: the history grows with every report
+    def _run(self, region: str, crop_type: Optional[str] = None, days: int = 14) -> str:
+        # Imported here: the history store itself builds on this package's knowledge base
+        from agentic_ai.history import format_top_issues
+        return format_top_issues(region, crop_type, days)
@@ -0,0 +1,400 @@
+"""
+Plantix - Agronomy Document Index
+Created by TejasS1233
+
+Vector index over the agronomy documents in ``knowledge/docs`` (Markdown or plain
+text). Documents are split into chunks at headings and paragraphs, and each chunk is
+embedded on the CPU with no model download. The embedding hashes the chunk's words and
+word pairs into ``EMBEDDING_DIM`` signed buckets with sublinear term weights, then
+normalizes the vector. At query time, buckets common to many chunks are down-weighted
+(inverse document frequency), and the query is scored against every chunk with one
+matrix-vector product.
+
+The index lives under ``<PLANTIX_CACHE_DIR>/knowledge_index``:
+- ``vectors-<generation>.f32``: the chunk vectors, memory-mapped for queries;
+- ``chunks-<generation>.jsonl``: the chunk texts;
+- ``manifest.json``: the current generation and the SHA-256 and row range of every
+  indexed document.
+
+The index is brought up to date on use, at most every ``PLANTIX_KNOWLEDGE_RELOAD_INTERVAL``
+seconds, or by ``index_knowledge``. On use, documents are only hashed (under the index
+lock) when their modification times or sizes changed. Only new and changed documents are
+embedded, and their rows are appended. Rows of changed or deleted documents are dropped from queries,
+and the index is rebuilt, as a new generation of files, once they outnumber the live rows.
+"""
+
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from agentic_ai.reports import atomic_write
+from agentic_ai.tools.knowledge_base import knowledge_dir, normalize
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+EMBEDDING_DIM = 1024
+# Bump when the chunking or embedding changes; indexes built by another version are rebuilt
+EMBEDDER_VERSION = 1
+
+DOCUMENT_SUFFIXES = (".md", ".txt")
+CHUNK_CHARS = 800
+
+_STOPWORDS = frozenset(
+    "a an and are as at be been but by can for from has have in into is it its may more most "
+    "not of on or so such than that the their them then there these they this to was were when "
+    "where which while with within without you your".split()
+)
+_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*$")
+
+
+def knowledge_rag_enabled() -> bool:
+    return os.getenv("PLANTIX_KNOWLEDGE_RAG", "on").strip().lower() not in ("0", "off", "false", "no")
+
+
+def knowledge_top_k() -> int:
+    return max(1, int(os.getenv("PLANTIX_KNOWLEDGE_TOP_K", "1")))
+
+
+def knowledge_max_chars() -> int:
+    """Character budget for the notes added to one prompt; 0 for no limit."""
+    return max(0, int(os.getenv("PLANTIX_KNOWLEDGE_MAX_CHARS", "240")))
+
+
+def documents_dir() -> Path:
+    return knowledge_dir() / "docs"
+
+
+def index_dir() -> Path:
+    from agentic_ai.response_cache import cache_dir
+    return cache_dir() / "knowledge_index"
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """A passage of an agronomy document."""
+    source: str     # path relative to the documents directory
+    title: str      # "Document title - Section"
+    text: str
+
+
+def chunk_document(text: str, source: str, max_chars: int = CHUNK_CHARS) -> List[Chunk]:
+    """Split a document into chunks of whole paragraphs, never spanning two sections."""
+    document_title = Path(source).stem.replace("-", " ").replace("_", " ").capitalize()
+    section = ""
+    chunks: List[Chunk] = []
+    paragraphs: List[str] = []
+
+    def flush() -> None:
+        if paragraphs:
+            title = f"{document_title} - {section}" if section else document_title
+            chunks.append(Chunk(source, title, "\n\n".join(paragraphs)))
+            paragraphs.clear()
+
+    for block in re.split(r"\n\s*\n", text):
+        lines = block.strip().splitlines()
+        while lines and _HEADING.match(lines[0].strip()):
+            level, heading = _HEADING.match(lines.pop(0).strip()).groups()
+            flush()
+            if len(level) == 1:
+                document_title, section = heading, ""
+            else:
+                section = heading
+        paragraph = "\n".join(line.rstrip() for line in lines).strip()
+        if not paragraph:
+            continue
+        if paragraphs and sum(map(len, paragraphs)) + len(paragraph) > max_chars:
+            flush()
+        paragraphs.append(paragraph)
+    flush()
+    return chunks
+
+
+def _terms(text: str) -> List[str]:
+    """Content words with a plural "s" removed, so "aphids" and "aphid" share a bucket."""
+    words = []
+    for word in normalize(text).split():
+        if word in _STOPWORDS:
+            continue
+        if len(word) > 4 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return words
+
+
+def embed(texts: Sequence[str]) -> np.ndarray:
+    """Unit-length hashed bag-of-words vectors (words and adjacent word pairs), one row per text."""
+    vectors = np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        words = _terms(text)
+        features = Counter(words)
+        # Word pairs carry phrases ("late blight", "leaf spot") at half weight
+        pairs = Counter(f"{first} {second}" for first, second in zip(words, words[1:]))
+        for counts, weight in ((features, 1.0), (pairs, 0.5)):
+            for feature, count in counts.items():
+                digest = zlib.crc32(feature.encode("utf-8"))
+                sign = 1.0 if digest & 0x80000000 else -1.0
+                vectors[row, digest % EMBEDDING_DIM] += sign * weight * (1.0 + math.log(count))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class DocumentIndex:
+    """Incrementally built flat vector index over a documents directory. Safe to share between threads."""
+
+    def __init__(self, corpus: Optional[Path] = None, root: Optional[Path] = None):
+        self.corpus = Path(corpus) if corpus is not None else documents_dir()
+        self.root = Path(root) if root is not None else index_dir()
+        self._lock = threading.Lock()
+        self._checked_at: Optional[float] = None
+        self._corpus_state: Optional[Tuple[Tuple[str, int, int], ...]] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._vectors = np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+        self._chunks: List[Chunk] = []
+        self._live = np.empty(0, dtype=np.int64)
+        self._live_vectors = self._vectors
+        self._idf = np.ones(EMBEDDING_DIM, dtype=np.float32)
+
+    # Rebuilds write a new generation of files: readers may still have the old vectors mapped
+    def vectors_path(self, generation: int) -> Path:
+        return self.root / f"vectors-{generation}.f32"
+
+    def chunks_path(self, generation: int) -> Path:
+        return self.root / f"chunks-{generation}.jsonl"
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / "manifest.json"
+
+    def _empty_manifest(self) -> Dict[str, Any]:
+        return {"version": EMBEDDER_VERSION, "dim": EMBEDDING_DIM, "generation": 0, "rows": 0, "chunk_bytes": 0, "sources": {}}
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return self._empty_manifest()
+        if manifest.get("version") != EMBEDDER_VERSION or manifest.get("dim") != EMBEDDING_DIM:
+            return self._empty_manifest()
+        return manifest
+
+    def documents(self) -> Dict[str, Path]:
+        """Indexable documents by path relative to the corpus directory."""
+        if not self.corpus.is_dir():
+            return {}
+        return {
+            path.relative_to(self.corpus).as_posix(): path
+            for path in sorted(self.corpus.rglob("*"))
+            if path.suffix.lower() in DOCUMENT_SUFFIXES and path.is_file()
+        }
+
+    def corpus_state(self) -> Tuple[Tuple[str, int, int], ...]:
+        """Name, modification time and size of every document: a cheap check for changes before hashing."""
+        state = []
+        for name, path in self.documents().items():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            state.append((name, stat.st_mtime_ns, stat.st_size))
+        return tuple(state)
+
+    def update(self) -> Dict[str, int]:
+        """Embed new and changed documents; returns counts of documents embedded and removed, and live chunks."""
+        # Taken before hashing, so a document edited meanwhile is picked up by the next refresh
+        state = self.corpus_state()
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(self.root / ".lock", "w") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                counts = self._update()
+            self._corpus_state = state
+            return counts
+
+    def _update(self) -> Dict[str, int]:
+        manifest = self._read_manifest()
+        sources: Dict[str, Dict[str, Any]] = manifest["sources"]
+        contents = {name: path.read_bytes() for name, path in self.documents().items()}
+        digests = {name: hashlib.sha256(content).hexdigest() for name, content in contents.items()}
+        changed = [name for name, digest in digests.items() if sources.get(name, {}).get("digest") != digest]
+        removed = [name for name in sources if name not in digests]
+
+        live_rows = sum(entry["end"] - entry["start"] for name, entry in sources.items() if name not in changed + removed)
+        if manifest["rows"] - live_rows > max(live_rows, 64):
+            # Mostly superseded rows: start over rather than carry them
+            generation = manifest["generation"] + 1
+            manifest, sources, changed = self._empty_manifest(), {}, list(digests)
+            manifest["generation"] = generation
+        for name in changed + removed:
+            sources.pop(name, None)
+        if not changed and not removed:
+            return {"embedded": 0, "removed": 0, "chunks": live_rows}
+
+        rows, chunk_bytes, generation = manifest["rows"], manifest["chunk_bytes"], manifest["generation"]
+        with open(self.vectors_path(generation), "ab") as vectors_file, open(self.chunks_path(generation), "ab") as chunks_file:
+            # Drop anything written after the manifest by an interrupted update
+            vectors_file.truncate(rows * EMBEDDING_DIM * 4)
+            chunks_file.truncate(chunk_bytes)
+            for name in changed:
+                chunks = chunk_document(contents[name].decode("utf-8", errors="replace"), name)
+                if chunks:
+                    vectors_file.write(embed([f"{chunk.title}\n{chunk.text}" for chunk in chunks]).tobytes())
+                    lines = "".join(json.dumps(asdict(chunk), ensure_ascii=False) + "\n" for chunk in chunks)
+                    chunks_file.write(lines.encode("utf-8"))
+                    chunk_bytes += len(lines.encode("utf-8"))
+                sources[name] = {"digest": digests[name], "start": rows, "end": rows + len(chunks)}
+                rows += len(chunks)
+            vectors_file.flush()
+            os.fsync(vectors_file.fileno())
+            chunks_file.flush()
+            os.fsync(chunks_file.fileno())
+
+        manifest.update(rows=rows, chunk_bytes=chunk_bytes, sources=sources)
+        atomic_write(self.manifest_path, json.dumps(manifest, indent=1))
+        for stale in (*self.root.glob("vectors-*.f32"), *self.root.glob("chunks-*.jsonl")):
+            if stale.name not in (self.vectors_path(generation).name, self.chunks_path(generation).name):
+                stale.unlink(missing_ok=True)
+        live = sum(entry["end"] - entry["start"] for entry in sources.values())
+        return {"embedded": len(changed), "removed": len(removed), "chunks": live}
+
+    def _load(self) -> None:
+        """Map the index files into memory if the manifest changed since the last load."""
+        try:
+            stat = self.manifest_path.stat()
+        except FileNotFoundError:
+            return
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            return
+        manifest = self._read_manifest()
+        rows, generation = manifest["rows"], manifest["generation"]
+        if rows:
+            self._vectors = np.memmap(self.vectors_path(generation), dtype=np.float32, mode="r", shape=(rows, EMBEDDING_DIM))
+            with open(self.chunks_path(generation), "rb") as handle:
+                lines = handle.read(manifest["chunk_bytes"]).decode("utf-8").splitlines()
+            self._chunks = [Chunk(**json.loads(line)) for line in lines]
+        else:
+            self._vectors, self._chunks = np.empty((0, EMBEDDING_DIM), dtype=np.float32), []
+        self._live = np.array(
+            sorted(row for entry in manifest["sources"].values() for row in range(entry["start"], entry["end"])),
+            dtype=np.int64,
+        )
+        # Gathered once per load rather than on every search; the mapped file as is when every row is live
+        self._live_vectors = self._vectors if len(self._live) == rows else np.ascontiguousarray(self._vectors[self._live])
+        # Buckets shared by many chunks ("crop", "leaf") say little about which chunk fits
+        frequency = np.count_nonzero(self._live_vectors, axis=0) if len(self._live) else np.zeros(EMBEDDING_DIM)
+        self._idf = (np.log((1.0 + len(self._live)) / (1.0 + frequency)) + 1.0).astype(np.float32)
+        self._signature = signature
+
+    def refresh(self) -> None:
+        """Update the index if documents may have changed, at most every PLANTIX_KNOWLEDGE_RELOAD_INTERVAL seconds."""
+        now = time.monotonic()
+        interval = float(os.getenv("PLANTIX_KNOWLEDGE_RELOAD_INTERVAL", "2"))
+        if self._checked_at is not None and now - self._checked_at < interval:
+            return
+        if self.corpus_state() != self._corpus_state or not self.manifest_path.exists():
+            self.update()
+        self._checked_at = now
+
+    def __len__(self) -> int:
+        self.refresh()
+        with self._lock:
+            self._load()
+            return len(self._live)
+
+    def search(self, query: str, top_k: int = 3, min_score: float = 0.05) -> List[Tuple[Chunk, float]]:
+        """The ``top_k`` chunks closest to ``query``, with cosine-like scores, best first."""
+        self.refresh()
+        with self._lock:
+            self._load()
+            vectors, chunks, live, idf = self._live_vectors, self._chunks, self._live, self._idf
+        if not len(live):
+            return []
+        weighted = embed([query])[0] * idf
+        norm = np.linalg.norm(weighted)
+        if norm == 0.0:
+            return []
+        scores = vectors @ (weighted / norm)
+        top_k = min(top_k, len(live))
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [(chunks[live[position]], float(scores[position])) for position in best if scores[position] >= min_score]
+
+
+_index_lock = threading.Lock()
+_indexes: Dict[Tuple[str, str], DocumentIndex] = {}
+
+
+def document_index() -> DocumentIndex:
+    """The process-wide index for the current documents and cache directories."""
+    key = (str(documents_dir()), str(index_dir()))
+    with _index_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = DocumentIndex(Path(key[0]), Path(key[1]))
+        return index
+
+
+def clip(text: str, max_chars: int) -> str:
+    """``text`` cut to at most ``max_chars`` characters, at a sentence end if one is near, else a word end."""
+    if len(text) <= max_chars:
+        return text
+    clipped = text[:max_chars]
+    sentence_end = max(clipped.rfind(". "), clipped.rfind(".\n"))
+    if sentence_end >= max_chars // 2:
+        return clipped[:sentence_end + 1]
+    if not (clipped[-1].isspace() or text[max_chars].isspace()):
+        clipped = clipped.rsplit(None, 1)[0]  # drop the word cut in half
+    return clipped.rstrip() + " ..."
+
+
+def knowledge_context(query: str, top_k: Optional[int] = None) -> str:
+    """Reference notes for a prompt: the chunks most relevant to ``query``, or "" if none fit."""
+    if not knowledge_rag_enabled() or not query.strip():
+        return ""
+    results = document_index().search(query, top_k=top_k or knowledge_top_k())
+    if not results:
+        return ""
+    # The budget is shared by the passages, so asking for more notes does not lengthen the prompt
+    budget = knowledge_max_chars() // len(results)
+    notes = "\n\n".join(
+        f"[{rank}] {chunk.title}\n{clip(chunk.text, budget) if budget else chunk.text}"
+        for rank, (chunk, _) in enumerate(results, start=1)
+    )
+    return f"Agronomy notes (apply where they fit):\n{notes}"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="index_knowledge", description="Build or query the agronomy document index")
+    parser.add_argument("query", nargs="?", help="show the chunks that match this query instead of only building")
+    parser.add_argument("--top", type=int, default=3, help="number of chunks to show")
+    args = parser.parse_args(argv)
+
+    index = document_index()
+    started = time.perf_counter()
+    counts = index.update()
+    print(f"📚 {counts['chunks']} chunk(s) from {index.corpus}: {counts['embedded']} document(s) embedded, "
+          f"{counts['removed']} removed in {time.perf_counter() - started:.2f}s")
+    if args.query:
+        started = time.perf_counter()
+        results = index.search(args.query, top_k=args.top)
+        print(f"🔍 {len(results)} match(es) in {(time.perf_counter() - started) * 1000:.1f} ms")
+        for chunk, score in results:
+            print(f"\n[{score:.2f}] {chunk.title} ({chunk.source})\n{chunk.text}")
+    return 0
@@ -0,0 +1,429 @@
+"""
+Plantix - Crop Knowledge Base
+Created by TejasS1233
+
+Disease, pest, soil and climate catalogs live as JSONL files under the project's
+``knowledge/`` directory (``PLANTIX_KNOWLEDGE_DIR`` overrides it).
+Each file is memory-mapped read-only, so concurrent workers share one copy through
+the OS page cache; only small key -> line-offset indexes are built per process and
+records are decoded on access. Catalogs load lazily on first use and reload when
+the file's mtime or size changes. Replace files atomically (write + rename) when
+updating them so readers holding the previous mapping are unaffected; a replaced
+mapping is closed at the following reload.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Generic, Iterator, List, Mapping, Optional, Sequence, Tuple, TypeVar
+import json
+import mmap
+import os
+import re
+import threading
+import time
+
+import numpy as np
+
+from agentic_ai.tools.retrieval import RetrievalIndex
+
+
+# Host entries that mean "any crop" rather than naming a specific one
+GENERIC_CROPS = frozenset({"most crops", "most vegetables", "many vegetables"})
+
+# Minimum cosine score for a fuzzy match to count as a hit
+FUZZY_MIN_SCORE = 0.25
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+T = TypeVar("T")
+
+# src/agentic_ai/tools/knowledge_base.py -> project root
+DEFAULT_KNOWLEDGE_DIR = Path(__file__).resolve().parents[3] / "knowledge"
+
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse punctuation/whitespace so lookups are format-insensitive."""
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+
+def knowledge_dir() -> Path:
+    """Directory holding the catalog files (``PLANTIX_KNOWLEDGE_DIR`` or the project's ``knowledge/``)."""
+    configured = os.getenv("PLANTIX_KNOWLEDGE_DIR")
+    return Path(configured) if configured else DEFAULT_KNOWLEDGE_DIR
+
+
+class JsonlCatalog:
+    """A memory-mapped JSONL file indexed by line offset; records are decoded on demand."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._offsets: List[int] = []
+        self._mmap: Optional[mmap.mmap] = None
+
+        with open(path, "rb") as handle:
+            if os.fstat(handle.fileno()).st_size:
+                self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap is not None:
+            start, size = 0, len(self._mmap)
+            while start < size:
+                end = self._mmap.find(b"\n", start)
+                if end == -1:
+                    end = size
+                if self._mmap[start:end].strip():
+                    self._offsets.append(start)
+                start = end + 1
+
+        self._decode = lru_cache(maxsize=512)(self._decode_at)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def close(self) -> None:
+        """Release the mapping; the catalog cannot be read afterwards."""
+        self._decode.cache_clear()
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def __getitem__(self, position: int) -> Mapping[str, Any]:
+        return self._decode(self._offsets[position])
+
+    def __iter__(self) -> Iterator[Mapping[str, Any]]:
+        for offset in self._offsets:
+            yield self._decode(offset)
+
+    def _decode_at(self, offset: int) -> Mapping[str, Any]:
+        end = self._mmap.find(b"\n", offset)
+        line = self._mmap[offset:] if end == -1 else self._mmap[offset:end]
+        return MappingProxyType(json.loads(line))
+
+
+class KnowledgeStore(Generic[T]):
+    """Lazily loads a catalog file into an index object and rebuilds it when the file changes."""
+
+    def __init__(self, filename: str, factory: Callable[[JsonlCatalog], T]):
+        self.filename = filename
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._current: Optional[T] = None
+        self._catalog: Optional[JsonlCatalog] = None
+        # The catalog replaced by the last reload, kept open for readers still using its index
+        self._retired: Optional[JsonlCatalog] = None
+        self._signature: Optional[Tuple[str, int, int]] = None
+        self._checked_at = 0.0
+
+    @property
+    def path(self) -> Path:
+        return knowledge_dir() / self.filename
+
+    def get(self) -> T:
+        """Return the current index, reloading first if the file changed on disk."""
+        now = time.monotonic()
+        interval = float(os.getenv("PLANTIX_KNOWLEDGE_RELOAD_INTERVAL", "2"))
+        if self._current is not None and now - self._checked_at < interval:
+            return self._current
+
+        with self._lock:
+            path = self.path
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                raise FileNotFoundError(
+                    f"Knowledge catalog not found at {path}. "
+                    f"Set PLANTIX_KNOWLEDGE_DIR to the directory holding the catalogs."
+                )
+            signature = (str(path), stat.st_mtime_ns, stat.st_size)
+            if signature != self._signature:
+                catalog = JsonlCatalog(path)
+                self._current = self._factory(catalog)
+                if self._retired is not None:
+                    self._retired.close()
+                self._retired, self._catalog = self._catalog, catalog
+                self._signature = signature
+            self._checked_at = now
+            return self._current
+
+
+@dataclass(frozen=True)
+class InfectionProfile:
+    """Weather under which a disease or pest builds up, used by the risk model."""
+    temperature: Tuple[float, float, float, float]  # minimum, optimal low, optimal high, maximum (°C)
+    humidity: float  # relative humidity (%) an hour needs to count as favorable
+    hours: float  # favorable hours in a day at which the risk is rated high
+    rain_weight: float = 0.0  # how much recent rain raises (or, if negative, lowers) the risk
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> "InfectionProfile":
+        return cls(
+            temperature=tuple(float(value) for value in data["temperature"]),
+            humidity=float(data["humidity"]),
+            hours=float(data["hours"]),
+            rain_weight=float(data.get("rain_weight", 0.0)),
+        )
+
+
+@dataclass(frozen=True)
+class DiseaseRecord:
+    """A single immutable entry of the disease knowledge base."""
+    name: str
+    scientific_name: str
+    crops_affected: Tuple[str, ...]
+    symptoms: str
+    causes: str
+    treatment: str
+    prevention: str
+    aliases: Tuple[str, ...] = ()
+    infection: Optional[InfectionProfile] = None
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> "DiseaseRecord":
+        return cls(
+            name=data["name"],
+            scientific_name=data["scientific_name"],
+            crops_affected=tuple(data["crops_affected"]),
+            symptoms=data["symptoms"],
+            causes=data["causes"],
+            treatment=data["treatment"],
+            prevention=data["prevention"],
+            aliases=tuple(data.get("aliases", ())),
+            infection=InfectionProfile.from_mapping(data["infection"]) if data.get("infection") else None,
+        )
+
+    def affects(self, crop: str) -> bool:
+        """Whether this disease is recorded for the given (normalized) crop."""
+        return crop in self.crops_affected or not GENERIC_CROPS.isdisjoint(self.crops_affected)
+
+    def search_text(self) -> str:
+        """Text indexed for fuzzy retrieval; names are repeated to outweigh long symptom lists."""
+        names = " ".join((self.name,) + self.aliases)
+        return f"{names} {names} {self.scientific_name} {self.symptoms} {' '.join(self.crops_affected)}"
+
+
+class DiseaseKnowledgeBase:
+    """Read-only disease store with exact-name, alias, scientific-name and per-crop indexes."""
+
+    def __init__(self, catalog: JsonlCatalog):
+        self._catalog = catalog
+        self._record = lru_cache(maxsize=512)(self._record_at)
+
+        names: Dict[str, int] = {}
+        aliases: Dict[str, int] = {}
+        scientific: Dict[str, int] = {}
+        by_crop: Dict[str, List[int]] = {}
+        by_word: Dict[str, List[int]] = {}
+
+        for position, data in enumerate(catalog):
+            record_aliases = tuple(data.get("aliases", ()))
+            names[normalize(data["name"])] = position
+            for alias in record_aliases:
+                aliases.setdefault(normalize(alias), position)
+            scientific.setdefault(normalize(data["scientific_name"]), position)
+            for crop in data["crops_affected"]:
+                by_crop.setdefault(normalize(crop), []).append(position)
+            for word in set(normalize(" ".join((data["name"],) + record_aliases)).split()):
+                by_word.setdefault(word, []).append(position)
+
+        # Phrase index used for "query contains a known name" matches
+        phrases = dict(scientific)
+        phrases.update(aliases)
+        phrases.update(names)
+
+        self._names: Mapping[str, int] = MappingProxyType(names)
+        self._aliases: Mapping[str, int] = MappingProxyType(aliases)
+        self._scientific: Mapping[str, int] = MappingProxyType(scientific)
+        self._phrases: Mapping[str, int] = MappingProxyType(phrases)
+        self._by_crop: Mapping[str, Tuple[int, ...]] = MappingProxyType(
+            {crop: tuple(positions) for crop, positions in by_crop.items()}
+        )
+        self._by_word: Mapping[str, Tuple[int, ...]] = MappingProxyType(
+            {word: tuple(positions) for word, positions in by_word.items()}
+        )
+        self._max_phrase_words = max((len(phrase.split()) for phrase in phrases), default=1)
+        self._index: Optional[RetrievalIndex] = None
+
+    def __len__(self) -> int:
+        return len(self._catalog)
+
+    def __iter__(self) -> Iterator[DiseaseRecord]:
+        for position in range(len(self._catalog)):
+            yield self._record(position)
+
+    def _record_at(self, position: int) -> DiseaseRecord:
+        return DiseaseRecord.from_mapping(self._catalog[position])
+
+    def get(self, name: str) -> Optional[DiseaseRecord]:
+        """Exact lookup by common name, alias or scientific name."""
+        key = normalize(name)
+        for index in (self._names, self._aliases, self._scientific):
+            position = index.get(key)
+            if position is not None:
+                return self._record(position)
+        return None
+
+    def _crop_positions(self, crop: str) -> set:
+        positions = set(self._by_crop.get(normalize(crop), ()))
+        for generic in GENERIC_CROPS:
+            positions.update(self._by_crop.get(generic, ()))
+        return positions
+
+    def knows_crop(self, crop: str) -> bool:
+        """Whether any disease names this crop explicitly as a host."""
+        return normalize(crop) in self._by_crop
+
+    def for_crop(self, crop: str) -> Tuple[DiseaseRecord, ...]:
+        """All diseases recorded for a crop, including generic "most crops" entries."""
+        return tuple(self._record(position) for position in sorted(self._crop_positions(crop)))
+
+    def lookup(self, query: str, crop: Optional[str] = None) -> List[DiseaseRecord]:
+        """
+        Resolve a free-text disease name to matching records, best match first.
+
+        Tries an exact name/alias/scientific-name hit, then known names contained in
+        the query, then names sharing every query word, and finally fuzzy retrieval
+        for misspellings. When ``crop`` is given, only diseases recorded for that crop
+        are returned.
+        """
+        key = normalize(query)
+        if not key:
+            return []
+
+        exact = self.get(key)
+        if exact is not None:
+            matches = [exact]
+        else:
+            matches = self._contained_phrases(key) or self._word_matches(key)
+
+        if crop:
+            crop_key = normalize(crop)
+            matches = [record for record in matches if record.affects(crop_key)]
+        if not matches:
+            matches = [record for record, _ in self.search(key, crop=crop, top_k=3, min_score=FUZZY_MIN_SCORE)]
+        return matches
+
+    @property
+    def index(self) -> RetrievalIndex:
+        """Fuzzy retrieval index over names, symptoms and crops, built on first use."""
+        if self._index is None:
+            self._index = RetrievalIndex([record.search_text() for record in self])
+        return self._index
+
+    def crop_mask(self, crop: str) -> np.ndarray:
+        """Boolean mask over catalog positions of diseases recorded for ``crop``."""
+        mask = np.zeros(len(self), dtype=bool)
+        mask[list(self._crop_positions(crop))] = True
+        return mask
+
+    def search_batch(
+        self,
+        queries: Sequence[str],
+        crop: Optional[str] = None,
+        top_k: int = 5,
+        min_score: float = 0.0,
+    ) -> List[List[Tuple[DiseaseRecord, float]]]:
+        """Rank diseases against several symptom/name descriptions in one matrix operation."""
+        mask = self.crop_mask(crop) if crop else None
+        return [
+            [(self._record(position), score) for position, score in ranked]
+            for ranked in self.index.search_batch(queries, top_k=top_k, mask=mask, min_score=min_score)
+        ]
+
+    def search(
+        self,
+        text: str,
+        crop: Optional[str] = None,
+        top_k: int = 5,
+        min_score: float = 0.0,
+    ) -> List[Tuple[DiseaseRecord, float]]:
+        """Top-k diseases for a symptom or name description, with cosine scores."""
+        return self.search_batch([text], crop=crop, top_k=top_k, min_score=min_score)[0]
+
+    def _contained_phrases(self, key: str) -> List[DiseaseRecord]:
+        words = key.split()
+        found: Dict[int, int] = {}
+        for size in range(min(self._max_phrase_words, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                position = self._phrases.get(" ".join(words[start:start + size]))
+                if position is not None and position not in found:
+                    found[position] = size
+        # Longer (more specific) phrase hits rank first, then catalog order
+        ranked = sorted(found, key=lambda position: (-found[position], position))
+        return [self._record(position) for position in ranked]
+
+    def _word_matches(self, key: str) -> List[DiseaseRecord]:
+        candidates: Optional[set] = None
+        for word in key.split():
+            positions = set(self._by_word.get(word, ()))
+            candidates = positions if candidates is None else candidates & positions
+            if not candidates:
+                return []
+        return [self._record(position) for position in sorted(candidates or ())]
+
+
+class NamedCatalog:
+    """Read-only name-keyed catalog used for pests, soils and climate patterns."""
+
+    def __init__(self, catalog: JsonlCatalog, search_fields: Sequence[str] = ("name",)):
+        self._catalog = catalog
+        self._names: Mapping[str, int] = MappingProxyType(
+            {normalize(data["name"]): position for position, data in enumerate(catalog)}
+        )
+        self._search_fields = tuple(search_fields)
+        self._index: Optional[RetrievalIndex] = None
+
+    def __len__(self) -> int:
+        return len(self._catalog)
+
+    def __iter__(self) -> Iterator[Mapping[str, Any]]:
+        return iter(self._catalog)
+
+    def names(self) -> Tuple[str, ...]:
+        return tuple(self._names)
+
+    def get(self, name: str) -> Optional[Mapping[str, Any]]:
+        position = self._names.get(normalize(name))
+        return None if position is None else self._catalog[position]
+
+    def find_in(self, text: str) -> Optional[Mapping[str, Any]]:
+        """First entry (catalog order) whose name occurs in ``text``."""
+        text = text.lower()
+        for name, position in self._names.items():
+            if name in text:
+                return self._catalog[position]
+        return None
+
+    def search(self, text: str, top_k: int = 5, min_score: float = 0.0) -> List[Tuple[Mapping[str, Any], float]]:
+        """Top-k entries ranked by fuzzy similarity of ``text`` to the catalog's search fields."""
+        if self._index is None:
+            self._index = RetrievalIndex([
+                " ".join(str(data.get(field, "")) for field in self._search_fields)
+                for data in self._catalog
+            ])
+        return [
+            (self._catalog[position], score)
+            for position, score in self._index.search(text, top_k=top_k, min_score=min_score)
+        ]
+
+
+_DISEASES = KnowledgeStore("diseases.jsonl", DiseaseKnowledgeBase)
+_PESTS = KnowledgeStore("pests.jsonl", partial(NamedCatalog, search_fields=("name", "name", "description", "damage")))
+_SOILS = KnowledgeStore("soils.jsonl", NamedCatalog)
+_CLIMATES = KnowledgeStore("climates.jsonl", NamedCatalog)
+
+
+def disease_knowledge_base() -> DiseaseKnowledgeBase:
+    """The shared disease index, loaded on first use and refreshed when the file changes."""
+    return _DISEASES.get()
+
+
+def pest_catalog() -> NamedCatalog:
+    return _PESTS.get()
+
+
+def soil_catalog() -> NamedCatalog:
+    return _SOILS.get()
+
+
+def climate_catalog() -> NamedCatalog:
+    return _CLIMATES.get()
@@ -0,0 +1,110 @@
+"""
+Plantix - Tool Result Memoization
+Created by TejasS1233
+
+The same tool calls (a disease lookup, the weather for a location) are repeated by
+several agents within a kickoff and again across kickoffs. ``@memoized`` wraps a
+tool's ``_run`` so results are served from one process-wide LRU cache with a TTL.
+The cache is keyed on the tool name plus its normalized arguments, and keeps
+per-tool hit/miss counters.
+"""
+
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import inspect
+import os
+import threading
+import time
+
+from agentic_ai.tools.knowledge_base import normalize
+from agentic_ai.tracing import span
+
+
+class ToolResultCache:
+    """Thread-safe LRU cache with a TTL, shared by every memoized tool in the process."""
+
+    def __init__(self, maxsize: Optional[int] = None, ttl: Optional[float] = None):
+        self.maxsize = int(os.getenv("PLANTIX_TOOL_CACHE_SIZE", "1024")) if maxsize is None else maxsize
+        self.ttl = float(os.getenv("PLANTIX_TOOL_CACHE_TTL", "300")) if ttl is None else ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+
+    def get(self, tool: str, key: Hashable) -> Tuple[bool, Any]:
+        """Return ``(found, value)`` and record a hit or miss for ``tool``."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self._hits[tool] = self._hits.get(tool, 0) + 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self._misses[tool] = self._misses.get(tool, 0) + 1
+            return False, None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-tool hits, misses and hit rate."""
+        with self._lock:
+            tools = set(self._hits) | set(self._misses)
+            stats = {}
+            for tool in sorted(tools):
+                hits, misses = self._hits.get(tool, 0), self._misses.get(tool, 0)
+                stats[tool] = {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses)}
+            return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits.clear()
+            self._misses.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+TOOL_CACHE = ToolResultCache()
+
+
+def _normalize_argument(value: Any) -> Hashable:
+    if isinstance(value, str):
+        return normalize(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize_argument(item) for item in value)
+    return value
+
+
+def memoized(run: Callable[..., Any]) -> Callable[..., Any]:
+    """Decorator for ``BaseTool._run`` that memoizes on the tool name and normalized arguments."""
+    signature = inspect.signature(run)
+
+    @wraps(run)
+    def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (self.name,) + tuple(
+            (name, _normalize_argument(value))
+            for name, value in bound.arguments.items()
+            if name != "self"
+        )
+        with span(self.name, "tool") as current:
+            found, result = TOOL_CACHE.get(self.name, key)
+            current.set(cache_hit=found)
+            if not found:
+                result = run(self, *args, **kwargs)
+                TOOL_CACHE.put(key, result)
+            return result
+
+    return wrapper
@@ -0,0 +1,128 @@
+"""
+Plantix - Fuzzy Retrieval Index
+Created by TejasS1233
+
+Character n-gram TF-IDF index used to rank catalog entries against free-text
+symptom and name queries. N-grams are taken inside word boundaries, so typos
+("late blihgt") and word-order changes still share most features with the target.
+Document vectors are stored as a CSR matrix (plain NumPy arrays), and a batch of
+queries is scored against every document with a single gather + ``np.add.reduceat``.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+import math
+import re
+
+import numpy as np
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+NGRAM_SIZE = 3
+
+
+def _features(text: str) -> Dict[str, int]:
+    """Term counts of word-boundary character n-grams plus whole words."""
+    counts: Dict[str, int] = {}
+    for word in _TOKEN_RE.findall(text.lower()):
+        counts["w:" + word] = counts.get("w:" + word, 0) + 1
+        padded = f" {word} "
+        for start in range(max(1, len(padded) - NGRAM_SIZE + 1)):
+            gram = padded[start:start + NGRAM_SIZE]
+            counts[gram] = counts.get(gram, 0) + 1
+    return counts
+
+
+class RetrievalIndex:
+    """Immutable TF-IDF index; ``search`` returns ``(document position, cosine score)`` pairs."""
+
+    def __init__(self, documents: Sequence[str]):
+        vocabulary: Dict[str, int] = {}
+        doc_features: List[Dict[int, int]] = []
+        for text in documents:
+            doc_features.append({
+                vocabulary.setdefault(term, len(vocabulary)): count
+                for term, count in _features(text).items()
+            })
+
+        n_docs = len(doc_features)
+        document_frequency = np.zeros(len(vocabulary), dtype=np.float32)
+        for features in doc_features:
+            document_frequency[list(features)] += 1
+        self._idf = (np.log((1 + n_docs) / (1 + document_frequency)) + 1).astype(np.float32)
+
+        indptr = np.zeros(n_docs + 1, dtype=np.int64)
+        indices: List[int] = []
+        data: List[float] = []
+        for position, features in enumerate(doc_features):
+            columns = np.fromiter(features, dtype=np.int64, count=len(features))
+            weights = np.fromiter(features.values(), dtype=np.float32, count=len(features))
+            weights = (1 + np.log(weights)) * self._idf[columns]
+            norm = float(np.linalg.norm(weights)) or 1.0
+            indices.extend(columns.tolist())
+            data.extend((weights / norm).tolist())
+            indptr[position + 1] = len(indices)
+
+        self._vocabulary = vocabulary
+        self._indptr = indptr
+        # A trailing zero entry keeps reduceat offsets in range for empty documents
+        self._indices = np.asarray(indices + [0], dtype=np.int64)
+        self._data = np.asarray(data + [0.0], dtype=np.float32)
+        self._empty = np.diff(indptr) == 0
+
+    def __len__(self) -> int:
+        return len(self._indptr) - 1
+
+    def _query_matrix(self, queries: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(queries), len(self._vocabulary)), dtype=np.float32)
+        for row, query in enumerate(queries):
+            for term, count in _features(query).items():
+                column = self._vocabulary.get(term)
+                if column is not None:
+                    matrix[row, column] = (1 + math.log(count)) * self._idf[column]
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+    def scores(self, queries: Sequence[str]) -> np.ndarray:
+        """Cosine similarity of every query against every document, shape ``(queries, documents)``."""
+        if not len(self) or not queries:
+            return np.zeros((len(queries), len(self)), dtype=np.float32)
+        products = self._query_matrix(queries)[:, self._indices] * self._data
+        scores = np.add.reduceat(products, self._indptr[:-1], axis=1)
+        scores[:, self._empty] = 0
+        return scores
+
+    def search_batch(
+        self,
+        queries: Sequence[str],
+        top_k: int = 5,
+        mask: Optional[np.ndarray] = None,
+        min_score: float = 0.0,
+    ) -> List[List[Tuple[int, float]]]:
+        """Top-k documents per query; ``mask`` is a boolean array restricting eligible documents."""
+        scores = self.scores(queries)
+        if mask is not None:
+            scores[:, ~mask] = 0
+        k = min(top_k, len(self))
+        if k <= 0:
+            return [[] for _ in queries]
+
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row, candidates in enumerate(top):
+            ranked = candidates[np.argsort(-scores[row, candidates], kind="stable")]
+            results.append([
+                (int(position), float(scores[row, position]))
+                for position in ranked
+                if scores[row, position] > min_score
+            ])
+        return results
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        mask: Optional[np.ndarray] = None,
+        min_score: float = 0.0,
+    ) -> List[Tuple[int, float]]:
+        return self.search_batch([query], top_k=top_k, mask=mask, min_score=min_score)[0]
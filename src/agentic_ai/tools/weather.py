@@ -0,0 +1,333 @@
+"""
+Plantix - Weather Providers
+Created by TejasS1233
+
+Live weather behind ``WeatherConditionsTool``. A provider turns a free-text location
+into coordinates (geocoding) and coordinates into current conditions plus the last
+24 hours of hourly temperature, humidity and rain. ``WeatherService`` puts caching in
+front of it so batch and service load does not turn into duplicate API calls:
+
+- geocoding results are cached per normalized location (``PLANTIX_GEOCODE_TTL``);
+- observations are cached per grid cell (lat/lon rounded to ``PLANTIX_WEATHER_GRID``
+  degrees) and hour, for at most ``PLANTIX_WEATHER_TTL`` seconds;
+- concurrent lookups of the same location or cell share one in-flight request;
+- the Open-Meteo provider reuses one pooled HTTP client for all requests.
+
+``PLANTIX_WEATHER_PROVIDER`` selects ``open-meteo`` (default, no API key), ``mock``
+(deterministic, offline; the test suite and benchmark set it) or ``off`` (climate
+patterns only).
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import hashlib
+import os
+import threading
+import time
+
+from agentic_ai.singleflight import SingleFlight
+from agentic_ai.tools.knowledge_base import normalize
+from agentic_ai.tools.memo import ToolResultCache
+
+
+PROVIDERS = ("open-meteo", "mock", "off")
+
+GEOCODE_URL = "https://geocoding-api.open-meteo.com/v1/search"
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+
+# Relative humidity at or above which leaf surfaces are treated as wet
+WET_HUMIDITY = 90.0
+
+
+class WeatherError(Exception):
+    """A provider request failed or returned something unusable."""
+
+
+@dataclass(frozen=True)
+class GeoPoint:
+    name: str
+    latitude: float
+    longitude: float
+    region: str = ""
+
+    @property
+    def label(self) -> str:
+        return f"{self.name}, {self.region}" if self.region else self.name
+
+
+@dataclass(frozen=True)
+class WeatherReport:
+    """Current conditions at a point and the hourly series for the preceding 24 hours."""
+    latitude: float
+    longitude: float
+    observed_at: str
+    temperature_c: float
+    humidity_pct: float
+    precipitation_mm: float
+    wind_kmh: float
+    hourly_temperature: Tuple[float, ...] = ()
+    hourly_humidity: Tuple[float, ...] = ()
+    hourly_precipitation: Tuple[float, ...] = ()
+    source: str = ""
+
+    @property
+    def temperature_range(self) -> Tuple[float, float]:
+        series = self.hourly_temperature or (self.temperature_c,)
+        return min(series), max(series)
+
+    @property
+    def rain_24h(self) -> float:
+        return sum(self.hourly_precipitation) if self.hourly_precipitation else self.precipitation_mm
+
+    def wet_hours(self, threshold: float = WET_HUMIDITY) -> int:
+        """Hours in the last day with relative humidity at or above ``threshold``."""
+        return sum(1 for humidity in self.hourly_humidity if humidity >= threshold)
+
+
+class WeatherProvider(ABC):
+    """Geocodes locations and reports the weather at coordinates."""
+
+    name = "provider"
+
+    @abstractmethod
+    def geocode(self, location: str) -> Optional[GeoPoint]:
+        """Coordinates of a free-text location, or None if it is not found."""
+
+    @abstractmethod
+    def observe(self, latitude: float, longitude: float) -> WeatherReport:
+        """Current conditions and the last 24 hours of weather at the coordinates."""
+
+
+_client_lock = threading.Lock()
+_client = None
+
+
+def http_client():
+    """The process-wide pooled HTTP client for weather requests."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            import httpx
+            _client = httpx.Client(
+                timeout=float(os.getenv("PLANTIX_WEATHER_TIMEOUT", "5")),
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                headers={"User-Agent": "plantix-weather/1.0"},
+            )
+        return _client
+
+
+def _location_queries(location: str) -> List[str]:
+    """Search strings to try for a location: as given, then its comma-separated parts."""
+    parts = [part.strip() for part in location.split(",") if part.strip()]
+    queries = [location.strip()] + parts
+    return list(dict.fromkeys(query for query in queries if query))
+
+
+class OpenMeteoProvider(WeatherProvider):
+    """Open-Meteo geocoding and forecast APIs (free, no API key)."""
+
+    name = "Open-Meteo"
+
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def client(self):
+        return self._client or http_client()
+
+    def _get(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            response = self.client.get(url, params=params)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            raise WeatherError(f"{self.name} request failed: {e}") from e
+
+    def geocode(self, location: str) -> Optional[GeoPoint]:
+        for query in _location_queries(location):
+            results = self._get(GEOCODE_URL, {"name": query, "count": 1, "language": "en", "format": "json"}).get("results")
+            if results:
+                place = results[0]
+                region = ", ".join(part for part in (place.get("admin1"), place.get("country")) if part)
+                return GeoPoint(place["name"], float(place["latitude"]), float(place["longitude"]), region)
+        return None
+
+    def observe(self, latitude: float, longitude: float) -> WeatherReport:
+        data = self._get(FORECAST_URL, {
+            "latitude": latitude,
+            "longitude": longitude,
+            "current": "temperature_2m,relative_humidity_2m,precipitation,wind_speed_10m",
+            "hourly": "temperature_2m,relative_humidity_2m,precipitation",
+            "past_days": 1,
+            "forecast_days": 1,
+            "timezone": "UTC",
+        })
+        try:
+            current, hourly = data["current"], data["hourly"]
+            # The last 24 hourly values up to the current observation
+            past = [position for position, hour in enumerate(hourly["time"]) if hour <= current["time"]][-24:]
+
+            def series(name: str) -> Tuple[float, ...]:
+                return tuple(float(hourly[name][position] or 0.0) for position in past)
+
+            return WeatherReport(
+                latitude=latitude,
+                longitude=longitude,
+                observed_at=current["time"].replace("T", " "),
+                temperature_c=float(current["temperature_2m"]),
+                humidity_pct=float(current["relative_humidity_2m"]),
+                precipitation_mm=float(current["precipitation"] or 0.0),
+                wind_kmh=float(current["wind_speed_10m"] or 0.0),
+                hourly_temperature=series("temperature_2m"),
+                hourly_humidity=series("relative_humidity_2m"),
+                hourly_precipitation=series("precipitation"),
+                source=self.name,
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise WeatherError(f"Unexpected {self.name} response: {e}") from e
+
+
+class MockWeatherProvider(WeatherProvider):
+    """Deterministic offline provider: the same location and hour always give the same weather."""
+
+    name = "mock"
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self._lock = threading.Lock()
+        self.calls = {"geocode": 0, "observe": 0}
+
+    @staticmethod
+    def _unit(*parts: Any) -> float:
+        digest = hashlib.sha256("|".join(map(str, parts)).encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big") / 2 ** 64
+
+    def _count(self, kind: str) -> None:
+        with self._lock:
+            self.calls[kind] += 1
+        time.sleep(self.latency)
+
+    def geocode(self, location: str) -> Optional[GeoPoint]:
+        self._count("geocode")
+        key = normalize(location)
+        if not key:
+            return None
+        return GeoPoint(
+            name=location.split(",")[0].strip().title(),
+            latitude=round(-50 + 100 * self._unit("lat", key), 4),
+            longitude=round(-180 + 360 * self._unit("lon", key), 4),
+        )
+
+    def observe(self, latitude: float, longitude: float) -> WeatherReport:
+        self._count("observe")
+        hour = int(time.time() // 3600)
+        base_temperature = 12 + 22 * self._unit("t", latitude, longitude)
+        base_humidity = 35 + 60 * self._unit("h", latitude, longitude)
+        temperatures, humidities, rain = [], [], []
+        for offset in range(24):
+            swing = self._unit("d", latitude, longitude, hour - offset)
+            temperatures.append(round(base_temperature + 8 * (swing - 0.5), 1))
+            humidities.append(round(min(100.0, base_humidity + 20 * (swing - 0.5)), 1))
+            rain.append(round(max(0.0, 6 * (swing - 0.7)), 1))
+        for series in (temperatures, humidities, rain):
+            series.reverse()
+        return WeatherReport(
+            latitude=latitude,
+            longitude=longitude,
+            observed_at=time.strftime("%Y-%m-%d %H:00", time.gmtime(hour * 3600)),
+            temperature_c=temperatures[-1],
+            humidity_pct=humidities[-1],
+            precipitation_mm=rain[-1],
+            wind_kmh=round(25 * self._unit("w", latitude, longitude, hour), 1),
+            hourly_temperature=tuple(temperatures),
+            hourly_humidity=tuple(humidities),
+            hourly_precipitation=tuple(rain),
+            source=self.name,
+        )
+
+
+class WeatherService:
+    """Cached, coalescing front end to a weather provider; safe to share between threads."""
+
+    def __init__(self, provider: WeatherProvider, ttl: Optional[float] = None, grid: Optional[float] = None):
+        self.provider = provider
+        self.ttl = float(os.getenv("PLANTIX_WEATHER_TTL", "3600")) if ttl is None else ttl
+        self.grid = float(os.getenv("PLANTIX_WEATHER_GRID", "0.1")) if grid is None else grid
+        self._geocodes = ToolResultCache(maxsize=4096, ttl=float(os.getenv("PLANTIX_GEOCODE_TTL", "2592000")))
+        self._reports = ToolResultCache(maxsize=4096, ttl=self.ttl)
+        self._flight = SingleFlight()
+
+    def _cached(self, cache: ToolResultCache, kind: str, key: Hashable, fetch) -> Any:
+        found, value = cache.get(kind, key)
+        if found:
+            return value
+
+        def load() -> Any:
+            # Another caller may have filled the cache while this one waited for the lock
+            found, value = cache.get(kind, key)
+            if not found:
+                value = fetch()
+                cache.put(key, value)
+            return value
+
+        return self._flight.do(key, load)
+
+    def cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return round(latitude / self.grid), round(longitude / self.grid)
+
+    def locate(self, location: str) -> Optional[GeoPoint]:
+        key = ("geocode", normalize(location))
+        return self._cached(self._geocodes, "geocode", key, lambda: self.provider.geocode(location))
+
+    def observe(self, point: GeoPoint) -> WeatherReport:
+        row, column = self.cell(point.latitude, point.longitude)
+        key = ("observe", row, column, int(time.time() // 3600))
+        # Observe at the cell centre so every point in the cell shares one report
+        return self._cached(
+            self._reports, "observe", key,
+            lambda: self.provider.observe(round(row * self.grid, 4), round(column * self.grid, 4)),
+        )
+
+    def lookup(self, location: str) -> Optional[Tuple[GeoPoint, WeatherReport]]:
+        """Where ``location`` is and its current weather; None if it cannot be found or fetched."""
+        try:
+            point = self.locate(location)
+            if point is None:
+                return None
+            return point, self.observe(point)
+        except WeatherError:
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache hits and misses for geocoding and observations, and coalesced requests."""
+        return {**self._geocodes.stats(), **self._reports.stats(), "coalescing": self._flight.stats()}
+
+
+_service_lock = threading.Lock()
+_service: Optional[WeatherService] = None
+_service_provider: Optional[str] = None
+
+
+def weather_provider_name() -> str:
+    name = os.getenv("PLANTIX_WEATHER_PROVIDER", "open-meteo").strip().lower()
+    return name if name in PROVIDERS else "open-meteo"
+
+
+def weather_service() -> Optional[WeatherService]:
+    """The process-wide weather service, or None when live weather is off."""
+    global _service, _service_provider
+    name = weather_provider_name()
+    if name == "off":
+        return None
+    with _service_lock:
+        if _service is None or _service_provider != name:
+            provider = MockWeatherProvider() if name == "mock" else OpenMeteoProvider()
+            _service, _service_provider = WeatherService(provider), name
+        return _service
+
+
+def reset_weather_service() -> None:
+    global _service, _service_provider
+    with _service_lock:
+        _service, _service_provider = None, None
@@ -0,0 +1,236 @@
+"""
+Plantix - Run Tracing
+Created by TejasS1233
+
+Records where a kickoff spends its time as a tree of spans: the kickoff, each task,
+each agent attempt at a task (one per model tier tried), every LLM call (with
+estimated tokens) and every tool call (with whether the tool cache answered it).
+Time in an agent span not covered by its LLM and tool spans is prompt building,
+output parsing and retries inside crewai.
+
+With ``PLANTIX_TRACING=on`` each kickoff's trace is written to ``PLANTIX_TRACE_DIR`` as
+OTLP/JSON (loadable by OpenTelemetry collectors and trace viewers) and a summary table
+is printed. When tracing is off, each instrumentation point costs one context-variable
+lookup. ``PLANTIX_VERBOSE=off`` turns off crewai's per-step console output, leaving the
+trace summary as the production view of a run.
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+
+from agentic_ai.reports import atomic_write
+
+
+# Span kinds, outermost first; summary rows are ordered by kind
+KINDS = ("kickoff", "task", "retrieval", "agent", "llm", "tool")
+
+
+def tracing_enabled() -> bool:
+    return os.getenv("PLANTIX_TRACING", "off").strip().lower() in ("1", "on", "true", "yes")
+
+
+def verbose_enabled() -> bool:
+    return os.getenv("PLANTIX_VERBOSE", "on").strip().lower() not in ("0", "off", "false", "no")
+
+
+def trace_dir() -> Path:
+    return Path(os.getenv("PLANTIX_TRACE_DIR", "traces"))
+
+
+@dataclass
+class Span:
+    name: str
+    kind: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def seconds(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+
+class _NullSpan:
+    """Stands in for a span when no trace is being recorded."""
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Trace:
+    """The finished spans of one run. Spans may be added from several threads (DAG mode)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.trace_id = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._spans: List[Span] = []
+        self.root: Optional[Span] = None
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    @property
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return sorted(self._spans, key=lambda span: span.start_ns)
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """The trace in the OTLP/JSON export format."""
+        spans = []
+        for span in self.spans:
+            attributes = dict(span.attributes, **{"plantix.kind": span.kind})
+            otlp_span = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 1,  # SPAN_KIND_INTERNAL
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()],
+                "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+            }
+            if span.parent_id:
+                otlp_span["parentSpanId"] = span.parent_id
+            spans.append(otlp_span)
+        return {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "plantix"}}]},
+            "scopeSpans": [{"scope": {"name": "agentic_ai.tracing"}, "spans": spans}],
+        }]}
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Spans grouped by kind and name: calls, total and self seconds, errors, and the
+        tokens of all LLM calls made within them.
+        """
+        spans = self.spans
+        parents = {span.span_id: span.parent_id for span in spans}
+        child_seconds: Dict[str, float] = {}
+        tokens: Dict[str, int] = {}
+        for span in spans:
+            if span.parent_id:
+                child_seconds[span.parent_id] = child_seconds.get(span.parent_id, 0.0) + span.seconds
+            used = span.attributes.get("prompt_tokens", 0) + span.attributes.get("completion_tokens", 0)
+            span_id = span.span_id
+            while used and span_id:
+                tokens[span_id] = tokens.get(span_id, 0) + used
+                span_id = parents.get(span_id)
+
+        rows: Dict[tuple, Dict[str, Any]] = {}
+        for span in spans:
+            row = rows.setdefault((span.kind, span.name), {
+                "kind": span.kind, "name": span.name, "calls": 0, "seconds": 0.0,
+                "self_seconds": 0.0, "tokens": 0, "errors": 0,
+            })
+            row["calls"] += 1
+            row["seconds"] += span.seconds
+            # Parallel children (DAG mode) can add up to more than their parent
+            row["self_seconds"] += max(0.0, span.seconds - child_seconds.get(span.span_id, 0.0))
+            row["tokens"] += tokens.get(span.span_id, 0)
+            row["errors"] += int(span.error is not None)
+        return sorted(rows.values(), key=lambda row: (KINDS.index(row["kind"]), -row["seconds"]))
+
+    def format_summary(self) -> str:
+        lines = [
+            f"Trace {self.trace_id} ({self.name})",
+            f"{'Kind':<11}{'Name':<42}{'Calls':>6}{'Total s':>10}{'Self s':>10}{'Tokens':>9}",
+        ]
+        for row in self.summary():
+            name = row["name"] if len(row["name"]) <= 40 else row["name"][:37] + "..."
+            errors = f"  ({row['errors']} failed)" if row["errors"] else ""
+            lines.append(
+                f"{row['kind']:<11}{name:<42}{row['calls']:>6}{row['seconds']:>10.3f}"
+                f"{row['self_seconds']:>10.3f}{row['tokens'] or '-':>9}{errors}"
+            )
+        return "\n".join(lines)
+
+    def export(self, directory: Optional[Path] = None) -> Path:
+        path = (directory or trace_dir()) / f"{self.trace_id}.json"
+        return atomic_write(path, json.dumps(self.to_otlp(), indent=2))
+
+
+# The trace being recorded and the innermost open span. Context variables, so
+# concurrent kickoffs stay separate and DAG worker threads (which copy the context)
+# attach their spans to the right parent.
+_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("plantix_trace", default=None)
+_parent: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("plantix_span", default=None)
+
+
+@contextmanager
+def span(name: str, kind: str, **attributes: Any) -> Iterator[Any]:
+    """Record the enclosed block as a span of the current trace; a no-op outside one."""
+    trace = _trace.get()
+    if trace is None:
+        yield _NULL_SPAN
+        return
+    parent = _parent.get()
+    current = Span(
+        name=name,
+        kind=kind,
+        trace_id=trace.trace_id,
+        span_id=uuid.uuid4().hex[:16],
+        parent_id=parent.span_id if parent is not None else None,
+        start_ns=time.time_ns(),
+        attributes=attributes,
+    )
+    token = _parent.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _parent.reset(token)
+        current.end_ns = time.time_ns()
+        trace.add(current)
+
+
+@contextmanager
+def trace_run(name: str = "kickoff", **attributes: Any) -> Iterator[Optional[Trace]]:
+    """
+    Trace the enclosed run when PLANTIX_TRACING is on (yields None otherwise).
+    On exit the trace is exported to PLANTIX_TRACE_DIR and its summary printed.
+    """
+    if not tracing_enabled() or _trace.get() is not None:
+        yield None
+        return
+    trace = Trace(name)
+    token = _trace.set(trace)
+    try:
+        with span(name, "kickoff", **attributes) as root:
+            trace.root = root
+            yield trace
+    finally:
+        _trace.reset(token)
+        path = trace.export()
+        print(trace.format_summary())
+        print(f"🧭 Trace saved to '{path}'")
@@ -4,6 +4,7 @@ Created by TejasS1233
 """
 
 from agentic_ai.crew import AgenticAi
+from agentic_ai.reports import atomic_write
 
 def main():
     print("=" * 70)
@@ -42,6 +43,7 @@ def main():
     
     try:
         result = AgenticAi().crew().kickoff(inputs=inputs)
+        atomic_write('plantix_farming_report.md', result.raw)
         
         print()
         print("=" * 70)
@@ -0,0 +1,46 @@
+"""
+Plantix - Test Configuration
+Created by TejasS1233
+
+The suite runs offline: live weather defaults to Open-Meteo, so tests use the mock
+provider and keep caches and history in a temporary directory. Crew runs go to the
+local stub LLM (``stub_llm`` fixture).
+"""
+
+import os
+
+import pytest
+
+os.environ.setdefault("CREWAI_TELEMETRY_OPT_OUT", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+
+@pytest.fixture(autouse=True)
+def offline_environment(monkeypatch, tmp_path):
+    from agentic_ai.tools.weather import reset_weather_service
+
+    monkeypatch.setenv("PLANTIX_WEATHER_PROVIDER", "mock")
+    monkeypatch.setenv("PLANTIX_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("PLANTIX_HISTORY_DIR", str(tmp_path / "history"))
+    reset_weather_service()
+    yield
+    reset_weather_service()
+
+
+@pytest.fixture
+def stub_llm(monkeypatch):
+    """A running stub LLM endpoint that new crews use as their model."""
+    from agentic_ai.resources import reset_shared_resources
+    from agentic_ai.stub_llm import StubLLMServer
+
+    for name in [name for name in os.environ if name.startswith("PLANTIX_MODEL_")]:
+        monkeypatch.delenv(name)
+    with StubLLMServer() as stub:
+        monkeypatch.setenv("MODEL", "openai/plantix-stub")
+        monkeypatch.setenv("OPENAI_API_KEY", "stub")
+        monkeypatch.setenv("OPENAI_BASE_URL", stub.url)
+        for name in ("PLANTIX_RESPONSE_CACHE", "PLANTIX_HISTORY", "PLANTIX_VERBOSE", "PLANTIX_TRACING"):
+            monkeypatch.setenv(name, "off")
+        reset_shared_resources()
+        yield stub
+    reset_shared_resources()
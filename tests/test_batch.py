@@ -0,0 +1,56 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from agentic_ai.batch import _run_item, run_batch
+
+
+class Interrupted(BaseException):
+    """Stands in for the process being killed mid-batch."""
+
+
+def write_items(path, count):
+    path.write_text("".join(json.dumps({"id": f"r{n}", "crop_type": "Tomato", "symptoms": f"spots {n}"}) + "\n"
+                            for n in range(1, count + 1)), encoding="utf-8")
+
+
+def test_interrupted_batch_resumes_without_duplicates_or_gaps(tmp_path):
+    input_path, output_path = tmp_path / "reports.jsonl", tmp_path / "results.jsonl"
+    write_items(input_path, 6)
+
+    def crashing(inputs):
+        if inputs["symptoms"] == "spots 4":
+            raise Interrupted()
+        return SimpleNamespace(raw=f"diagnosis for {inputs['symptoms']}")
+
+    with pytest.raises(Interrupted):
+        run_batch(input_path, output_path, crashing, workers=1, retries=0, backoff=0)
+    # The crash also cut a record off half-way through writing it
+    with open(output_path, "a", encoding="utf-8") as output:
+        output.write('{"id": "r4", "status": "o')
+
+    ran = []
+
+    def kickoff(inputs):
+        ran.append(inputs["symptoms"])
+        return SimpleNamespace(raw=f"diagnosis for {inputs['symptoms']}")
+
+    counts = run_batch(input_path, output_path, kickoff, workers=2, retries=0, backoff=0)
+    assert counts == {"ok": 3, "error": 0, "skipped": 3}
+    assert sorted(ran) == ["spots 4", "spots 5", "spots 6"]
+
+    lines = output_path.read_text(encoding="utf-8").splitlines()
+    assert lines[3] == '{"id": "r4", "status": "o'
+    ok = [record["id"] for record in map(json.loads, lines[:3] + lines[4:]) if record["status"] == "ok"]
+    assert sorted(ok) == [f"r{n}" for n in range(1, 7)]
+
+
+def test_negative_retries_still_attempt_once():
+    def failing(inputs):
+        raise RuntimeError("model unavailable")
+
+    record = _run_item(failing, "r1", {"crop_type": "Tomato"}, retries=-1, backoff=0)
+    assert record["status"] == "error"
+    assert record["attempts"] == 1
+    assert record["error"] == "RuntimeError: model unavailable"
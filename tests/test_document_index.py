@@ -0,0 +1,44 @@
+from agentic_ai.tools.document_index import DocumentIndex, clip
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def test_refresh_hashes_only_when_documents_change(tmp_path, monkeypatch):
+    monkeypatch.setenv("PLANTIX_KNOWLEDGE_RELOAD_INTERVAL", "0")
+    corpus = tmp_path / "docs"
+    write(corpus / "blight.md", "# Late blight\n\nWater-soaked lesions spread fast in cool wet weather.")
+    index = DocumentIndex(corpus, tmp_path / "index")
+    updates = []
+    update = index._update
+    monkeypatch.setattr(index, "_update", lambda: updates.append(1) or update())
+
+    assert index.search("water-soaked lesions")
+    assert index.search("water-soaked lesions")
+    assert len(updates) == 1
+
+    write(corpus / "aphids.md", "# Aphids\n\nAphids cluster under young leaves and leave honeydew.")
+    assert index.search("honeydew aphids")[0][0].source == "aphids.md"
+    assert len(updates) == 2
+
+
+def test_search_skips_superseded_rows(tmp_path):
+    corpus = tmp_path / "docs"
+    write(corpus / "a.md", "# Rust\n\nOrange pustules on wheat leaves.")
+    write(corpus / "b.md", "# Mildew\n\nWhite powder on cucumber leaves.")
+    index = DocumentIndex(corpus, tmp_path / "index")
+    index.update()
+    write(corpus / "a.md", "# Rust\n\nRust pustules rub off as orange dust.")
+    index.update()
+    results = index.search("orange pustules rust", top_k=3)
+    assert [chunk.text for chunk, _ in results if chunk.source == "a.md"] == ["Rust pustules rub off as orange dust."]
+    assert len(index) == 2
+
+
+def test_clip_prefers_sentence_ends():
+    text = "Scout weekly. Remove infected leaves before they drop and spread spores across the field."
+    assert clip(text, 200) == text
+    assert clip(text, 30) == "Scout weekly. Remove infected ..."
+    assert clip("First sentence here. Second sentence is longer.", 30) == "First sentence here."
@@ -0,0 +1,50 @@
+import pytest
+
+from agentic_ai import main as plantix_main
+from agentic_ai.history import history_store, main, region_parts, today
+from agentic_ai.models import Diagnosis
+
+
+def diagnosis(name, severity="high"):
+    return Diagnosis.model_construct(
+        name=name, scientific_name="", confidence=85.0, severity=severity, additional_issues=[],
+    )
+
+
+def test_region_parts_ignore_qualifiers():
+    assert region_parts("Pune (near river), Maharashtra") == ["pune maharashtra", "pune", "maharashtra"]
+    assert region_parts("Pune (near river") == ["pune"]
+
+
+def test_qualified_location_counts_toward_its_region():
+    store = history_store()
+    store.record("Pune (near river), Maharashtra", "Tomato", diagnosis("Late Blight"), point=(18.5, 73.9))
+    store.record("Pune, Maharashtra", "Tomato", diagnosis("Late Blight"), point=(18.5, 73.9))
+    assert store.knows_region("Pune")
+    assert not store.knows_region("near river")
+    assert store.top_issues("Pune", "tomato", 14)[0].reports == 2
+
+
+@pytest.fixture
+def outbreak():
+    store = history_store()
+    for offset in range(6):
+        store.record("Nashik, Maharashtra", "Tomato", diagnosis("Late Blight"), day=today() - offset % 3,
+                     point=(20.0, 73.8))
+    assert store.outbreaks(crop="tomato")
+
+
+def test_outbreaks_exit_zero_unless_asked_to_fail(outbreak, capsys):
+    assert main(["outbreaks", "--crop", "tomato"]) == 0
+    assert "outbreak(s) detected" in capsys.readouterr().out
+    assert main(["outbreaks", "--crop", "tomato", "--fail-on-outbreak"]) == 1
+    assert main(["outbreaks", "--crop", "wheat", "--fail-on-outbreak"]) == 0
+
+
+def test_record_history_failures_do_not_fail_the_kickoff(monkeypatch):
+    def broken(inputs, result):
+        raise ValueError("corrupt dictionary")
+
+    monkeypatch.setattr("agentic_ai.history.record_result", broken)
+    with pytest.warns(UserWarning, match="corrupt dictionary"):
+        plantix_main.record_history({"location": "Pune"}, None)
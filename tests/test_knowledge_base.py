@@ -0,0 +1,26 @@
+import json
+
+from agentic_ai.tools.knowledge_base import KnowledgeStore, disease_knowledge_base, knowledge_dir
+
+
+def test_catalogs_found_outside_the_project_root(monkeypatch, tmp_path):
+    monkeypatch.delenv("PLANTIX_KNOWLEDGE_DIR", raising=False)
+    monkeypatch.chdir(tmp_path)
+    assert (knowledge_dir() / "diseases.jsonl").is_file()
+    assert disease_knowledge_base().get("late blight") is not None
+
+
+def test_reload_closes_replaced_mappings(monkeypatch, tmp_path):
+    monkeypatch.setenv("PLANTIX_KNOWLEDGE_DIR", str(tmp_path))
+    monkeypatch.setenv("PLANTIX_KNOWLEDGE_RELOAD_INTERVAL", "0")
+    path = tmp_path / "items.jsonl"
+    catalogs = []
+    store = KnowledgeStore("items.jsonl", lambda catalog: catalogs.append(catalog) or list(catalog))
+
+    for version in range(3):
+        path.write_text(json.dumps({"version": version}) + "\n" * (version + 1), encoding="utf-8")
+        assert store.get()[0]["version"] == version
+
+    first, second, third = catalogs
+    assert first._mmap.closed
+    assert not second._mmap.closed and not third._mmap.closed
@@ -0,0 +1,30 @@
+import contextlib
+import io
+
+from agentic_ai.benchmark import SCENARIOS
+from agentic_ai.resources import shared_llm, usage_since, usage_snapshot
+
+
+def test_usage_counts_each_shared_client_once():
+    llm = shared_llm("openai/plantix-stub", api_key="stub")
+    llm._track_token_usage_internal({"prompt_tokens": 500, "completion_tokens": 50})
+    snapshot = usage_snapshot([llm, llm, llm])
+    llm._track_token_usage_internal({"prompt_tokens": 100, "completion_tokens": 10})
+
+    usage = usage_since(snapshot, [llm, llm])
+    assert (usage.prompt_tokens, usage.completion_tokens, usage.successful_requests) == (100, 10, 1)
+
+
+def test_crew_usage_matches_the_requests_of_each_kickoff(stub_llm):
+    from agentic_ai.crew import AgenticAi
+
+    for _ in range(2):
+        before = stub_llm.usage()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = AgenticAi().crew().kickoff(inputs=dict(SCENARIOS[0]))
+        after = stub_llm.usage()
+        requests = sum(task["requests"] for task in after.values()) - sum(task["requests"] for task in before.values())
+        prompt_tokens = (sum(task["prompt_tokens"] for task in after.values())
+                         - sum(task["prompt_tokens"] for task in before.values()))
+        assert result.token_usage.successful_requests == requests
+        assert result.token_usage.prompt_tokens == prompt_tokens
@@ -0,0 +1,51 @@
+from crewai.crews.crew_output import CrewOutput
+from crewai.tasks.task_output import TaskOutput
+
+from agentic_ai.response_cache import ResponseCache
+
+
+REPORT = {
+    "crop_type": "Tomato",
+    "symptoms": "Yellow leaves with brown spots on lower leaves",
+    "environment": "Humid, 24°C, recent rain",
+    "growth_stage": "Flowering",
+    "location": "Pune, Maharashtra",
+}
+
+
+def output(raw):
+    task = TaskOutput(description="Diagnose", name="disease_diagnosis_task", expected_output="Diagnosis",
+                      raw=raw, agent="Crop Disease Diagnostician")
+    return CrewOutput(raw=raw, tasks_output=[task])
+
+
+def cache(tmp_path):
+    return ResponseCache(path=tmp_path / "responses.sqlite3", min_similarity=0.85)
+
+
+def test_normalized_repeat_hits(tmp_path):
+    responses = cache(tmp_path)
+    responses.put(REPORT, output("Early blight"))
+    repeat = {**REPORT, "symptoms": "yellow leaves, brown spots on the lower leaves!"}
+    assert responses.get(repeat).raw == "Early blight"
+    assert responses.stats()["hits"] == 1
+
+
+def test_near_identical_environment_hits(tmp_path):
+    responses = cache(tmp_path)
+    responses.put(REPORT, output("Early blight"))
+    similar = {**REPORT, "environment": "Humid, 24°C, recent rain showers"}
+    assert responses.get(similar).raw == "Early blight"
+    assert responses.stats()["near_hits"] == 1
+
+
+def test_negated_or_different_symptoms_miss(tmp_path):
+    responses = cache(tmp_path)
+    responses.put(REPORT, output("Early blight"))
+    for symptoms in (
+        "No yellow leaves, brown spots on lower leaves",
+        "Yellow leaves with brown spots on upper leaves",
+        "Yellow leaves with brown spots on lower leaves and stems",
+    ):
+        assert responses.get({**REPORT, "symptoms": symptoms}) is None
+    assert responses.stats()["misses"] == 3
@@ -0,0 +1,72 @@
+import subprocess
+import sys
+
+import pytest
+
+from agentic_ai.risk import conditions_from_text
+
+
+def mean(values):
+    return sum(values) / len(values)
+
+
+def test_risk_module_imports_first():
+    # The risk model builds on the tools package, whose weather tool uses the risk model
+    result = subprocess.run(
+        [sys.executable, "-c", "import agentic_ai.risk; import agentic_ai.tools"],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+@pytest.mark.parametrize("text, humidity", [
+    ("Low humidity, hot", 35.0),
+    ("Moderate humidity", 65.0),
+    ("High humidity, warm", 85.0),
+    ("Humid nights", 82.0),
+])
+def test_humidity_phrases(text, humidity):
+    assert mean(conditions_from_text(text).hourly_humidity) == pytest.approx(humidity, abs=0.1)
+
+
+def test_low_humidity_hot_reads_hot():
+    conditions = conditions_from_text("Low humidity, hot")
+    assert mean(conditions.hourly_temperature) == pytest.approx(32.0, abs=0.1)
+    assert conditions.rain_mm == 0.0
+
+
+def test_drainage_is_not_rain():
+    conditions = conditions_from_text("Dry season, poor drainage")
+    assert conditions.rain_mm == 0.0
+    assert mean(conditions.hourly_humidity) == pytest.approx(40.0, abs=0.1)
+
+
+def test_rain_phrases():
+    assert conditions_from_text("Recent rain, 18-22°C").rain_mm == 10.0
+    assert conditions_from_text("Light rain overnight").rain_mm == 8.0
+    assert conditions_from_text("Heavy rain, 12 mm").rain_mm == 12.0
+
+
+def test_mildew_is_not_dew():
+    dry = conditions_from_text("Powdery mildew, 25°C, 60%")
+    wet = conditions_from_text("Heavy dew, 25°C, 60%")
+    assert max(dry.hourly_humidity) < max(wet.hourly_humidity)
+
+
+@pytest.mark.parametrize("text, temperature", [
+    ("Temperature 28C", 28.0),
+    ("82F", (82 - 32) * 5 / 9),
+    ("temp 30c, 70% humidity", 30.0),
+    ("28 C and humid", 28.0),
+    ("25 °C, dry", 25.0),
+    ("Around 30 degrees", 30.0),
+    ("86 degrees F at noon", 30.0),
+])
+def test_single_temperatures(text, temperature):
+    assert mean(conditions_from_text(text).hourly_temperature) == pytest.approx(temperature, abs=0.1)
+
+
+def test_numbers_without_a_temperature_unit_are_not_temperatures():
+    assert conditions_from_text("5 plants wilting") is None
+    assert mean(conditions_from_text("5 cm lesions, humid").hourly_temperature) == pytest.approx(22.0, abs=0.1)
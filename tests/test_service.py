@@ -0,0 +1,40 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("aiohttp")
+from aiohttp.test_utils import TestClient, TestServer
+
+from agentic_ai.service import DiagnosisService
+
+
+def post(body, headers=None):
+    """Status and JSON reply of POST /diagnose with a raw ``body``."""
+    async def request():
+        service = DiagnosisService(lambda inputs: SimpleNamespace(raw="ok"), concurrency=1, queue_size=4)
+        async with TestClient(TestServer(service.app())) as client:
+            response = await client.post("/diagnose", data=body, headers=headers or {"Content-Type": "application/json"})
+            return response.status, await response.json()
+
+    return asyncio.run(request())
+
+
+@pytest.mark.parametrize("body", [
+    b"{not json",
+    b'{"crop_type": "Tomato", "symptoms": "\xff\xfe spots"}',
+    b'[{"crop_type": "Tomato"}]',
+    b'"Tomato"',
+    b"42",
+    b"null",
+])
+def test_bad_payloads_are_rejected(body):
+    status, reply = post(body)
+    assert status == 400
+    assert reply == {"error": "Request body must be a JSON object"}
+
+
+def test_report_is_accepted():
+    status, reply = post(b'{"crop_type": "Tomato", "symptoms": "brown spots"}')
+    assert status == 202
+    assert reply["status"] == "queued"
@@ -0,0 +1,120 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from crewai.crews.crew_output import CrewOutput
+from crewai.tasks.task_output import TaskOutput
+
+from agentic_ai import main
+from agentic_ai.singleflight import SingleFlight
+
+CALLERS = 8
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def run_together(flight, function, key="report"):
+    """Call ``do_shared`` from CALLERS threads while ``function`` is held until all of them have joined."""
+    release = threading.Event()
+
+    def held():
+        release.wait(5)
+        return function()
+
+    def call():
+        try:
+            return flight.do_shared(key, held)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=CALLERS) as pool:
+        futures = [pool.submit(call) for _ in range(CALLERS)]
+        wait_for(lambda: flight.stats()["calls"] == CALLERS)
+        release.set()
+        return [future.result() for future in futures]
+
+
+def test_concurrent_calls_run_once_and_share_the_result():
+    flight, runs = SingleFlight(), []
+    results = run_together(flight, lambda: runs.append(1) or {"diagnosis": "Late Blight"})
+
+    assert len(runs) == 1
+    assert all(result == {"diagnosis": "Late Blight"} for result, _ in results)
+    assert sorted(shared for _, shared in results) == [False] + [True] * (CALLERS - 1)
+    assert flight.stats() == {"calls": CALLERS, "coalesced": CALLERS - 1, "executions": 1, "in_flight": 0}
+
+
+def test_waiters_get_the_exception():
+    flight = SingleFlight()
+
+    def failing():
+        raise RuntimeError("model unavailable")
+
+    errors = run_together(flight, failing)
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    assert flight.stats()["coalesced"] == CALLERS - 1
+    # Nothing is kept after the call: the next one runs again
+    assert flight.do("report", lambda: "retried") == "retried"
+
+
+def test_different_keys_are_not_coalesced():
+    flight = SingleFlight()
+    assert [flight.do(key, lambda key=key: key) for key in ("a", "b")] == ["a", "b"]
+    assert flight.stats()["coalesced"] == 0
+
+
+def test_shared_kickoff_replays_the_followers_callbacks(monkeypatch):
+    outputs = [
+        TaskOutput(description="Diagnose", name="disease_diagnosis_task", expected_output="Diagnosis",
+                   raw="Late Blight", agent="Crop Disease Diagnostician"),
+        TaskOutput(description="Treat", name="treatment_recommendation_task", expected_output="Plan",
+                   raw="Copper spray", agent="Treatment Specialist"),
+    ]
+    release, runs = threading.Event(), []
+
+    def run_crew(inputs, task_callback=None, case_id=None):
+        runs.append(inputs)
+        release.wait(5)
+        for output in outputs:
+            if task_callback is not None:
+                task_callback(output)
+        return CrewOutput(raw="report", tasks_output=outputs), False
+
+    monkeypatch.setattr(main, "run_crew", run_crew)
+    monkeypatch.setattr(main, "record_history", lambda inputs, result: None)
+    monkeypatch.setattr(main, "KICKOFF_FLIGHT", SingleFlight())
+    inputs = {"crop_type": "Tomato", "symptoms": "Dark water-soaked spots", "location": "Pune"}
+    received = {caller: [] for caller in ("leader", "follower")}
+
+    def kickoff(caller, report):
+        return main.kickoff(dict(report), task_callback=lambda output: received[caller].append(output.name))
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(kickoff, "leader", inputs)
+        wait_for(lambda: runs)
+        # Differently written but identical once normalized
+        follower = pool.submit(kickoff, "follower", {**inputs, "symptoms": "dark, water-soaked spots!"})
+        wait_for(lambda: main.KICKOFF_FLIGHT.stats()["calls"] == 2)
+        release.set()
+        assert leader.result().raw == follower.result().raw == "report"
+
+    assert len(runs) == 1
+    assert main.KICKOFF_FLIGHT.stats()["coalesced"] == 1
+    names = ["disease_diagnosis_task", "treatment_recommendation_task"]
+    assert received == {"leader": names, "follower": names}
+
+
+def test_kickoffs_run_separately_when_coalescing_is_off(monkeypatch):
+    runs = []
+    monkeypatch.setenv("PLANTIX_COALESCE", "off")
+    monkeypatch.setattr(main, "run_crew", lambda inputs, task_callback=None, case_id=None:
+                        runs.append(1) or (CrewOutput(raw="report", tasks_output=[]), False))
+    monkeypatch.setattr(main, "record_history", lambda inputs, result: None)
+    main.kickoff({"crop_type": "Tomato"})
+    main.kickoff({"crop_type": "Tomato"})
+    assert len(runs) == 2
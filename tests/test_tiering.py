@@ -0,0 +1,23 @@
+import pytest
+
+from agentic_ai.tiering import TieredTask
+
+
+def test_unreadable_library_leaves_context_unchanged(monkeypatch):
+    def unreadable(query):
+        raise PermissionError("knowledge_index/.lock")
+
+    monkeypatch.setattr("agentic_ai.tiering.knowledge_context", unreadable)
+    task = TieredTask(description="Advise on {crop_type}", expected_output="Advice", knowledge_query="{crop_type} soil")
+    task.interpolate_inputs_and_add_conversation_history({"crop_type": "Tomato"})
+    with pytest.warns(UserWarning, match="agronomy library"):
+        assert task._with_knowledge("Diagnosis: Late Blight") == "Diagnosis: Late Blight"
+
+
+def test_notes_follow_context(monkeypatch):
+    queries = []
+    monkeypatch.setattr("agentic_ai.tiering.knowledge_context", lambda query: queries.append(query) or "Notes")
+    task = TieredTask(description="Advise on {crop_type}", expected_output="Advice", knowledge_query="{crop_type} soil")
+    task.interpolate_inputs_and_add_conversation_history({"crop_type": "Tomato"})
+    assert task._with_knowledge("Diagnosis: Late Blight") == "Diagnosis: Late Blight\n\nNotes"
+    assert queries == ["Tomato soil"]
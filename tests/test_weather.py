@@ -0,0 +1,35 @@
+import pytest
+
+from agentic_ai.tools.weather import (
+    MockWeatherProvider,
+    WeatherProvider,
+    WeatherService,
+    weather_provider_name,
+    weather_service,
+)
+
+
+def test_provider_interface_is_abstract():
+    with pytest.raises(TypeError):
+        WeatherProvider()
+
+    class GeocodeOnly(WeatherProvider):
+        def geocode(self, location):
+            return None
+
+    with pytest.raises(TypeError):
+        GeocodeOnly()
+
+
+def test_suite_uses_mock_provider():
+    assert weather_provider_name() == "mock"
+    assert isinstance(weather_service().provider, MockWeatherProvider)
+
+
+def test_service_caches_lookups_per_location():
+    provider = MockWeatherProvider()
+    service = WeatherService(provider)
+    first = service.lookup("Pune, Maharashtra")
+    second = service.lookup("pune,  maharashtra")
+    assert first is not None and first == second
+    assert provider.calls == {"geocode": 1, "observe": 1}